@@ -0,0 +1,131 @@
+# 동 × 치과 중력모형 접근성 (2단계 유동 집수구역법, gravity 2SFCA)
+# 구별_지표(구 노인인구 / 구 치과 수)는 거리를 전혀 고려하지 않으므로, 동 중심점과 치과 좌표 사이 거리로
+# 가중한 접근성을 동마다 계산합니다.
+#   1단계: 치과 j 의 부담 R_j = 의료인수_j / Σ_i 노인인구_i × w(d_ij)   (d_ij ≤ 거리 상한)
+#   2단계: 동 i 의 접근성 A_i = Σ_j R_j × w(d_ij)                       (노인 1명당 접근 가능한 의료인 수)
+#   w(d) = (max(d, MIN_DISTANCE) / MIN_DISTANCE) ^ -BETA                 (가까울수록 큰 중력 가중치)
+# 전국 동 × 치과는 수천만 칸이므로 격자 인덱스로 거리 상한 안의 쌍만 만들고,
+# 질의 동을 메모리 예산(쌍 수 상한)에 맞는 블록으로 나눠 두 단계를 블록 단위 NumPy 연산으로 누적합니다.
+import argparse
+
+import numpy as np
+
+import profiling
+from analyze_radius_competition import CENTROID_PATH, load_dong_centers
+from coord_transform import epsg5174_to_wgs84
+from data_store import load_table, save_table, table_exists
+from region_dim import CODE_COL
+from spatial_index import GridIndex
+
+# 거리 상한·중력 감쇠 (미터, EPSG:5174 평면 좌표 기준)
+CUTOFF = 3000.0
+MIN_DISTANCE = 500.0
+BETA = 2.0
+# 블록당 (동, 치과) 후보 쌍 메모리 예산과 쌍 하나가 쓰는 대략의 바이트 수 (neighbors 중간 배열 포함)
+MEMORY_BUDGET_MB = 256
+BYTES_PER_PAIR = 96
+CELL_SIZE = 1000.0
+REGION_KEYS = ['시도', '시군구', '읍면동']
+SUPPLY_SHORTAGE_COL = '접근성_공급부족'
+
+
+def gravity_weight(dist, min_distance=MIN_DISTANCE, beta=BETA):
+    return (np.maximum(dist, min_distance) / min_distance) ** -beta
+
+
+def query_blocks(index, qx, qy, cutoff, budget_mb=MEMORY_BUDGET_MB):
+    # 후보 쌍 수 누적합이 예산을 넘지 않도록 질의점 구간 [start, end) 목록 (한 점이 예산을 넘으면 그 점 하나로)
+    candidates = np.cumsum(index.candidate_counts(qx, qy, cutoff))
+    max_pairs = max(1, budget_mb * 2**20 // BYTES_PER_PAIR)
+    blocks, start = [], 0
+    while start < len(qx):
+        done = candidates[start - 1] if start > 0 else 0
+        end = max(int(np.searchsorted(candidates, done + max_pairs, side='right')), start + 1)
+        blocks.append((start, end))
+        start = end
+    return blocks
+
+
+def gravity_2sfca(dx, dy, demand, cx, cy, supply, cutoff=CUTOFF, beta=BETA, budget_mb=MEMORY_BUDGET_MB):
+    # dx, dy, demand: 동 중심점과 노인인구 / cx, cy, supply: 치과 좌표와 의료인수
+    # → 동별 접근성 A_i (좌표가 없는 동·치과는 쌍이 없어 0)
+    index = GridIndex(cx, cy, cell_size=CELL_SIZE)
+    dx = np.asarray(dx, dtype=np.float64)
+    dy = np.asarray(dy, dtype=np.float64)
+    demand = np.asarray(demand, dtype=np.float64)
+    supply = np.asarray(supply, dtype=np.float64)
+    blocks = query_blocks(index, dx, dy, cutoff, budget_mb)
+    profiling.rows('블록', len(blocks))
+
+    # 1단계: 치과별로 거리 가중 노인인구(잠재 수요)를 블록마다 더함
+    load = np.zeros(len(supply))
+    for start, end in blocks:
+        q, p, dist = index.neighbors(dx[start:end], dy[start:end], cutoff)
+        load += np.bincount(p, weights=demand[start:end][q] * gravity_weight(dist, beta=beta), minlength=len(supply))
+    ratio = np.divide(supply, load, out=np.zeros(len(supply)), where=load > 0)
+
+    # 2단계: 동별로 거리 가중 치과 부담을 더함 (같은 블록 구간을 다시 질의)
+    access = np.zeros(len(dx))
+    for start, end in blocks:
+        q, p, dist = index.neighbors(dx[start:end], dy[start:end], cutoff)
+        access[start:end] = np.bincount(q, weights=ratio[p] * gravity_weight(dist, beta=beta), minlength=end - start)
+    return access
+
+
+def analyze_accessibility(cutoff=CUTOFF, beta=BETA, budget_mb=MEMORY_BUDGET_MB):
+    if not table_exists('dental_preprocessed') or not table_exists('population_preprocessed'):
+        print("전처리된 데이터 파일이 존재하지 않습니다. 이전 단계를 먼저 수행해주세요.")
+        return None
+
+    df_centers = load_dong_centers()
+    if df_centers is None:
+        print(f"[경고] 동 중심점 파일({CENTROID_PATH})이 없어 접근성 분석을 건너뜁니다.")
+        return None
+
+    # 1. 치과 좌표와 공급 규모 (의료인수가 없으면 1명으로 봄)
+    df_dental = load_table('dental_preprocessed', columns=['좌표X', '좌표Y', '의료인수'])
+    supply = np.maximum(df_dental['의료인수'].fillna(0).to_numpy(dtype=np.float64), 1)
+
+    # 2. 동 중심점 (중심점 파일에 없는 동은 위치를 모르므로 수요점으로 쓰지 않고 결과도 결측)
+    df_pop = load_table('population_preprocessed', columns=[CODE_COL] + REGION_KEYS + ['노인인구수'])
+    df_pop = df_pop.fillna({c: '' for c in REGION_KEYS})
+    df_dong = df_pop[df_pop['읍면동'] != ''].reset_index(drop=True)
+    df_dong = profiling.merge(df_dong, df_centers, name='동×중심점', on=CODE_COL, how='left')
+    no_center = df_dong['좌표X'].isna() | df_dong['좌표Y'].isna()
+    print(f"중심점이 있는 동: {int((~no_center).sum())} / {len(df_dong)}")
+
+    # 3. 블록 단위 2SFCA
+    with profiling.step('접근성 계산'):
+        access = gravity_2sfca(df_dong['좌표X'].to_numpy(), df_dong['좌표Y'].to_numpy(),
+                               df_dong['노인인구수'].fillna(0).to_numpy(), df_dental['좌표X'].to_numpy(),
+                               df_dental['좌표Y'].to_numpy(), supply, cutoff, beta, budget_mb)
+
+    # 4. 공급부족 지표: 노인인구수 / (접근 가능 의료인수 + 1)  — 구별_지표와 같은 '치과 대비 노인 인구' 방향
+    # 거리 상한 안에 치과가 없는 동은 접근 가능 의료인수 0 → 노인인구수 그대로, 중심점이 없는 동은 모두 결측
+    access = np.where(no_center, np.nan, access)
+    df_dong['접근성_지수'] = access * 1000  # 노인 1,000명당 접근 가능한 의료인 수
+    df_dong['접근가능_의료인수'] = access * df_dong['노인인구수']
+    df_dong[SUPPLY_SHORTAGE_COL] = df_dong['노인인구수'] / (df_dong['접근가능_의료인수'] + 1)
+    # 대시보드 지도용 동 중심점 위도·경도
+    df_dong['위도'], df_dong['경도'] = epsg5174_to_wgs84(df_dong['좌표X'].to_numpy(), df_dong['좌표Y'].to_numpy())
+
+    # 5. 결과 출력 및 저장
+    df_dong = df_dong[[CODE_COL] + REGION_KEYS + ['노인인구수', '중심_출처', '위도', '경도', '접근성_지수',
+                                                  '접근가능_의료인수', SUPPLY_SHORTAGE_COL]]
+    df_dong = df_dong.sort_values(by=SUPPLY_SHORTAGE_COL, ascending=False).reset_index(drop=True)
+    print("--- [중력모형 접근성 기준 공급 부족 상위 20개 동] ---")
+    print(df_dong[REGION_KEYS + ['노인인구수', '접근성_지수', SUPPLY_SHORTAGE_COL]].head(20))
+
+    output_path = save_table(df_dong, 'dong_accessibility')
+    profiling.rows('출력', df_dong)
+    print(f"\n결과가 {output_path}에 저장되었습니다.")
+    return df_dong
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="동별 치과 접근성 (중력모형 2SFCA)")
+    parser.add_argument('--cutoff', type=float, default=CUTOFF, help="거리 상한 (미터)")
+    parser.add_argument('--beta', type=float, default=BETA, help="거리 감쇠 지수")
+    parser.add_argument('--budget-mb', type=int, default=MEMORY_BUDGET_MB, help="블록당 후보 쌍 메모리 예산 (MB)")
+    args = parser.parse_args()
+    analyze_accessibility(args.cutoff, args.beta, args.budget_mb)
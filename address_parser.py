@@ -0,0 +1,55 @@
+# 주소 문자열을 시도/시군구/읍면동으로 분리하는 공통 모듈
+# 치과(LOCALDATA), 인구(행정구역), 아파트 실거래(시군구) 데이터가 모두 같은 규칙을 사용합니다.
+# - 시군구가 두 단어인 경우 (예: 수원시 팔달구) 하나의 시군구로 묶음
+# - 시군구가 없는 시도 (세종특별자치시)는 두 번째 단어를 읍면동으로 사용
+# 같은 주소가 수없이 반복되므로 고유 주소만 한 번씩 파싱한 뒤 원래 행으로 펼칩니다.
+import numpy as np
+import pandas as pd
+
+from parallel import PartitionPool, combine, split_by, worker_count
+
+NO_SIGUNGU_SIDO = ['세종특별자치시']
+
+
+def split_unique_addresses(addresses):
+    # 고유 주소 배열을 문자열 벡터 연산으로 한 번에 분리
+    tokens = pd.Series(addresses, dtype=object).str.split(n=4, expand=True)
+    tokens = tokens.reindex(columns=range(4)).fillna('').astype(str)
+    t0, t1, t2, t3 = tokens[0], tokens[1], tokens[2], tokens[3]
+
+    no_sigungu = t0.isin(NO_SIGUNGU_SIDO) & ~t1.str.endswith('시')
+    two_word = t1.str.endswith('시') & t2.str.endswith('구')
+
+    sigungu = np.where(no_sigungu, '', np.where(two_word, t1 + ' ' + t2, t1))
+    dong = np.where(no_sigungu, t1, np.where(two_word, t3, t2))
+    return pd.DataFrame({'시도': t0.to_numpy(), '시군구': sigungu, '읍면동': dong})
+
+
+def parse_region(addresses):
+    # 주소 Series → [시도, 시군구, 읍면동] DataFrame (원래 index 유지, 결측은 빈 문자열)
+    addresses = pd.Series(addresses).fillna('').astype(str).str.strip()
+    codes, uniques = pd.factorize(addresses)
+    parsed = split_unique_addresses(uniques)
+
+    result = parsed.iloc[codes].reset_index(drop=True)
+    result.index = addresses.index
+    return result
+
+
+def _parse_partition(df):
+    return parse_region(df['주소'])
+
+
+def parse_region_by_sido(addresses, workers=None):
+    # parse_region 과 같은 결과를 시도(주소 첫 단어)별로 나눠 프로세스 풀에서 계산
+    # 작업자가 1이면 나누지 않고 parse_region 을 그대로 호출
+    if worker_count(workers) <= 1:
+        return parse_region(addresses)
+    addresses = pd.Series(addresses).fillna('').astype(str).str.strip()
+    # 위치 번호를 index로 두고 나눠야 합친 뒤 원래 행 순서로 되돌릴 수 있음
+    frame = pd.DataFrame({'주소': addresses.to_numpy()})
+    frame['시도키'] = frame['주소'].str.partition(' ')[0]
+    with PartitionPool(workers) as pool:
+        result = combine(pool.map_frames(_parse_partition, split_by(frame, '시도키')))
+    result.index = addresses.index
+    return result
@@ -1,35 +1,31 @@
-import pandas as pd
-import os
+import profiling
+from clinic_registry import SUPPLY_METRICS, SUPPLY_TABLE, load_supply_level
+from data_store import load_table, save_table, table_exists
+from region_dim import CODE_COL
 
 def final_analysis():
     # 1. 파일 로드
-    dental_path = 'data_processed/dental_preprocessed.csv'
-    pop_path = 'data_processed/population_preprocessed.csv'
-    output_path = 'data_processed/final_analysis_result.csv'
-    
-    if not os.path.exists(dental_path) or not os.path.exists(pop_path):
+    if not table_exists(SUPPLY_TABLE) or not table_exists('population_preprocessed'):
         print("필요한 전처리 파일이 없습니다.")
         return
 
-    df_dental = pd.read_csv(dental_path)
-    df_pop = pd.read_csv(pop_path)
-
-    # 2. 치과 데이터 그룹화 (동별 치과 개수 카운트)
-    # NaN 값은 빈 문자열로 대체하여 매칭 확률 높임
-    df_dental['시군구'] = df_dental['시군구'].fillna('')
-    df_dental['읍면동'] = df_dental['읍면동'].fillna('')
-    
-    dental_counts = df_dental.groupby(['시도', '시군구', '읍면동']).size().reset_index(name='치과수')
+    # 동 단위 공급 지표 (치과 등록부 기준 치과 수·종별·의료인·병상 수, 코드를 못 찾은 치과는 제외된 표)
+    dental_counts = load_supply_level('동')
+    df_pop = load_table('population_preprocessed')
+    profiling.rows('치과', int(dental_counts['치과수'].sum()))
+    profiling.rows('인구', df_pop)
 
     # 3. 인구 데이터와 병합 (Left Join)
     df_pop['시군구'] = df_pop['시군구'].fillna('')
     df_pop['읍면동'] = df_pop['읍면동'].fillna('')
     
     # 병합
-    df_merged = pd.merge(df_pop, dental_counts, on=['시도', '시군구', '읍면동'], how='left')
+    df_merged = profiling.merge(df_pop, dental_counts, name='인구×동별치과수', on=CODE_COL, how='left')
     
     # 치과가 없는 지역은 0으로 채움
-    df_merged['치과수'] = df_merged['치과수'].fillna(0).astype(int)
+    for name in SUPPLY_METRICS:
+        df_merged[name] = df_merged[name].fillna(0)
+    df_merged['치과수'] = df_merged['치과수'].astype(int)
 
     # 4. 매칭 확인
     # 읍면동이 비어있지 않은 하위 행정구역 중에서 치과수가 0인 비율 확인
@@ -55,7 +51,8 @@ def final_analysis():
     print(top_20[['시도', '시군구', '읍면동', '노인인구수', '치과수', '치과1개당_노인인구수']])
 
     # 7. 최종 결과 저장
-    df_merged.to_csv(output_path, index=False, encoding='utf-8-sig')
+    output_path = save_table(df_merged, 'final_analysis_result')
+    profiling.rows('출력', df_merged)
     print(f"\n최종 분석 결과 저장됨: {output_path}")
 
 if __name__ == "__main__":
@@ -1,22 +1,19 @@
-import pandas as pd
-import os
+import profiling
+from data_store import load_table, save_table, table_exists
+from region_dim import GU_CODE_COL
 
 def analyze_final_v2():
     # 1. 파일 로드
-    pop_path = 'data_processed/population_preprocessed.csv'
-    gu_score_path = 'data_processed/gu_competition_score.csv'
-    output_path = 'data_processed/final_ranking_v2.csv'
-    
-    if not os.path.exists(pop_path) or not os.path.exists(gu_score_path):
+    if not table_exists('population_preprocessed') or not table_exists('gu_competition_score'):
         print("필요한 데이터 파일이 없습니다. 이전 단계를 먼저 수행해주세요.")
         return
 
-    df_pop = pd.read_csv(pop_path).fillna('')
-    df_gu_score = pd.read_csv(gu_score_path).fillna('')
+    df_pop = load_table('population_preprocessed').fillna('')
+    # 지역명은 인구 데이터 쪽을 사용
+    df_gu_score = load_table('gu_competition_score').drop(columns=['시도', '시군구'])
 
-    # 2. '시군구' 기준으로 Left Join
-    # 시도와 시군구를 함께 매칭하여 지역 오차 방지
-    df_merged = pd.merge(df_pop, df_gu_score, on=['시도', '시군구'], how='left')
+    # 2. 시군구코드 기준으로 Left Join (시도가 다른 같은 이름의 시군구도 코드로 구분)
+    df_merged = profiling.merge(df_pop, df_gu_score, name='인구×구별지표', on=GU_CODE_COL, how='left')
 
     # 3. '최종_유망_지수' 계산
     # 공식: 노인인구수(동 단위) * 구별_지표(구 단위)
@@ -37,7 +34,8 @@ def analyze_final_v2():
     print(top_20[cols_to_show])
 
     # 6. 결과 저장
-    final_ranking.to_csv(output_path, index=False, encoding='utf-8-sig')
+    output_path = save_table(final_ranking, 'final_ranking_v2')
+    profiling.rows('출력', final_ranking)
     print(f"\n분석 결과가 {output_path}에 저장되었습니다.")
 
 if __name__ == "__main__":
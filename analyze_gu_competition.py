@@ -1,34 +1,47 @@
-import pandas as pd
 import os
 
+import profiling
+from clinic_registry import SUPPLY_METRICS, SUPPLY_TABLE, load_supply_level
+from competition_history import HISTORY_PATH, CompetitionHistory
+from data_store import load_table, save_table, table_exists
+from region_dim import GU_CODE_COL
+
 def analyze_gu_competition():
     # 사용자가 언급한 파일명으로 로드 (실제 생성된 경로인 data_processed 사용)
-    # 작업 흐름상 dental_preprocessed.csv와 population_preprocessed.csv를 활용합니다.
-    dental_path = 'data_processed/dental_preprocessed.csv'
-    pop_path = 'data_processed/population_preprocessed.csv'
-    
-    if not os.path.exists(dental_path) or not os.path.exists(pop_path):
+    # 작업 흐름상 dental_supply(지역 단위별 공급 지표)와 population_preprocessed.csv를 활용합니다.
+    if not table_exists(SUPPLY_TABLE) or not table_exists('population_preprocessed'):
         print("전처리된 데이터 파일이 존재하지 않습니다. 이전 단계를 먼저 수행해주세요.")
         return None
 
-    # 1. 치과 데이터 로드 및 시군구별 그룹화
-    df_dental = pd.read_csv(dental_path).fillna('')
-    # 시도와 시군구를 함께 그룹화하여 다른 지역의 같은 '구' 이름 충돌 방지
-    df_gu_dental = df_dental[df_dental['시군구'] != ''].groupby(['시도', '시군구']).size().reset_index(name='구별_치과수')
+    # 1. 시군구 단위 공급 지표 로드 (치과 수, 종별 치과 수, 의료인·병상 수, 총면적)
+    # 치과 전처리에서 모든 지역 단위로 한 번에 집계한 표 사용 (시군구코드 기준 → 다른 지역의 같은 '구' 이름 충돌 없음)
+    df_gu_dental = load_supply_level('시군구')
+    df_gu_dental = df_gu_dental.rename(columns={name: f'구별_{name}' for name in SUPPLY_METRICS})
 
     # 2. 인구 데이터 로드 및 시군구별 그룹화
-    df_pop = pd.read_csv(pop_path).fillna('')
-    # 읍면동이 비어있는 행이 해당 시군구의 합계 데이터임
-    df_gu_pop = df_pop[(df_pop['시군구'] != '') & (df_pop['읍면동'] == '')].copy()
-    df_gu_pop = df_gu_pop.groupby(['시도', '시군구'])['노인인구수'].sum().reset_index(name='구별_노인인구수')
+    df_pop = load_table('population_preprocessed', columns=[GU_CODE_COL, '시도', '시군구', '읍면동', '노인인구수'])
+    df_pop = df_pop.fillna({'시군구': '', '읍면동': ''})
+    # 읍면동이 비어있는 행이 해당 시군구의 합계 데이터임 (지역명은 인구 데이터 기준)
+    df_gu_pop = df_pop[(df_pop['시군구'] != '') & (df_pop['읍면동'] == '')]
+    df_gu_pop = df_gu_pop.groupby(GU_CODE_COL).agg(
+        시도=('시도', 'first'), 시군구=('시군구', 'first'), 구별_노인인구수=('노인인구수', 'sum')).reset_index()
 
     # 3. 데이터 병합
-    df_gu_score = pd.merge(df_gu_pop, df_gu_dental, on=['시도', '시군구'], how='inner')
+    df_gu_score = profiling.merge(df_gu_pop, df_gu_dental, name='구별인구×구별치과수', on=GU_CODE_COL, how='inner')
 
     # 4. '구별_지표' 계산 (노인인구수 / 치과수)
     # 이 값이 클수록 치과 1개당 감당해야 하는 노인 인구가 많아 경쟁이 낮고 수요가 높다고 판단 가능
     df_gu_score['구별_지표'] = df_gu_score['구별_노인인구수'] / df_gu_score['구별_치과수']
 
+    # 4-1. 최근 3년 치과 수 증가 (개업·폐업 이력이 있을 때만, 기준일은 이력의 마지막 개업·폐업일)
+    if os.path.exists(HISTORY_PATH):
+        df_growth = CompetitionHistory.load().growth('gu', years=3)
+        df_growth = df_growth[[GU_CODE_COL, '3년전_치과수', '치과_증가율']].rename(
+            columns={'3년전_치과수': '구별_치과수_3년전', '치과_증가율': '구별_치과_증가율'})
+        df_gu_score = profiling.merge(df_gu_score, df_growth, name='구별지표×치과증가', on=GU_CODE_COL, how='left')
+    else:
+        print(f"개업·폐업 이력({HISTORY_PATH})이 없어 치과 증가율은 생략합니다.")
+
     # 5. 결과 출력 (지표 높은 순 정렬)
     df_gu_score = df_gu_score.sort_values(by='구별_지표', ascending=False).reset_index(drop=True)
     
@@ -36,8 +49,8 @@ def analyze_gu_competition():
     print(df_gu_score.head(20))
     
     # 파일로도 저장
-    output_path = 'data_processed/gu_competition_score.csv'
-    df_gu_score.to_csv(output_path, index=False, encoding='utf-8-sig')
+    output_path = save_table(df_gu_score, 'gu_competition_score')
+    profiling.rows('출력', df_gu_score)
     print(f"\n결과가 {output_path}에 저장되었습니다.")
     
     return df_gu_score
@@ -0,0 +1,77 @@
+import os
+
+import numpy as np
+
+import profiling
+from csv_loader import read_projected_csv
+from data_store import load_table, save_table, table_exists
+from region_dim import CODE_COL, UNKNOWN_CODE, load_region_dim, lookup_codes
+from spatial_index import GridIndex
+
+# 경쟁 치과 수를 셀 반경 (미터, EPSG:5174 평면 좌표 기준)
+RADII = [500, 1000, 2000]
+# 동 중심점 파일 (필수): 시도, 시군구, 읍면동, 좌표X, 좌표Y (EPSG:5174)
+# 동 경계에서 구한 중심점이 없으면 반경 경쟁도를 계산하지 않음 (치과 좌표로 중심점을 만들면 치과가 있는 동만
+# 중심점을 갖고, 그 중심점이 치과 위에 놓여 반경 안 치과 수가 경쟁이 아니라 자기 자신을 세게 됨)
+CENTROID_PATH = 'data_raw/dong_centroids.csv'
+REGION_KEYS = ['시도', '시군구', '읍면동']
+
+
+def load_dong_centers():
+    # 동 중심점 파일 (이름만 있으므로 행정구역 차원 테이블로 코드를 찾음), 파일이나 차원 테이블이 없으면 None
+    dim = load_region_dim()
+    if not os.path.exists(CENTROID_PATH) or dim is None:
+        return None
+    df_centers, _ = read_projected_csv(CENTROID_PATH, REGION_KEYS + ['좌표X', '좌표Y'], dtype={c: str for c in REGION_KEYS})
+    df_centers = df_centers.fillna({c: '' for c in REGION_KEYS})
+    df_centers[CODE_COL] = lookup_codes(df_centers, dim)
+    df_centers = df_centers[df_centers[CODE_COL] != UNKNOWN_CODE].drop(columns=REGION_KEYS)
+    df_centers['중심_출처'] = '중심점파일'
+    return df_centers
+
+
+def analyze_radius_competition(radii=RADII):
+    if not table_exists('dental_preprocessed') or not table_exists('population_preprocessed'):
+        print("전처리된 데이터 파일이 존재하지 않습니다. 이전 단계를 먼저 수행해주세요.")
+        return None
+    df_centers = load_dong_centers()
+    if df_centers is None:
+        print(f"[경고] 동 중심점 파일({CENTROID_PATH})이 없어 반경 경쟁도 분석을 건너뜁니다.")
+        return None
+
+    # 1. 치과 좌표 로드 및 격자 인덱스 생성
+    df_dental = load_table('dental_preprocessed', columns=REGION_KEYS + ['좌표X', '좌표Y', CODE_COL])
+    df_dental = df_dental.fillna({c: '' for c in REGION_KEYS})
+    index = GridIndex(df_dental['좌표X'].to_numpy(), df_dental['좌표Y'].to_numpy())
+    print(f"좌표가 있는 치과: {len(index)} / {len(df_dental)}")
+
+    # 2. 동 단위 인구 데이터와 동 중심점 결합
+    df_pop = load_table('population_preprocessed', columns=[CODE_COL] + REGION_KEYS + ['노인인구수'])
+    df_pop = df_pop.fillna({c: '' for c in REGION_KEYS})
+    df_dong = df_pop[df_pop['읍면동'] != ''].copy()
+    df_dong = profiling.merge(df_dong, df_centers, name='동×중심점', on=CODE_COL, how='left')
+    has_center = df_dong['좌표X'].notna().sum()
+    print(f"중심점이 있는 동: {has_center} / {len(df_dong)}")
+
+    # 3. 모든 동 × 모든 반경을 한 번의 배치 질의로 계산
+    counts = index.count_within(df_dong['좌표X'].to_numpy(), df_dong['좌표Y'].to_numpy(), radii)
+    no_center = df_dong['좌표X'].isna().to_numpy()
+    for j, r in enumerate(radii):
+        col = f'반경{r}m_치과수'
+        # 중심점이 없는 동은 0개가 아니라 결측으로 남김
+        df_dong[col] = np.where(no_center, np.nan, counts[:, j])
+        df_dong[f'반경{r}m_치과1개당_노인인구수'] = df_dong['노인인구수'] / (df_dong[col] + 1)
+
+    # 4. 결과 출력 및 저장
+    sort_col = f'반경{radii[0]}m_치과1개당_노인인구수'
+    df_dong = df_dong.sort_values(by=sort_col, ascending=False).reset_index(drop=True)
+    print("--- [반경별 치과 경쟁 강도 (상위 20개 동)] ---")
+    print(df_dong[REGION_KEYS + ['노인인구수'] + [f'반경{r}m_치과수' for r in radii]].head(20))
+
+    output_path = save_table(df_dong, 'dong_radius_competition')
+    profiling.rows('출력', df_dong)
+    print(f"\n결과가 {output_path}에 저장되었습니다.")
+    return df_dong
+
+if __name__ == "__main__":
+    df_radius = analyze_radius_competition()
@@ -0,0 +1,233 @@
+# 실행 방법: 터미널에서 `python benchmark.py --scale 1 10` 입력
+# 합성 전국 데이터(synthetic_data.py)를 규모별로 만들어 임시 폴더에서 파이프라인 각 단계와
+# 대시보드(src/app.py) 스코어링 경로의 실행 시간·최대 메모리를 측정합니다.
+# - 각 단계는 새 프로세스에서 실행해 최대 메모리(peak RSS)가 단계별로 분리되도록 함
+#   (tracemalloc은 pandas 처리 시간을 몇 배로 늘려 시간 측정을 왜곡하므로 사용하지 않음)
+# - --save-baseline: 결과를 기준값(benchmark_baseline.json)으로 저장
+# - 기준값 파일이 없으면 첫 실행 결과를 기준값으로 저장 (시간·메모리는 기기마다 달라 저장소에 넣지 않음)
+# - 기준값이 있으면 비교해서 허용 범위를 넘게 느려지거나 메모리가 늘어난 항목을 [회귀]로 표시 (종료 코드 1)
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from data_store import FORMAT_ENV, load_table, store_format
+from pipeline import ROOT_DIR, build_stages, load_stage_function
+from scoring_engine import FEATURE_COLS, ScoringEngine, in_scoring_scope
+from synthetic_data import generate_dataset
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BASELINE_PATH = os.path.join(ROOT_DIR, 'benchmark_baseline.json')
+LATEST_PATH = os.path.join(ROOT_DIR, 'data_processed', 'benchmark_latest.json')
+SCALES = [1, 10, 100]
+# 기준 대비 허용 범위 (작은 값은 측정 잡음이 크므로 절대 차이 하한도 함께 적용)
+TIME_TOLERANCE = 0.5
+MEMORY_TOLERANCE = 0.2
+MIN_SECONDS = 0.25
+MIN_MB = 5.0
+APP_RERUNS = 20
+
+
+def peak_rss_mb():
+    # 현재 프로세스의 최대 메모리 사용량
+    # Linux의 ru_maxrss 는 프로세스 생성(fork) 시 부모 값이 이어지므로 /proc 의 VmHWM 을 우선 사용
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 2**10
+    except OSError:
+        pass
+    if resource is None:
+        return float('nan')
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, 그 외는 KB 단위
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+
+def measure(func, *args, **kwargs):
+    # 반환값, 실행 시간(초), 실행 후 최대 메모리(MB) (단계 출력 메시지는 숨김)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func(*args, **kwargs)
+    return result, time.perf_counter() - start, peak_rss_mb()
+
+
+def stage_worker(workdir, stage, fmt):
+    # 새 프로세스에서 단계 하나 실행 (import 후 기본 메모리와 실행 중 최대 메모리를 함께 기록)
+    os.chdir(workdir)
+    os.environ[FORMAT_ENV] = fmt
+    func = load_stage_function(dict(stage, script=os.path.join(ROOT_DIR, stage['script'])))
+    base = peak_rss_mb()
+    _, elapsed, peak = measure(func, **stage['params'])
+    missing = [p for p in stage['outputs'] if not os.path.exists(p)]
+    if missing:
+        raise RuntimeError(f"{stage['name']} 단계 출력이 생성되지 않았습니다: {missing}")
+    return {'seconds': elapsed, 'peak_mb': peak, 'base_mb': base}
+
+
+def load_app_engine():
+    # src/app.py 의 load_data + get_engine 과 같은 경로 (캐시가 비었을 때)
+    df = load_table('final_ranking_v3_economic', columns=['시도', '시군구', '읍면동'] + FEATURE_COLS)
+    df = df[in_scoring_scope(df)]
+    return ScoringEngine(df, group_col='시도')
+
+
+def app_reruns(engine, n=APP_RERUNS, seed=0):
+    # 슬라이더를 움직일 때마다 수행되는 계산 (시도별 전체 점수 + TOP 10)
+    rng = np.random.default_rng(seed)
+    for _ in range(n):
+        pop_weight = round(rng.uniform(0.5, 2.0), 1)
+        econ_weight = round(rng.uniform(0.0, 2.0), 1)
+        for group in engine.groups:
+            engine.frame(group, pop_weight, econ_weight)
+            engine.top_k(group, 10, pop_weight, econ_weight)
+
+
+def app_worker(workdir, fmt):
+    os.chdir(workdir)
+    os.environ[FORMAT_ENV] = fmt
+    base = peak_rss_mb()
+    engine, elapsed, peak = measure(load_app_engine)
+    results = {'app_engine': {'seconds': elapsed, 'peak_mb': peak, 'base_mb': base}}
+    _, elapsed, peak = measure(app_reruns, engine)
+    # 재실행 1회(모든 시도) 평균
+    results['app_rerun'] = {'seconds': elapsed / APP_RERUNS, 'peak_mb': peak, 'base_mb': base}
+    return results
+
+
+def run_isolated(func, *args):
+    # 단계마다 새 프로세스 (이전 단계의 메모리 최고점이 섞이지 않도록)
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+        return pool.submit(func, *args).result()
+
+
+def print_result(name, result):
+    print(f"  {name:<20} {result['seconds']:8.3f}초  최대 {result['peak_mb']:8.1f}MB "
+          f"(기본 {result['base_mb']:.1f}MB)")
+
+
+def run_scale(scale, workdir, seed=0, months=1):
+    print(f"\n=== scale {scale}x (작업 폴더: {workdir}) ===")
+    start = time.perf_counter()
+    sizes = generate_dataset(workdir, scale=scale, seed=seed, months=months)
+    print(f"  합성 데이터 생성 {time.perf_counter() - start:.1f}초: {sizes}")
+
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        # 단계 경로(실거래 파일 검색 포함)는 작업 폴더 기준으로 만들어야 함
+        stages = build_stages()
+    finally:
+        os.chdir(cwd)
+
+    fmt = store_format()
+    results = {}
+    for stage in stages:
+        results[stage['name']] = run_isolated(stage_worker, workdir, stage, fmt)
+        print_result(stage['name'], results[stage['name']])
+    for name, result in run_isolated(app_worker, workdir, fmt).items():
+        results[name] = result
+        print_result(name, result)
+    return {'rows': {k: int(v) for k, v in sizes.items()}, 'stages': results}
+
+
+def compare(results, baseline):
+    # 기준값 대비 회귀 항목 목록
+    regressions = []
+    for scale, current in results['scales'].items():
+        base = baseline.get('scales', {}).get(scale)
+        if base is None:
+            continue
+        for name, now in current['stages'].items():
+            before = base['stages'].get(name)
+            if before is None:
+                continue
+            if (now['seconds'] > before['seconds'] * (1 + TIME_TOLERANCE)
+                    and now['seconds'] - before['seconds'] > MIN_SECONDS):
+                regressions.append(f"{scale}x {name}: 시간 {before['seconds']:.2f}초 → {now['seconds']:.2f}초")
+            if (now['peak_mb'] > before['peak_mb'] * (1 + MEMORY_TOLERANCE)
+                    and now['peak_mb'] - before['peak_mb'] > MIN_MB):
+                regressions.append(f"{scale}x {name}: 메모리 {before['peak_mb']:.1f}MB → {now['peak_mb']:.1f}MB")
+    return regressions
+
+
+def save_json(data, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def run_benchmark(scales=SCALES, seed=0, months=1, keep=False):
+    results = {
+        'meta': {
+            'measured_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'format': store_format(),
+            'seed': seed,
+            'months': months,
+        },
+        'scales': {},
+    }
+    for scale in scales:
+        workdir = tempfile.mkdtemp(prefix=f'dental_bench_{scale}x_')
+        try:
+            results['scales'][str(scale)] = run_scale(scale, workdir, seed, months)
+        finally:
+            if not keep:
+                shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="합성 전국 데이터로 단계별 성능 측정")
+    parser.add_argument('--scale', type=int, nargs='+', default=[1], help="데이터 규모 배수 (예: 1 10 100)")
+    parser.add_argument('--months', type=int, default=1, help="생성할 실거래 월 수")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--format', choices=['csv', 'parquet'], help="중간 결과 저장 형식")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="기준값 파일 경로")
+    parser.add_argument('--save-baseline', action='store_true', help="이번 결과를 기준값으로 저장")
+    parser.add_argument('--keep', action='store_true', help="합성 데이터 작업 폴더를 지우지 않음")
+    args = parser.parse_args()
+
+    if args.format:
+        os.environ[FORMAT_ENV] = args.format
+
+    results = run_benchmark(args.scale, args.seed, args.months, args.keep)
+    save_json(results, LATEST_PATH)
+    print(f"\n측정 결과 저장: {LATEST_PATH}")
+
+    if args.save_baseline:
+        save_json(results, args.baseline)
+        print(f"기준값 저장: {args.baseline}")
+        sys.exit(0)
+
+    if not os.path.exists(args.baseline):
+        save_json(results, args.baseline)
+        print(f"기준값 파일이 없어 이번 결과를 기준값으로 저장했습니다: {args.baseline}")
+        print("이번 실행은 비교하지 않았고, 다음 실행부터 이 기준값과 비교합니다.")
+        sys.exit(0)
+    with open(args.baseline, encoding='utf-8') as f:
+        regressions = compare(results, json.load(f))
+    if regressions:
+        print("\n--- [성능 회귀] ---")
+        for line in regressions:
+            print(f"[회귀] {line}")
+        sys.exit(1)
+    print("기준값 대비 회귀 없음")
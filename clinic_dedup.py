@@ -0,0 +1,190 @@
+# 영업 중 치과 중복 정리 (이전·재등록·치과병원/치과의원 이중 등재)
+# 모든 치과 쌍을 비교하지 않도록 후보를 먼저 묶고(blocking), 묶음 안에서만 이름·주소 n-gram 유사도를 비교합니다.
+# - 좌표가 있는 치과: 같은 시군구이면서 BLOCK_RADIUS 안에 있는 쌍만 (격자 인덱스로 주변 칸만 조회)
+# - 좌표가 없는 치과: 같은 시군구이면서 정규화한 이름이 같은 쌍만
+# 이름 유사도가 높고 같은 자리(SAME_SITE 이내)이거나 주소 유사도가 높으면 같은 치과로 보고,
+# 연결된 쌍을 하나의 클러스터로 묶어(union-find) 클러스터마다 대표 한 곳만 공급 집계에 남깁니다.
+# 대표는 인허가일자가 가장 최근인 행 (같으면 의료인수가 많은 행, 그래도 같으면 먼저 등록된 행)
+# 클러스터 번호는 클러스터에서 가장 먼저 등록된 치과의 관리번호 → 일부 지역만 다시 묶어도 같은 번호
+# 변동분만 적용한 실행은 바뀐 치과가 속한 후보 묶음(연결 요소)만 다시 묶음 (affected_rows)
+import re
+
+import numpy as np
+import pandas as pd
+
+from region_dim import GU_CODE_COL, UNKNOWN_CODE
+from spatial_index import GridIndex
+
+DEDUP_COLUMNS = ['관리번호', '병원명', '주소', '좌표X', '좌표Y', GU_CODE_COL, '인허가일자', '의료인수', '영업중']
+# 변동분 적용 전 위치 (삭제·이동한 치과의 예전 이웃을 다시 묶기 위해)
+POSITION_COLUMNS = ['관리번호', '병원명', '좌표X', '좌표Y', GU_CODE_COL]
+REPORT_COLUMNS = ['클러스터', '클러스터크기', '관리번호', '병원명', '주소', GU_CODE_COL, '인허가일자', '의료인수', '대표']
+BLOCK_RADIUS = 100.0  # 미터 (EPSG:5174)
+SAME_SITE = 30.0
+NAME_THRESHOLD = 0.7
+ADDRESS_THRESHOLD = 0.6
+NGRAM = 2
+# 이름 비교 전에 지우는 종별·법인 표기
+NAME_NOISE = re.compile(r'\(.*?\)|\s|의료법인|치과병원|치과의원|치과|의원')
+ADDRESS_NOISE = re.compile(r'\(.*?\)|[\s,]')
+
+
+def normalize_names(names):
+    names = pd.Series(names, dtype=object).fillna('').astype(str)
+    core = names.str.replace(NAME_NOISE, '', regex=True)
+    # 종별 표기만 있는 이름은 공백만 지운 원래 이름으로 비교
+    return core.where(core != '', names.str.replace(r'\s', '', regex=True)).to_numpy(dtype=object)
+
+
+def normalize_addresses(addresses):
+    addresses = pd.Series(addresses, dtype=object).fillna('').astype(str)
+    return addresses.str.replace(ADDRESS_NOISE, '', regex=True).to_numpy(dtype=object)
+
+
+def ngram_ids(texts, n=NGRAM):
+    # 행별 문자 n-gram 번호 (CSR 형식: 행 시작 위치 offsets, 번호 ids), 행 안에서는 중복 없음
+    # n 글자보다 짧으면 문자열 전체가 n-gram 하나, 빈 문자열은 n-gram 없음
+    grams = [{text[i:i + n] for i in range(len(text) - n + 1)} or ({text} if text else set()) for text in texts]
+    offsets = np.zeros(len(grams) + 1, dtype=np.int64)
+    np.cumsum([len(row) for row in grams], out=offsets[1:])
+    flat = np.array([gram for row in grams for gram in row], dtype=object)
+    ids = np.unique(flat, return_inverse=True)[1].astype(np.int64) if len(flat) else np.empty(0, np.int64)
+    return offsets, ids
+
+
+def _ragged(offsets, rows):
+    # 각 행의 CSR 구간 위치를 이어 붙인 배열
+    counts = offsets[rows + 1] - offsets[rows]
+    ends = np.cumsum(counts)
+    return np.repeat(offsets[rows] - (ends - counts), counts) + np.arange(ends[-1] if len(ends) else 0)
+
+
+def jaccard(grams, left, right):
+    # 쌍별 n-gram 자카드 유사도 (반복문 없이 배열 연산, 빈 문자열끼리는 0)
+    # 쌍마다 두 행의 n-gram 번호를 (쌍 번호, n-gram 번호) 키로 이어 붙여 정렬하면 교집합은 인접한 같은 키
+    # → 후보 쌍 수 × 행당 n-gram 수에 비례 (정렬 제외)
+    offsets, ids = grams
+    n_left = offsets[left + 1] - offsets[left]
+    n_right = offsets[right + 1] - offsets[right]
+    pair = np.arange(len(left), dtype=np.int64)
+    span = int(ids.max()) + 1 if len(ids) else 1
+    keys = np.concatenate([np.repeat(pair, n_left) * span + ids[_ragged(offsets, left)],
+                           np.repeat(pair, n_right) * span + ids[_ragged(offsets, right)]])
+    keys.sort()
+    shared = keys[1:][keys[1:] == keys[:-1]] // span
+    inter = np.bincount(shared, minlength=len(left)).astype(np.float64)
+    union = n_left + n_right - inter
+    return np.divide(inter, union, out=np.zeros(len(left)), where=union > 0)
+
+
+def candidate_pairs(df, radius=BLOCK_RADIUS):
+    # (i, j, 거리) 후보 쌍, i < j (좌표 없는 쌍의 거리는 NaN)
+    gu = df[GU_CODE_COL].to_numpy(dtype=np.int64)
+    x = df['좌표X'].to_numpy(dtype=np.float64)
+    y = df['좌표Y'].to_numpy(dtype=np.float64)
+
+    # 1. 좌표 묶음: 반경 안의 쌍을 격자 인덱스로 한 번에
+    index = GridIndex(x, y, cell_size=radius)
+    left, right, dist = index.neighbors(x, y, radius)
+    keep = (left < right) & (gu[left] == gu[right]) & (gu[left] != UNKNOWN_CODE)
+    left, right, dist = left[keep], right[keep], dist[keep]
+
+    # 2. 좌표 없는 치과: 같은 시군구·같은 정규화 이름끼리
+    no_xy = np.flatnonzero(~(np.isfinite(x) & np.isfinite(y)))
+    names = normalize_names(df['병원명'].to_numpy()[no_xy])
+    groups = pd.DataFrame({'row': no_xy, 'gu': gu[no_xy], 'name': names})
+    groups = groups[groups['gu'] != UNKNOWN_CODE]
+    extra = [(a, b) for rows in groups.groupby(['gu', 'name'])['row'].agg(list) if len(rows) > 1
+             for k, a in enumerate(rows) for b in rows[k + 1:]]
+    if extra:
+        extra = np.array(extra, dtype=np.int64)
+        left = np.concatenate([left, extra[:, 0]])
+        right = np.concatenate([right, extra[:, 1]])
+        dist = np.concatenate([dist, np.full(len(extra), np.nan)])
+    return left, right, dist
+
+
+def cluster_labels(n, left, right):
+    # union-find: 연결된 행들이 가장 작은 행 번호를 공유 (최솟값 전파 + 경로 압축을 변화가 없을 때까지 반복)
+    labels = np.arange(n)
+    while True:
+        low = np.minimum(labels[left], labels[right])
+        updated = labels.copy()
+        np.minimum.at(updated, left, low)
+        np.minimum.at(updated, right, low)
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def affected_rows(df, changed_keys, before):
+    # df: 영업 중인 치과 (DEDUP_COLUMNS, 등록 순서), changed_keys: 변동분으로 추가·변경·삭제된 관리번호,
+    # before: 그 치과들의 변동분 적용 전 위치 (POSITION_COLUMNS)
+    # → 다시 묶어야 하는 행 여부: 바뀐 치과 또는 그 예전 자리의 후보 이웃과 후보 쌍으로 이어진 행 전체
+    # 후보 쌍은 같은 시군구 안에서만 생기므로 해당 시군구만 보면 되고, 다른 묶음의 결과는 그대로임
+    gu = df[GU_CODE_COL].to_numpy(dtype=np.int64)
+    x = df['좌표X'].to_numpy(dtype=np.float64)
+    y = df['좌표Y'].to_numpy(dtype=np.float64)
+    seed = df['관리번호'].isin(changed_keys).to_numpy().copy()
+
+    # 예전 자리: 좌표가 있으면 반경 안 같은 시군구 치과, 없으면 같은 시군구·같은 정규화 이름의 좌표 없는 치과
+    old_gu = before[GU_CODE_COL].to_numpy(dtype=np.int64)
+    q, p, _ = GridIndex(x, y, cell_size=BLOCK_RADIUS).neighbors(
+        before['좌표X'].to_numpy(dtype=np.float64), before['좌표Y'].to_numpy(dtype=np.float64), BLOCK_RADIUS)
+    seed[p[gu[p] == old_gu[q]]] = True
+    no_xy = ~(np.isfinite(x) & np.isfinite(y))
+    old_no_xy = before['좌표X'].isna() | before['좌표Y'].isna()
+    old_names = set(zip(old_gu[old_no_xy.to_numpy()], normalize_names(before.loc[old_no_xy, '병원명'].to_numpy())))
+    if old_names:
+        names = normalize_names(df['병원명'].to_numpy())
+        seed |= no_xy & np.array([(g, name) in old_names for g, name in zip(gu, names)], dtype=bool)
+
+    # 해당 시군구의 후보 쌍 연결 요소 중 seed 가 있는 요소
+    in_gu = np.isin(gu, np.concatenate([gu[seed], old_gu])) & (gu != UNKNOWN_CODE)
+    rows = np.flatnonzero(in_gu)
+    left, right, _ = candidate_pairs(df.iloc[rows])
+    labels = cluster_labels(len(rows), left, right)
+    affected = np.zeros(len(df), dtype=bool)
+    affected[rows[np.isin(labels, labels[seed[rows]])]] = True
+    return affected | seed
+
+
+def find_duplicates(df):
+    # df: 영업 중인 치과 (DEDUP_COLUMNS, 등록 순서) → (중복으로 제외할 행 여부, 행별 클러스터 번호 또는 None)
+    df = df.reset_index(drop=True)
+    left, right, dist = candidate_pairs(df)
+    # n-gram 은 후보 쌍에 등장하는 행만 만듦 (대부분의 치과는 주변에 후보가 없음)
+    rows = np.unique(np.concatenate([left, right]))
+    pair_left, pair_right = np.searchsorted(rows, left), np.searchsorted(rows, right)
+    names = ngram_ids(normalize_names(df['병원명'].to_numpy()[rows]))
+    addresses = ngram_ids(normalize_addresses(df['주소'].to_numpy()[rows]))
+    name_sim = jaccard(names, pair_left, pair_right)
+    address_sim = jaccard(addresses, pair_left, pair_right)
+    same = (name_sim >= NAME_THRESHOLD) & ((dist <= SAME_SITE) | (address_sim >= ADDRESS_THRESHOLD))
+    print(f"중복 후보 쌍: {len(left)}개 → 같은 치과로 판단: {int(same.sum())}개")
+
+    labels = cluster_labels(len(df), left[same], right[same])
+    sizes = np.bincount(labels, minlength=len(df))[labels]
+    in_cluster = sizes > 1
+
+    # 클러스터별 대표: 인허가일자 최근 → 의료인수 많음 → 먼저 등록된 행
+    opened = pd.to_numeric(df['인허가일자'].fillna('').astype(str).str.replace(r'\D', '', regex=True).str[:8],
+                           errors='coerce').fillna(0).to_numpy()
+    order = np.lexsort((np.arange(len(df)), -df['의료인수'].to_numpy(), -opened, labels))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = labels[order][1:] != labels[order][:-1]
+    representative = np.zeros(len(df), dtype=bool)
+    representative[order[first]] = True
+    excluded = in_cluster & ~representative
+    clusters = np.where(in_cluster, df['관리번호'].to_numpy(dtype=object)[labels], None)
+    return excluded, clusters
+
+
+def cluster_report(df):
+    # df: 등록부의 클러스터 소속 치과 (DEDUP_COLUMNS + 중복제외, 중복클러스터, 등록 순서) → 클러스터 보고서
+    report = df.rename(columns={'중복클러스터': '클러스터'})
+    report = report.assign(클러스터크기=report.groupby('클러스터')['관리번호'].transform('size').astype('int64'),
+                           대표=(report['중복제외'] == 0).astype('int64'))
+    report = report.sort_values(['클러스터', '대표'], ascending=[True, False], kind='stable')
+    return report[REPORT_COLUMNS].reset_index(drop=True)
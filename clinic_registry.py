@@ -0,0 +1,282 @@
+# 치과 등록부 (관리번호 기준 SQLite 저장소)
+# 전체 파일(치과병원/치과의원.csv)은 처음 한 번(또는 전체 파일이 바뀌었을 때)만 읽어 등록부를 만들고,
+# 이후 LOCALDATA 변동분 파일은 바뀐 행만 upsert(신규·변경) / 삭제합니다.
+# - 폐업 등 영업 상태가 바뀐 치과도 행으로 남기고 영업중 여부(영업중 컬럼)만 바꿈
+# - 다른 치과와 같은 곳으로 판단된 중복 등재(clinic_dedup)는 중복제외=1 로 표시해 공급 집계에서 뺌
+# - 지역별 공급 지표(supply_counts: 치과 수, 종별 치과 수, 의료인·병상 수, 총면적 합계)는
+#   트리거가 행 변경마다 더하고 빼서 갱신 → 전체 재집계 없음, 시군구·시도 합계는 이 작은 표에서 계산
+# - 같은 관리번호의 더 오래된 변경(최종수정시점이 저장된 값보다 이전)은 무시
+# - 적용한 파일은 source_files 에 크기·수정시각·해시로 기록해 다시 적용하지 않음
+import os
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_store import load_table, table_exists
+from housing_ingest import file_sha256, file_unchanged
+from region_dim import CODE_COL, GU_CODE_COL, SIDO_CODE_COL
+
+REGISTRY_PATH = os.path.join('data_processed', 'clinic_registry.sqlite')
+KEY_COL = '관리번호'
+TEXT_COLS = ['병원명', '주소', '시도', '시군구', '읍면동', '인허가일자', '폐업일자', '영업상태', '최종수정시점', '의료기관종별명',
+             '중복클러스터']
+REAL_COLS = ['좌표X', '좌표Y', '위도', '경도', '총면적']
+INT_COLS = [CODE_COL, GU_CODE_COL, '개방자치단체코드', '영업중', '중복제외', '의료인수', '병상수']
+# 공급 집계에 들어가는 행 (영업 중이고 중복 등재가 아닌 치과)
+COUNTED = "{x}.영업중 = 1 AND {x}.중복제외 = 0"
+CLINIC_COLUMNS = [KEY_COL] + TEXT_COLS + REAL_COLS + INT_COLS
+
+# 지역별 공급 지표: 이름 → 치과 한 곳의 기여분 ({x} 는 NEW/OLD/clinics)
+# 공급 지표 컬럼은 NOT NULL 이므로 종별명이 비어(NULL) 있어도 0/1 이 되도록 = 대신 IS, 숫자는 COALESCE
+KINDS = ['치과병원', '치과의원']
+SUPPLY_METRICS = {
+    '치과수': '1',
+    '치과병원수': "({x}.의료기관종별명 IS '치과병원')",
+    '치과의원수': "({x}.의료기관종별명 IS '치과의원')",
+    '기타종별수': f"(COALESCE({{x}}.의료기관종별명, '') NOT IN ({', '.join(repr(kind) for kind in KINDS)}))",
+    '의료인수': 'COALESCE({x}.의료인수, 0)',
+    '병상수': 'COALESCE({x}.병상수, 0)',
+    '총면적': 'COALESCE({x}.총면적, 0)',
+}
+REAL_METRICS = ['총면적']
+SUPPLY_COLS = [CODE_COL, GU_CODE_COL] + list(SUPPLY_METRICS)
+SUPPLY_TABLE = 'dental_supply'
+LEVEL_COL = '지역단위'
+REGION_CODE_COL = '지역코드'
+# 공급 지표 표의 지역 단위와 downstream 에서 쓰는 코드 컬럼
+SUPPLY_LEVELS = {'동': CODE_COL, '시군구': GU_CODE_COL, '시도': SIDO_CODE_COL}
+
+
+def _metric_values(x):
+    return ', '.join(expr.format(x=x) for expr in SUPPLY_METRICS.values())
+
+
+TABLES_SQL = f"""
+CREATE TABLE IF NOT EXISTS clinics (
+    {KEY_COL} TEXT PRIMARY KEY,
+    {', '.join(f'{col} TEXT' for col in TEXT_COLS)},
+    {', '.join(f'{col} REAL' for col in REAL_COLS)},
+    {', '.join(f'{col} INTEGER NOT NULL DEFAULT 0' for col in INT_COLS)}
+);
+
+CREATE TABLE IF NOT EXISTS supply_counts (
+    {CODE_COL} INTEGER NOT NULL,
+    {GU_CODE_COL} INTEGER NOT NULL,
+    {', '.join(f"{name} {'REAL' if name in REAL_METRICS else 'INTEGER'} NOT NULL" for name in SUPPLY_METRICS)},
+    PRIMARY KEY ({CODE_COL}, {GU_CODE_COL})
+);
+
+CREATE TABLE IF NOT EXISTS source_files (
+    path TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    size INTEGER,
+    mtime_ns INTEGER,
+    sha256 TEXT,
+    rows INTEGER,
+    applied_at TEXT
+);
+"""
+
+# 이전 버전(컬럼이 다른) 등록부나 전체 재생성 시 모두 지움 → 적용 기록도 지워져 전체 파일부터 다시 만듦
+RESET_SQL = "DROP TABLE IF EXISTS clinics; DROP TABLE IF EXISTS supply_counts; DROP TABLE IF EXISTS source_files;"
+
+_ADD_METRICS = ', '.join(f'{name} = {name} + excluded.{name}' for name in SUPPLY_METRICS)
+_SUB_METRICS = ', '.join(f'{name} = {name} - {expr.format(x="OLD")}' for name, expr in SUPPLY_METRICS.items())
+
+# 지역 키 인덱스와 지역별 공급 지표 트리거 (전체 생성 시에는 적재 후에 만들어 행마다 갱신하지 않음)
+# 트리거는 연결할 때마다 다시 만듦 → 지표 식이 바뀌어도 기존 등록부의 트리거가 새 식을 씀
+INDEX_SQL = f"""
+DROP TRIGGER IF EXISTS clinics_insert;
+DROP TRIGGER IF EXISTS clinics_delete;
+DROP TRIGGER IF EXISTS clinics_update;
+CREATE INDEX IF NOT EXISTS clinics_region ON clinics ({CODE_COL});
+CREATE INDEX IF NOT EXISTS clinics_gu ON clinics ({GU_CODE_COL});
+
+CREATE TRIGGER IF NOT EXISTS clinics_insert AFTER INSERT ON clinics WHEN {COUNTED.format(x='NEW')}
+BEGIN
+    INSERT INTO supply_counts VALUES (NEW.{CODE_COL}, NEW.{GU_CODE_COL}, {_metric_values('NEW')})
+    ON CONFLICT ({CODE_COL}, {GU_CODE_COL}) DO UPDATE SET {_ADD_METRICS};
+END;
+
+CREATE TRIGGER IF NOT EXISTS clinics_delete AFTER DELETE ON clinics WHEN {COUNTED.format(x='OLD')}
+BEGIN
+    UPDATE supply_counts SET {_SUB_METRICS}
+    WHERE {CODE_COL} = OLD.{CODE_COL} AND {GU_CODE_COL} = OLD.{GU_CODE_COL};
+END;
+
+CREATE TRIGGER IF NOT EXISTS clinics_update
+AFTER UPDATE OF 영업중, 중복제외, {CODE_COL}, {GU_CODE_COL}, 의료기관종별명, 의료인수, 병상수, 총면적 ON clinics
+BEGIN
+    UPDATE supply_counts SET {_SUB_METRICS}
+    WHERE {COUNTED.format(x='OLD')} AND {CODE_COL} = OLD.{CODE_COL} AND {GU_CODE_COL} = OLD.{GU_CODE_COL};
+    INSERT INTO supply_counts SELECT NEW.{CODE_COL}, NEW.{GU_CODE_COL}, {_metric_values('NEW')}
+    WHERE {COUNTED.format(x='NEW')}
+    ON CONFLICT ({CODE_COL}, {GU_CODE_COL}) DO UPDATE SET {_ADD_METRICS};
+END;
+"""
+
+# 최종수정시점이 더 최근이거나 어느 한쪽이라도 없으면 덮어씀
+UPSERT_SQL = f"""
+INSERT INTO clinics ({', '.join(CLINIC_COLUMNS)}) VALUES ({', '.join('?' * len(CLINIC_COLUMNS))})
+ON CONFLICT ({KEY_COL}) DO UPDATE SET {', '.join(f'{col} = excluded.{col}' for col in CLINIC_COLUMNS[1:])}
+WHERE excluded.최종수정시점 IS NULL OR clinics.최종수정시점 IS NULL OR excluded.최종수정시점 >= clinics.최종수정시점
+"""
+
+
+def connect(path=REGISTRY_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path)
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(clinics)")]
+    if columns and columns != CLINIC_COLUMNS:
+        print("등록부 컬럼이 바뀌어 전체 파일부터 다시 생성합니다.")
+        conn.executescript(RESET_SQL)
+    conn.executescript(TABLES_SQL + INDEX_SQL)
+    return conn
+
+
+def _records(df, columns):
+    # DataFrame → executemany 용 튜플 (결측은 NULL, NumPy 스칼라는 파이썬 값으로)
+    values = df[columns].astype(object).where(df[columns].notna(), None)
+    return list(values.itertuples(index=False, name=None))
+
+
+def file_records(conn, kind):
+    rows = conn.execute("SELECT path, size, mtime_ns, sha256 FROM source_files WHERE kind = ?", (kind,))
+    return {path: {'size': size, 'mtime_ns': mtime_ns, 'sha256': sha256} for path, size, mtime_ns, sha256 in rows}
+
+
+def files_unchanged(conn, kind, paths):
+    # 기록된 파일 목록과 내용이 모두 그대로인지 (파일이 추가·삭제·변경되면 False)
+    records = file_records(conn, kind)
+    return set(records) == set(paths) and all(file_unchanged(path, records[path]) for path in paths)
+
+
+def record_file(conn, path, kind, rows):
+    st = os.stat(path)
+    conn.execute(
+        "INSERT OR REPLACE INTO source_files VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (path, kind, st.st_size, st.st_mtime_ns, file_sha256(path), rows, time.strftime('%Y-%m-%d %H:%M:%S')),
+    )
+
+
+def set_files(conn, kind, paths):
+    # kind 의 기록을 주어진 파일 목록으로 교체
+    conn.execute("DELETE FROM source_files WHERE kind = ?", (kind,))
+    for path in paths:
+        record_file(conn, path, kind, None)
+
+
+def _snapshot(conn, keys, columns=('영업중', CODE_COL, '최종수정시점')):
+    # 주어진 관리번호들의 현재 값 (기본: 영업중 여부·행정구역코드·최종수정시점, 등록부에 없는 번호는 제외)
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS _keys (관리번호 TEXT PRIMARY KEY)")
+    conn.execute("DELETE FROM _keys")
+    conn.executemany("INSERT OR IGNORE INTO _keys VALUES (?)", ((key,) for key in keys))
+    return pd.read_sql_query(
+        f"SELECT c.{KEY_COL}, {', '.join(f'c.{col}' for col in columns)} FROM clinics c "
+        f"JOIN _keys k ON c.{KEY_COL} = k.관리번호 ORDER BY c.rowid",
+        conn,
+    ).set_index(KEY_COL)
+
+
+def load_positions(conn, keys, columns):
+    # 변동분 적용 전 위치 등 주어진 관리번호들의 현재 값 (관리번호 컬럼 포함, 등록부에 없는 번호는 제외)
+    dtype = {col: 'float64' for col in REAL_COLS if col in columns}
+    dtype.update({col: 'int64' for col in INT_COLS if col in columns})
+    columns = [col for col in columns if col != KEY_COL]
+    return _snapshot(conn, keys, columns).reset_index().astype(dtype)
+
+
+def replace_all(conn, df):
+    # 전체 파일 기준으로 등록부를 새로 만듦
+    # 행마다 트리거·인덱스를 갱신하지 않도록 빈 테이블에 한 번에 적재하고 공급 지표는 GROUP BY 한 번으로 계산
+    df = df.drop_duplicates(KEY_COL, keep='last')
+    conn.executescript(RESET_SQL + TABLES_SQL)
+    with conn:
+        conn.executemany(f"INSERT INTO clinics ({', '.join(CLINIC_COLUMNS)}) VALUES ({', '.join('?' * len(CLINIC_COLUMNS))})",
+                         _records(df, CLINIC_COLUMNS))
+        sums = ', '.join(f'SUM({expr.format(x="clinics")})' for expr in SUPPLY_METRICS.values())
+        conn.execute(f"INSERT INTO supply_counts SELECT {CODE_COL}, {GU_CODE_COL}, {sums} FROM clinics "
+                     f"WHERE {COUNTED.format(x='clinics')} GROUP BY {CODE_COL}, {GU_CODE_COL}")
+    conn.executescript(INDEX_SQL)
+
+
+def apply_changes(conn, df, deleted):
+    # 변동분 적용: deleted=True 인 행은 삭제, 나머지는 upsert → 상태 변화 통계
+    keys = df[KEY_COL].tolist()
+    before = _snapshot(conn, keys)
+    with conn:
+        conn.executemany(f"DELETE FROM clinics WHERE {KEY_COL} = ?", ((key,) for key in df.loc[deleted, KEY_COL]))
+        conn.executemany(UPSERT_SQL, _records(df[~deleted], CLINIC_COLUMNS))
+    after = _snapshot(conn, keys)
+
+    was_open = before['영업중'].reindex(keys).fillna(0).to_numpy(dtype=np.int64) == 1
+    is_open = after['영업중'].reindex(keys).fillna(0).to_numpy(dtype=np.int64) == 1
+    moved = before[CODE_COL].reindex(keys).to_numpy() != after[CODE_COL].reindex(keys).to_numpy()
+    existed = np.asarray(pd.Index(keys).isin(before.index))
+    exists = np.asarray(pd.Index(keys).isin(after.index))
+    # 저장된 값보다 오래된 변경이라 적용되지 않은 행
+    stored = before['최종수정시점'].reindex(keys).to_numpy(dtype=object)
+    incoming = df['최종수정시점'].to_numpy(dtype=object)
+    both = pd.notna(stored) & pd.notna(incoming) & ~deleted
+    stale = np.zeros(len(keys), dtype=bool)
+    stale[both] = incoming[both] < stored[both]
+    return {
+        '신규': int((~existed & exists).sum()),
+        '변경': int((existed & exists & ~stale).sum()),
+        '삭제': int((existed & ~exists).sum()),
+        '무시': int(stale.sum()),
+        '개업': int((~was_open & is_open).sum()),
+        '폐업': int((was_open & ~is_open & exists).sum()),
+        '지역이동': int((was_open & is_open & moved).sum()),
+    }
+
+
+def update_codes(conn, df):
+    # 행정구역코드·시군구코드만 갱신 (지역별 공급 지표는 트리거가 옮김)
+    with conn:
+        conn.executemany(f"UPDATE clinics SET {CODE_COL} = ?, {GU_CODE_COL} = ? WHERE {KEY_COL} = ?",
+                         _records(df, [CODE_COL, GU_CODE_COL, KEY_COL]))
+
+
+def set_duplicates(conn, keys, excluded, clusters):
+    # 중복제외 표시·중복클러스터 갱신 (값이 바뀐 행만 UPDATE → 트리거가 해당 지역 공급 지표만 옮김) → 바뀐 행 수
+    with conn:
+        cursor = conn.executemany(
+            f"UPDATE clinics SET 중복제외 = ?, 중복클러스터 = ? WHERE {KEY_COL} = ? AND (중복제외 != ? OR 중복클러스터 IS NOT ?)",
+            ((int(flag), cluster, key, int(flag), cluster) for key, flag, cluster in zip(keys, excluded, clusters)),
+        )
+    return cursor.rowcount
+
+
+def load_clinics(conn, active_only=True, columns=None):
+    # 등록 순서(rowid) 그대로 → 전체 파일 순서가 유지되고 새 치과는 뒤에 붙음
+    # active_only: 공급 집계 대상(영업 중이고 중복 등재가 아닌 치과)만
+    columns = columns or CLINIC_COLUMNS
+    where = f"WHERE {COUNTED.format(x='clinics')}" if active_only else ""
+    dtype = {col: 'float64' for col in REAL_COLS if col in columns}
+    dtype.update({col: 'int64' for col in INT_COLS if col in columns})
+    return pd.read_sql_query(f"SELECT {', '.join(columns)} FROM clinics {where} ORDER BY rowid", conn, dtype=dtype)
+
+
+def load_supply(conn):
+    # 동·시군구·시도 단위 공급 지표를 한 표로 (지역단위, 지역코드, 지표...)
+    # 지역(행정구역코드, 시군구코드)별 합계 표에서 단위별로 다시 더하기만 함 (코드를 못 찾은 치과는 제외)
+    # 총면적은 증감 누적에 따른 부동소수 오차를 없애기 위해 소수 둘째 자리로 반올림
+    sido = f"(CASE WHEN {GU_CODE_COL} != 0 THEN {GU_CODE_COL} ELSE {CODE_COL} END) / 100000000 * 100000000"
+    sums = ', '.join(f'ROUND(SUM({name}), 2)' if name in REAL_METRICS else f'SUM({name})' for name in SUPPLY_METRICS)
+    queries = [f"SELECT {i}, '{level}', {key}, {sums} FROM supply_counts WHERE 치과수 > 0 AND {key} != 0 GROUP BY {key}"
+               for i, (level, key) in enumerate(zip(SUPPLY_LEVELS, [CODE_COL, GU_CODE_COL, sido]))]
+    df = pd.read_sql_query(' UNION ALL '.join(queries) + ' ORDER BY 1, 3', conn).iloc[:, 1:]
+    df.columns = [LEVEL_COL, REGION_CODE_COL] + list(SUPPLY_METRICS)
+    return df.astype({REGION_CODE_COL: 'int64', **{name: 'int64' for name in SUPPLY_METRICS if name not in REAL_METRICS}})
+
+
+def load_supply_level(level, columns=None):
+    # 저장된 공급 지표 표(dental_supply)에서 한 지역 단위만 → 지역코드를 해당 단위의 코드 컬럼 이름으로
+    if not table_exists(SUPPLY_TABLE):
+        return None
+    df = load_table(SUPPLY_TABLE)
+    df = df[df[LEVEL_COL] == level].drop(columns=LEVEL_COL).rename(columns={REGION_CODE_COL: SUPPLY_LEVELS[level]})
+    return df.reset_index(drop=True) if columns is None else df[columns].reset_index(drop=True)
@@ -0,0 +1,161 @@
+# 치과 개업·폐업 이력 기반 시점별 경쟁 강도
+# 등록부(폐업한 치과 포함)의 인허가일자·폐업일자를 지역별로 정렬된 이벤트 배열로 저장해두고,
+# 임의의 날짜(또는 여러 날짜)의 지역별 치과 수를 groupby 없이 이진 탐색 한 번으로 구합니다.
+# 치과 수(d) = (d 이전에 개업한 수) - (d 이전에 폐업한 수)
+# - 지역마다 개업일·폐업일을 정렬해 이어 붙이고 지역 시작 위치(offsets)를 둠 (CSR 형식)
+# - (지역 위치 × SPAN + 일자)를 키로 쓰면 전체 배열이 정렬되어 있어 np.searchsorted 로 모든 지역·날짜를 한 번에 질의
+# - 인허가일자가 없는 치과는 아주 오래전(1900-01-01) 개업으로 봄
+# - 폐업했지만 폐업일자가 없으면 최종수정시점을 폐업일로 사용, 둘 다 없으면 이력에서 제외(개수 출력)
+# - 중복 등재로 공급 집계에서 빠진 치과(중복제외)는 이력에서도 제외 → 기준일 치과 수가 공급 지표와 같음
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from region_dim import CODE_COL, GU_CODE_COL, UNKNOWN_CODE
+
+HISTORY_PATH = os.path.join('data_processed', 'competition_history.npz')
+LEVELS = {'dong': CODE_COL, 'gu': GU_CODE_COL}
+HISTORY_COLUMNS = ['관리번호', '인허가일자', '폐업일자', '최종수정시점', '영업중', '중복제외', CODE_COL, GU_CODE_COL]
+BASE_DATE = pd.Timestamp('1900-01-01')
+SPAN = 2 ** 20  # 일자 범위 (1900년부터 약 2800년) — 지역 위치별 키 간격
+
+
+def to_days(values):
+    # '2005-03-02', '20050302', '2005-03-02 00:00:00' 등 → 1900-01-01 기준 일수 (날짜가 아니면 -1)
+    digits = pd.Series(values, dtype=object).fillna('').astype(str).str.replace(r'\D', '', regex=True).str[:8]
+    dates = pd.to_datetime(digits, format='%Y%m%d', errors='coerce')
+    days = (dates - BASE_DATE).dt.days
+    return days.where((days >= 0) & (days < SPAN)).fillna(-1).to_numpy(dtype=np.int64)
+
+
+def date_to_day(date):
+    # 문자열·Timestamp 모두 str 로 바꾸면 앞 8자리 숫자가 연월일
+    return int(to_days([str(date)])[0])
+
+
+def day_to_date(day):
+    return BASE_DATE + pd.Timedelta(days=int(day))
+
+
+def _csr(region_pos, days, n_regions):
+    # 지역 위치·일자 순으로 정렬한 일자 배열과 지역별 시작 위치
+    order = np.lexsort((days, region_pos))
+    offsets = np.zeros(n_regions + 1, dtype=np.int64)
+    np.cumsum(np.bincount(region_pos, minlength=n_regions), out=offsets[1:])
+    return offsets, days[order].astype(np.int32)
+
+
+class CompetitionHistory:
+    def __init__(self, levels):
+        # levels: {'dong'/'gu': {'codes', 'open_offsets', 'open_days', 'close_offsets', 'close_days'}}
+        self.levels = levels
+
+    @classmethod
+    def build(cls, clinics):
+        # clinics: 등록부 전체 행 (clinic_registry.load_clinics(active_only=False, columns=HISTORY_COLUMNS))
+        open_days = to_days(clinics['인허가일자'])
+        open_days = np.where(open_days < 0, 0, open_days)
+        active = clinics['영업중'].to_numpy(dtype=np.int64) == 1
+        close_days = to_days(clinics['폐업일자'])
+        close_days = np.where(close_days < 0, to_days(clinics['최종수정시점']), close_days)
+        # 영업 중인 치과는 폐업 이벤트 없음, 폐업일이 개업일보다 앞서면 개업일에 폐업한 것으로 봄
+        close_days = np.where(active | (close_days < 0), -1, np.maximum(close_days, open_days))
+        undated = ~active & (close_days < 0)
+        if undated.any():
+            print(f"폐업일자·최종수정시점이 모두 없는 폐업 치과 {int(undated.sum())}개는 이력에서 제외합니다.")
+        duplicate = clinics['중복제외'].to_numpy(dtype=np.int64) == 1
+
+        levels = {}
+        for level, col in LEVELS.items():
+            codes = clinics[col].to_numpy(dtype=np.int64)
+            keep = (codes != UNKNOWN_CODE) & ~undated & ~duplicate
+            region_codes, region_pos = np.unique(codes[keep], return_inverse=True)
+            closed = ~active[keep]
+            open_offsets, open_sorted = _csr(region_pos, open_days[keep], len(region_codes))
+            close_offsets, close_sorted = _csr(region_pos[closed], close_days[keep][closed], len(region_codes))
+            levels[level] = {
+                'codes': region_codes,
+                'open_offsets': open_offsets,
+                'open_days': open_sorted,
+                'close_offsets': close_offsets,
+                'close_days': close_sorted,
+            }
+        return cls(levels)
+
+    @classmethod
+    def load(cls, path=HISTORY_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            levels = {level: {name: data[f'{level}_{name}'] for name in
+                              ['codes', 'open_offsets', 'open_days', 'close_offsets', 'close_days']}
+                      for level in LEVELS}
+        return cls(levels)
+
+    def save(self, path=HISTORY_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.savez_compressed(path, **{f'{level}_{name}': values
+                                     for level, arrays in self.levels.items() for name, values in arrays.items()})
+        return path
+
+    def codes(self, level='gu'):
+        return self.levels[level]['codes']
+
+    def last_day(self):
+        # 이력의 가장 마지막 개업·폐업일 (기본 기준일 → 실행 날짜와 관계없이 같은 결과)
+        days = np.concatenate([arrays[name] for arrays in self.levels.values() for name in ['open_days', 'close_days']])
+        return int(days.max()) if len(days) else 0
+
+    def _count(self, offsets, days, day_matrix):
+        # day_matrix: (지역 수, 날짜 수) → 각 지역에서 일자 ≤ 날짜인 이벤트 수
+        n = len(offsets) - 1
+        region_pos = np.repeat(np.arange(n, dtype=np.int64), np.diff(offsets))
+        keys = region_pos * SPAN + days
+        query = np.arange(n, dtype=np.int64)[:, None] * SPAN + day_matrix
+        return np.searchsorted(keys, query, side='right') - offsets[:-1, None]
+
+    def counts_at_dates(self, dates, level='gu'):
+        # 여러 날짜의 지역별 치과 수 → DataFrame (행: 지역 코드, 열: 날짜)
+        arrays = self.levels[level]
+        days = np.array([date_to_day(date) for date in dates], dtype=np.int64)
+        if (days < 0).any():
+            raise ValueError(f"날짜 형식이 올바르지 않습니다: {list(dates)}")
+        day_matrix = np.broadcast_to(days, (len(arrays['codes']), len(days)))
+        counts = (self._count(arrays['open_offsets'], arrays['open_days'].astype(np.int64), day_matrix)
+                  - self._count(arrays['close_offsets'], arrays['close_days'].astype(np.int64), day_matrix))
+        columns = [day_to_date(day).strftime('%Y-%m-%d') for day in days]
+        return pd.DataFrame(counts, index=pd.Index(arrays['codes'], name=LEVELS[level]), columns=columns)
+
+    def counts_at(self, date, level='gu'):
+        # 한 날짜의 지역별 치과 수 (Series, 인덱스: 지역 코드)
+        return self.counts_at_dates([date], level).iloc[:, 0].rename('치과수')
+
+    def growth(self, level='gu', years=3, as_of=None):
+        # 기준일과 years 년 전의 치과 수·증가율 (증가율 = 증가 수 / (과거 치과 수 + 1))
+        as_of = day_to_date(self.last_day()) if as_of is None else pd.Timestamp(as_of)
+        before = as_of - pd.DateOffset(years=years)
+        counts = self.counts_at_dates([before, as_of], level)
+        now, past = counts.iloc[:, 1], counts.iloc[:, 0]
+        return pd.DataFrame({
+            '기준일_치과수': now,
+            f'{years}년전_치과수': past,
+            '치과_증가율': (now - past) / (past + 1),
+        }).reset_index()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="시점별 지역 치과 수 조회 (개업·폐업 이력)")
+    parser.add_argument('dates', nargs='*', help="조회할 날짜 (예: 2022-01-01), 없으면 증가율 출력")
+    parser.add_argument('--level', choices=list(LEVELS), default='gu', help="지역 단위 (dong: 읍면동, gu: 시군구)")
+    parser.add_argument('--years', type=int, default=3, help="증가율 비교 기간 (년)")
+    args = parser.parse_args()
+
+    if not os.path.exists(HISTORY_PATH):
+        print(f"이력 파일이 없습니다: {HISTORY_PATH} (치과 전처리를 먼저 수행해주세요)")
+    else:
+        history = CompetitionHistory.load()
+        if args.dates:
+            print(history.counts_at_dates(args.dates, args.level).head(20))
+        else:
+            print(f"기준일: {day_to_date(history.last_day()):%Y-%m-%d}")
+            print(history.growth(args.level, args.years).sort_values('치과_증가율', ascending=False).head(20))
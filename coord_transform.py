@@ -0,0 +1,97 @@
+# EPSG:5174 (Korean 1985 / Modified Central Belt, 베셀 타원체) → WGS84 경위도 변환
+# LOCALDATA 좌표정보X/Y(EPSG5174)를 지도에 그리기 위해 pyproj 없이 NumPy 배열 연산으로 한 번에 변환합니다.
+#   1. 횡메르카토르(TM) 역변환: 평면 X/Y → 베셀 타원체 경위도
+#   2. 경위도 → 지구중심 직교좌표(XYZ) → 7변수 Helmert 변환(towgs84, position vector 방식) → WGS84 XYZ
+#   3. WGS84 XYZ → 경위도 (Bowring 근사 후 한 번 보정)
+# 좌표가 없는(NaN) 점은 결과도 NaN
+import numpy as np
+
+# +proj=tmerc +lat_0=38 +lon_0=127.0028902777778 +k=1 +x_0=200000 +y_0=500000 +ellps=bessel
+#  +towgs84=-115.80,474.99,674.11,1.16,-2.31,-1.63,6.43
+BESSEL_A = 6377397.155
+BESSEL_F = 1 / 299.1528128
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+LAT0 = 38.0
+LON0 = 127.0028902777778
+K0 = 1.0
+X0 = 200000.0
+Y0 = 500000.0
+TOWGS84 = (-115.80, 474.99, 674.11, 1.16, -2.31, -1.63, 6.43)  # 이동(m) 3개, 회전(초) 3개, 축척(ppm)
+
+
+def _meridian_arc(lat, a, e2):
+    # 적도에서 위도 lat 까지의 자오선 호 길이
+    e4, e6 = e2 * e2, e2 * e2 * e2
+    return a * ((1 - e2 / 4 - 3 * e4 / 64 - 5 * e6 / 256) * lat
+                - (3 * e2 / 8 + 3 * e4 / 32 + 45 * e6 / 1024) * np.sin(2 * lat)
+                + (15 * e4 / 256 + 45 * e6 / 1024) * np.sin(4 * lat)
+                - (35 * e6 / 3072) * np.sin(6 * lat))
+
+
+def tm_inverse(x, y, a=BESSEL_A, f=BESSEL_F, lat0=LAT0, lon0=LON0, k0=K0, x0=X0, y0=Y0):
+    # 횡메르카토르 평면좌표 → 타원체 경위도 (라디안)
+    e2 = f * (2 - f)
+    ep2 = e2 / (1 - e2)
+    m = _meridian_arc(np.radians(lat0), a, e2) + (np.asarray(y, dtype=np.float64) - y0) / k0
+    mu = m / (a * (1 - e2 / 4 - 3 * e2 ** 2 / 64 - 5 * e2 ** 3 / 256))
+    e1 = (1 - np.sqrt(1 - e2)) / (1 + np.sqrt(1 - e2))
+    phi1 = (mu + (3 * e1 / 2 - 27 * e1 ** 3 / 32) * np.sin(2 * mu)
+            + (21 * e1 ** 2 / 16 - 55 * e1 ** 4 / 32) * np.sin(4 * mu)
+            + (151 * e1 ** 3 / 96) * np.sin(6 * mu)
+            + (1097 * e1 ** 4 / 512) * np.sin(8 * mu))
+
+    sin1, cos1, tan1 = np.sin(phi1), np.cos(phi1), np.tan(phi1)
+    c1 = ep2 * cos1 ** 2
+    t1 = tan1 ** 2
+    n1 = a / np.sqrt(1 - e2 * sin1 ** 2)
+    r1 = a * (1 - e2) / (1 - e2 * sin1 ** 2) ** 1.5
+    d = (np.asarray(x, dtype=np.float64) - x0) / (n1 * k0)
+
+    lat = phi1 - (n1 * tan1 / r1) * (d ** 2 / 2
+                                     - (5 + 3 * t1 + 10 * c1 - 4 * c1 ** 2 - 9 * ep2) * d ** 4 / 24
+                                     + (61 + 90 * t1 + 298 * c1 + 45 * t1 ** 2 - 252 * ep2 - 3 * c1 ** 2) * d ** 6 / 720)
+    lon = np.radians(lon0) + (d - (1 + 2 * t1 + c1) * d ** 3 / 6
+                              + (5 - 2 * c1 + 28 * t1 - 3 * c1 ** 2 + 8 * ep2 + 24 * t1 ** 2) * d ** 5 / 120) / cos1
+    return lat, lon
+
+
+def geodetic_to_geocentric(lat, lon, a, f, h=0.0):
+    e2 = f * (2 - f)
+    n = a / np.sqrt(1 - e2 * np.sin(lat) ** 2)
+    return ((n + h) * np.cos(lat) * np.cos(lon),
+            (n + h) * np.cos(lat) * np.sin(lon),
+            (n * (1 - e2) + h) * np.sin(lat))
+
+
+def helmert(x, y, z, params=TOWGS84):
+    # 7변수 Helmert 변환 (PROJ towgs84 와 같은 position vector 방식, 회전은 초 단위)
+    tx, ty, tz, rx, ry, rz, ppm = params
+    rx, ry, rz = np.radians(np.array([rx, ry, rz]) / 3600)
+    s = 1 + ppm * 1e-6
+    return (tx + s * (x - rz * y + ry * z),
+            ty + s * (rz * x + y - rx * z),
+            tz + s * (-ry * x + rx * y + z))
+
+
+def geocentric_to_geodetic(x, y, z, a, f):
+    # Bowring 근사로 위도를 구한 뒤 한 번 더 보정 (지표 근처 점은 mm 이하 오차)
+    e2 = f * (2 - f)
+    b = a * (1 - f)
+    ep2 = (a * a - b * b) / (b * b)
+    p = np.hypot(x, y)
+    theta = np.arctan2(z * a, p * b)
+    lat = np.arctan2(z + ep2 * b * np.sin(theta) ** 3, p - e2 * a * np.cos(theta) ** 3)
+    for _ in range(2):
+        n = a / np.sqrt(1 - e2 * np.sin(lat) ** 2)
+        h = p / np.cos(lat) - n
+        lat = np.arctan2(z, p * (1 - e2 * n / (n + h)))
+    return lat, np.arctan2(y, x)
+
+
+def epsg5174_to_wgs84(x, y):
+    # 평면 좌표 배열 → (위도, 경도) 도 단위 배열
+    lat, lon = tm_inverse(x, y)
+    gx, gy, gz = helmert(*geodetic_to_geocentric(lat, lon, BESSEL_A, BESSEL_F))
+    lat, lon = geocentric_to_geodetic(gx, gy, gz, WGS84_A, WGS84_F)
+    return np.degrees(lat), np.degrees(lon)
@@ -0,0 +1,106 @@
+# 원본(raw) CSV 로더
+# - 파일 앞부분의 바이트 샘플만 보고 인코딩을 판별하고, 결과를 파일별로 캐시
+#   (파일 크기·수정시각이 같으면 다음 실행에서도 재사용)
+# - 필요한 컬럼만 지정한 타입으로 읽어 대용량 원본 로딩 시간과 메모리를 줄임
+import codecs
+import json
+import os
+
+import pandas as pd
+
+ENCODING_CACHE_PATH = os.path.join('data_processed', '.encoding_cache.json')
+SAMPLE_SIZE = 64 * 1024
+# utf-8 검증이 가장 엄격하므로 먼저 시도 (euc-kr은 cp949의 부분집합)
+CANDIDATE_ENCODINGS = ['utf-8', 'cp949']
+FALLBACK_ENCODINGS = ['cp949', 'euc-kr', 'utf-8-sig', 'utf-8']
+
+_cache = None
+
+
+def _load_cache():
+    global _cache
+    if _cache is None:
+        _cache = {}
+        if os.path.exists(ENCODING_CACHE_PATH):
+            try:
+                with open(ENCODING_CACHE_PATH, encoding='utf-8') as f:
+                    _cache = json.load(f)
+            except (OSError, ValueError):
+                _cache = {}
+    return _cache
+
+
+def _save_cache():
+    try:
+        os.makedirs(os.path.dirname(ENCODING_CACHE_PATH), exist_ok=True)
+        with open(ENCODING_CACHE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(_cache, f, ensure_ascii=False, indent=2)
+    except OSError:
+        pass
+
+
+def detect_encoding(sample, truncated=True):
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    for enc in CANDIDATE_ENCODINGS:
+        try:
+            sample.decode(enc)
+            return enc
+        except UnicodeDecodeError as e:
+            # 샘플 끝에서 멀티바이트 문자가 잘린 경우는 정상으로 간주
+            if truncated and e.start >= len(sample) - 3:
+                try:
+                    sample[:e.start].decode(enc)
+                    return enc
+                except UnicodeDecodeError:
+                    pass
+    return None
+
+
+def _remember(path, encoding):
+    st = os.stat(path)
+    _load_cache()[os.path.abspath(path)] = {
+        'size': st.st_size,
+        'mtime_ns': st.st_mtime_ns,
+        'encoding': encoding,
+    }
+    _save_cache()
+
+
+def sniff_encoding(path, sample_size=SAMPLE_SIZE):
+    st = os.stat(path)
+    cached = _load_cache().get(os.path.abspath(path))
+    if cached and cached['size'] == st.st_size and cached['mtime_ns'] == st.st_mtime_ns:
+        return cached['encoding']
+
+    with open(path, 'rb') as f:
+        sample = f.read(sample_size)
+    encoding = detect_encoding(sample, truncated=len(sample) == sample_size)
+    if encoding is not None:
+        _remember(path, encoding)
+    return encoding
+
+
+def read_projected_csv(path, columns, dtype=None, **kwargs):
+    # columns 중 파일에 실제로 있는 컬럼만 읽음 (없는 컬럼은 무시)
+    encoding = sniff_encoding(path)
+    candidates = [encoding] if encoding else []
+    candidates += [enc for enc in FALLBACK_ENCODINGS if enc != encoding]
+
+    last_error = None
+    for enc in candidates:
+        try:
+            header = pd.read_csv(path, encoding=enc, nrows=0, **kwargs).columns
+            usecols = [col for col in columns if col in header]
+            col_dtype = None
+            if dtype is not None:
+                col_dtype = dtype if not isinstance(dtype, dict) else {c: t for c, t in dtype.items() if c in usecols}
+            df = pd.read_csv(path, encoding=enc, usecols=usecols, dtype=col_dtype, **kwargs)
+        except UnicodeDecodeError as e:
+            # 샘플 이후에서 판별이 틀린 경우에만 다른 인코딩으로 재시도
+            last_error = e
+            continue
+        if enc != encoding:
+            _remember(path, enc)
+        return df, enc
+    raise last_error
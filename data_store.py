@@ -0,0 +1,156 @@
+# data_processed 단계 간 중간 결과 저장/로드
+# 기본 형식은 기존과 같은 utf-8-sig CSV이고, 환경변수 DENTAL_STORE_FORMAT=parquet 을 주면
+# 타입이 지정된 Parquet(열 지향)으로 저장합니다. (pyarrow 필요, 없으면 CSV로 대체)
+# - 시도/시군구/읍면동은 사전(dictionary) 인코딩된 category 로 저장
+# - 개수 등 정수 컬럼은 가능한 가장 작은 정수형으로 다운캐스트
+# - load_table(columns=[...]) 로 필요한 컬럼만 읽을 수 있음
+import os
+
+import pandas as pd
+
+PROCESSED_DIR = 'data_processed'
+REGION_COLS = ['시도', '시군구', '읍면동']
+FORMAT_ENV = 'DENTAL_STORE_FORMAT'
+EXTENSIONS = {'csv': '.csv', 'parquet': '.parquet'}
+
+_warned = False
+
+
+def parquet_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def store_format():
+    global _warned
+    fmt = os.environ.get(FORMAT_ENV, 'csv').strip().lower()
+    if fmt not in EXTENSIONS:
+        raise ValueError(f"{FORMAT_ENV} 값은 {list(EXTENSIONS)} 중 하나여야 합니다: {fmt}")
+    if fmt == 'parquet' and not parquet_available():
+        if not _warned:
+            print("pyarrow가 설치되어 있지 않아 CSV 형식으로 저장합니다.")
+            _warned = True
+        return 'csv'
+    return fmt
+
+
+def table_path(name, fmt=None):
+    fmt = fmt or store_format()
+    return os.path.join(PROCESSED_DIR, name + EXTENSIONS[fmt])
+
+
+def find_table(name):
+    # 설정된 형식을 우선 찾고, 없으면 다른 형식으로 저장된 파일을 사용
+    preferred = store_format()
+    for fmt in [preferred] + [f for f in EXTENSIONS if f != preferred]:
+        if fmt == 'parquet' and not parquet_available():
+            continue
+        path = table_path(name, fmt)
+        if os.path.exists(path):
+            return path, fmt
+    return None, None
+
+
+def table_exists(name):
+    return find_table(name)[0] is not None
+
+
+def apply_schema(df):
+    # 지역 컬럼은 빈 문자열을 포함한 category, 정수 컬럼은 다운캐스트
+    df = df.copy()
+    for col in df.columns:
+        if col in REGION_COLS:
+            df[col] = df[col].astype(object).where(df[col].notna(), '').astype(str).astype('category')
+            if '' not in df[col].cat.categories:
+                df[col] = df[col].cat.add_categories([''])
+        elif pd.api.types.is_integer_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+    return df
+
+
+def save_table(df, name, fmt=None):
+    fmt = fmt or store_format()
+    os.makedirs(PROCESSED_DIR, exist_ok=True)
+    path = table_path(name, fmt)
+    if fmt == 'parquet':
+        apply_schema(df).to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False, encoding='utf-8-sig')
+    return path
+
+
+def table_columns(name):
+    # 데이터를 읽지 않고 컬럼 이름만 확인 (선택 컬럼이 있는지 볼 때 사용)
+    path, fmt = find_table(name)
+    if path is None:
+        return []
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        return list(pq.read_schema(path).names)
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def load_table(name, columns=None):
+    path, fmt = find_table(name)
+    if path is None:
+        raise FileNotFoundError(f"저장된 테이블이 없습니다: {table_path(name)}")
+    if fmt == 'parquet':
+        return pd.read_parquet(path, columns=columns)
+    return pd.read_csv(path, usecols=columns)
+
+
+class TableWriter:
+    # 청크 단위로 테이블을 이어서 저장 (CSV는 이어쓰기, Parquet은 row group 추가)
+    # 청크마다 값의 범위가 다를 수 있으므로 Parquet 정수 컬럼은 다운캐스트하지 않고
+    # category 컬럼은 int32 인덱스 사전으로 고정해 모든 청크의 스키마를 맞춤
+    def __init__(self, name, fmt=None):
+        self.fmt = fmt or store_format()
+        self.path = table_path(name, self.fmt)
+        self.rows = 0
+        self._writer = None
+        self._schema = None
+        os.makedirs(PROCESSED_DIR, exist_ok=True)
+
+    def write(self, df):
+        if self.fmt == 'parquet':
+            self._write_parquet(df)
+        elif self.rows == 0:
+            df.to_csv(self.path, index=False, encoding='utf-8-sig')
+        else:
+            # BOM은 파일 맨 앞에 한 번만 기록
+            df.to_csv(self.path, index=False, header=False, mode='a', encoding='utf-8')
+        self.rows += len(df)
+
+    def _write_parquet(self, df):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        df = df.copy()
+        for col in REGION_COLS:
+            if col in df.columns:
+                df[col] = df[col].astype(object).where(df[col].notna(), '').astype(str)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self._schema is None:
+            fields = []
+            for field in table.schema:
+                if field.name in REGION_COLS:
+                    field = pa.field(field.name, pa.dictionary(pa.int32(), pa.string()))
+                fields.append(field)
+            self._schema = pa.schema(fields, metadata=table.schema.metadata)
+            self._writer = pq.ParquetWriter(self.path, self._schema)
+        self._writer.write_table(table.cast(self._schema))
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        return self.path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
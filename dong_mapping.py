@@ -0,0 +1,175 @@
+# 행정동 → 법정동 매핑 테이블
+# 인구/랭킹 데이터는 행정동(신정3동), 아파트 실거래 데이터는 법정동(신정동) 기준이라
+# 한 번 매핑 테이블을 만들어 저장해두고 경제력 지표 결합 시 재사용합니다.
+# - 하나의 행정동이 여러 법정동에 대응할 수 있음 (예: 종로1.2.3.4가동 → 종로1가~종로4가)
+# - 매칭 방식과 시도별 매칭률 리포트를 함께 저장
+# - data_raw/dong_mapping_manual.csv (시도, 시군구, 행정동, 법정동) 가 있으면 자동 매칭보다 우선
+# - 행정동 쪽은 행정구역코드를 함께 저장해 랭킹 데이터와 정수 코드로 조인
+#   (실거래 데이터에는 법정동 코드가 없어 법정동 쪽은 이름으로 조인)
+import os
+
+import pandas as pd
+
+import profiling
+from csv_loader import read_projected_csv
+from data_store import load_table, save_table, table_exists
+from housing_ingest import STATS_KEYS, STATS_TABLE
+from region_dim import CODE_COL, UNKNOWN_CODE
+
+MANUAL_MAPPING_PATH = 'data_raw/dong_mapping_manual.csv'
+GU_KEYS = ['시도', '시군구']
+MAPPING_COLS = ['시도', '시군구', '행정동', '법정동', '매칭방식']
+
+
+def base_dong_names(names):
+    # 행정동 번호 제거: 신정3동 → 신정동, 상도제1동 → 상도동 ('제기동'처럼 이름의 '제'는 유지)
+    return names.str.replace(r'제(?=\d)|[\d.,·]', '', regex=True)
+
+
+def expand_numbered_ga(admin):
+    # 종로1.2.3.4가동 → 종로1가, 종로2가, 종로3가, 종로4가 (행 하나가 여러 법정동 후보로 펼쳐짐)
+    parts = admin['행정동'].str.extract(r'^(?P<stem>\D+?)(?P<nums>\d+(?:[.,·]\d+)*)가동$')
+    parts = pd.concat([admin, parts], axis=1).dropna(subset=['stem'])
+    parts['num'] = parts['nums'].str.split(r'[.,·]', regex=True)
+    parts = parts.explode('num')
+    # explode 결과는 object 타입이라 문자열로 맞춘 뒤 결합 (해당 행이 없을 때도 동작하도록)
+    parts['법정동'] = parts['stem'] + parts['num'].astype(str) + '가'
+    return parts[list(admin.columns) + ['법정동']]
+
+
+def build_mapping(admin_dongs, legal_dongs, manual=None):
+    # admin_dongs: (행정구역코드)/시도/시군구/행정동, legal_dongs: 시도/시군구/법정동 (모두 고유값 기준으로 처리)
+    admin_cols = ([CODE_COL] if CODE_COL in admin_dongs.columns else []) + GU_KEYS + ['행정동']
+    admin = admin_dongs[admin_cols].drop_duplicates().reset_index(drop=True)
+    legal = legal_dongs[GU_KEYS + ['법정동']].drop_duplicates()
+
+    candidates = [
+        # 1. 이름이 같은 경우
+        admin.assign(법정동=admin['행정동'], 매칭방식='동일명'),
+        # 2. 번호를 뗀 이름이 같은 경우
+        admin.assign(법정동=base_dong_names(admin['행정동']), 매칭방식='번호제거'),
+        # 3. 'n가동' 묶음을 개별 법정동으로 펼친 경우
+        expand_numbered_ga(admin).assign(매칭방식='가동분리'),
+    ]
+    mapping = profiling.merge(pd.concat(candidates, ignore_index=True), legal, name='매칭후보×법정동',
+                              on=GU_KEYS + ['법정동'], how='inner')
+
+    # 행정동마다 가장 앞선(정확한) 방식으로 매칭된 결과만 사용
+    method_rank = {method: i for i, method in enumerate(['동일명', '번호제거', '가동분리'])}
+    mapping['_rank'] = mapping['매칭방식'].map(method_rank)
+    best = mapping.groupby(GU_KEYS + ['행정동'])['_rank'].transform('min')
+    mapping = mapping[mapping['_rank'] == best].drop(columns='_rank')
+
+    # 수동 매핑은 같은 행정동의 자동 매칭 결과를 대체
+    if manual is not None and not manual.empty:
+        manual = manual[GU_KEYS + ['행정동', '법정동']].assign(매칭방식='수동')
+        keys = manual[GU_KEYS + ['행정동']].drop_duplicates()
+        mapping = mapping.merge(keys, on=GU_KEYS + ['행정동'], how='left', indicator=True)
+        mapping = mapping[mapping['_merge'] == 'left_only'].drop(columns='_merge')
+        if CODE_COL in admin.columns:
+            # 수동 매핑 행정동의 코드는 행정동 목록에서 찾음 (목록에 없으면 0)
+            manual = manual.merge(admin[[CODE_COL] + GU_KEYS + ['행정동']], on=GU_KEYS + ['행정동'], how='left')
+            manual[CODE_COL] = manual[CODE_COL].fillna(UNKNOWN_CODE).astype('int64')
+        mapping = pd.concat([mapping, manual], ignore_index=True)
+
+    cols = ([CODE_COL] if CODE_COL in admin.columns else []) + MAPPING_COLS
+    return mapping[cols].drop_duplicates().sort_values(MAPPING_COLS).reset_index(drop=True)
+
+
+def mapping_report(admin_dongs, legal_dongs, mapping):
+    # 실거래 데이터가 있는 시도만 대상으로 행정동 매칭률 집계
+    covered_sido = legal_dongs['시도'].unique()
+    admin = admin_dongs[GU_KEYS + ['행정동']].drop_duplicates()
+    admin = admin[admin['시도'].isin(covered_sido)]
+
+    method = mapping.groupby(GU_KEYS + ['행정동'])['매칭방식'].first().reset_index()
+    admin = admin.merge(method, on=GU_KEYS + ['행정동'], how='left')
+    admin['매칭방식'] = admin['매칭방식'].fillna('미매칭')
+
+    report = admin.pivot_table(index='시도', columns='매칭방식', values='행정동', aggfunc='count', fill_value=0)
+    report['행정동수'] = report.sum(axis=1)
+    matched = report['행정동수'] - (report['미매칭'] if '미매칭' in report.columns else 0)
+    report['매칭률'] = matched / report['행정동수']
+    report = report.reset_index()
+    report.columns.name = None
+    unmatched = admin[admin['매칭방식'] == '미매칭'].drop(columns='매칭방식')
+    return report, unmatched
+
+
+def load_legal_dongs():
+    # 실거래 누적 집계(housing_ingest)의 법정동 목록
+    if not table_exists(STATS_TABLE):
+        return pd.DataFrame(columns=GU_KEYS + ['법정동'])
+    legal = load_table(STATS_TABLE, columns=STATS_KEYS).fillna('').astype(str)
+    return legal.drop_duplicates().reset_index(drop=True)
+
+
+def legal_pairs(df, mapping):
+    # df의 각 행(행정동) 번호(_row)와 대응하는 법정동 쌍 (행정동 하나가 여러 행으로 펼쳐질 수 있음)
+    # 양쪽에 행정구역코드가 있으면 코드로, 없으면(이전 형식의 매핑 테이블) 시도/시군구/행정동 이름으로 조인
+    if CODE_COL in df.columns and CODE_COL in mapping.columns:
+        keys = df[[CODE_COL]].reset_index(drop=True)
+        keys['_row'] = keys.index
+        keys = keys[keys[CODE_COL] != UNKNOWN_CODE]
+        pairs = profiling.merge(keys, mapping, name='행정동→법정동', on=CODE_COL, how='inner')
+        return pairs[['_row'] + GU_KEYS + ['법정동']]
+
+    keys = df[GU_KEYS + ['읍면동']].astype(str).reset_index(drop=True)
+    keys['_row'] = keys.index
+    pairs = profiling.merge(keys, mapping, name='행정동→법정동',
+                            left_on=GU_KEYS + ['읍면동'], right_on=GU_KEYS + ['행정동'], how='inner')
+    return pairs[['_row'] + GU_KEYS + ['법정동']]
+
+
+def attach_legal_values(df, mapping, legal_stats, count_col, sum_cols):
+    # df의 각 행(행정동)에 대응하는 법정동 통계를 합산해 붙임 (한 번의 merge + groupby)
+    # legal_stats: 시도/시군구/법정동 별 count_col, sum_cols (합계이므로 여러 법정동을 그대로 더할 수 있음)
+    pairs = profiling.merge(legal_pairs(df, mapping), legal_stats, name='법정동×실거래집계',
+                            on=GU_KEYS + ['법정동'], how='inner')
+    sums = pairs.groupby('_row')[[count_col] + sum_cols].sum()
+    return sums.reindex(range(len(df)))
+
+
+def build_dong_mapping():
+    if not table_exists('population_preprocessed'):
+        print("인구 전처리 결과가 없습니다. 이전 단계를 먼저 수행해주세요.")
+        return None
+
+    # 1. 행정동 목록 (인구 데이터의 동 단위 행)
+    df_pop = load_table('population_preprocessed', columns=[CODE_COL, '시도', '시군구', '읍면동'])
+    df_pop = df_pop.fillna({'시군구': '', '읍면동': ''})
+    df_pop = df_pop[df_pop['읍면동'] != ''].astype({col: str for col in ['시도', '시군구', '읍면동']})
+    admin_dongs = df_pop.rename(columns={'읍면동': '행정동'})
+
+    # 2. 법정동 목록 (아파트 실거래 데이터)
+    legal_dongs = load_legal_dongs()
+    if legal_dongs.empty:
+        print("실거래 데이터가 없어 매핑 테이블을 만들 수 없습니다.")
+        return None
+
+    manual = None
+    if os.path.exists(MANUAL_MAPPING_PATH):
+        manual, _ = read_projected_csv(MANUAL_MAPPING_PATH, GU_KEYS + ['행정동', '법정동'], dtype=str)
+        manual = manual.fillna('')
+
+    # 3. 매핑 테이블 생성 및 리포트
+    profiling.rows('행정동', admin_dongs)
+    profiling.rows('법정동', legal_dongs)
+    mapping = build_mapping(admin_dongs, legal_dongs, manual)
+    profiling.rows('매핑', mapping)
+    report, unmatched = mapping_report(admin_dongs, legal_dongs, mapping)
+
+    print("--- [행정동 → 법정동 매칭 리포트] ---")
+    print(report)
+    if not unmatched.empty:
+        print(f"\n미매칭 행정동 예시 ({len(unmatched)}개 중 10개):")
+        print(unmatched.head(10))
+
+    save_table(mapping, 'dong_mapping')
+    save_table(report, 'dong_mapping_report')
+    output_path = save_table(unmatched, 'dong_mapping_unmatched')
+    print(f"\n매핑 테이블 저장 완료 ({len(mapping)}행), 미매칭 목록: {output_path}")
+    return mapping
+
+if __name__ == "__main__":
+    build_dong_mapping()
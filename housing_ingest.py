@@ -0,0 +1,210 @@
+# 아파트 실거래가(국토교통부) 파일 증분 적재
+# 매달 시도별 실거래 파일이 추가되므로 전체를 매번 다시 읽지 않고
+# 법정동별 누적 집계(거래건수, 평당가격 합, 평당가격 제곱합)를 저장해두고 새 파일만 더합니다.
+# - 처리한 파일은 manifest(크기·수정시각·해시)에 기록
+# - 이미 처리한 파일이 바뀌거나 사라지면 합계에서 뺄 수 없으므로 전체를 다시 집계
+# - 파일은 청크 단위로 읽어 파일 크기와 무관하게 메모리 사용량을 제한
+# - 평균 외에 중앙값·분위수를 구할 수 있도록 법정동별 평당가격 분위 스케치도 함께 누적
+# - 실거래 파일은 시도별로 나뉘어 있으므로 파일 단위로 프로세스 풀에서 병렬 집계 (DENTAL_WORKERS)
+import argparse
+import glob
+import hashlib
+import json
+import os
+import time
+
+import pandas as pd
+
+import profiling
+from address_parser import parse_region
+from csv_loader import sniff_encoding
+from data_store import load_table, save_table, table_exists
+from parallel import WORKERS_ENV, PartitionPool, read_frame, write_frame
+from quantile_sketch import SKETCH_PATH, SketchSet
+
+# 기존 파일명(seoul_housing.csv 등)과 월별 내려받기 폴더를 모두 대상으로 함
+HOUSING_PATTERNS = ['data_raw/*_housing.csv', 'data_raw/housing/*.csv']
+MANIFEST_PATH = os.path.join('data_processed', 'housing_manifest.json')
+STATS_TABLE = 'housing_legal_stats'
+STATS_KEYS = ['시도', '시군구', '법정동']
+STATS_COLS = ['거래건수', '평당가격_합', '평당가격_제곱합']
+HOUSING_COLUMNS = ['시군구', '전용면적(㎡)', '거래금액(만원)']
+# 국토교통부 데이터 보충: 보통 15줄 정도가 안내 문구임
+SKIPROWS = 15
+CHUNKSIZE = 200000
+
+
+def housing_files(patterns=HOUSING_PATTERNS):
+    files = set()
+    for pattern in patterns:
+        files.update(path.replace(os.sep, '/') for path in glob.glob(pattern))
+    return sorted(files)
+
+
+def load_manifest():
+    if not os.path.exists(MANIFEST_PATH):
+        return {}
+    with open(MANIFEST_PATH, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(manifest):
+    os.makedirs(os.path.dirname(MANIFEST_PATH), exist_ok=True)
+    tmp_path = MANIFEST_PATH + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, MANIFEST_PATH)
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def file_unchanged(path, entry):
+    # 크기·수정시각이 같으면 해시 계산 생략, 다르면 내용 해시로 최종 확인
+    if not os.path.exists(path):
+        return False
+    st = os.stat(path)
+    if st.st_size == entry['size'] and st.st_mtime_ns == entry['mtime_ns']:
+        return True
+    return st.st_size == entry['size'] and file_sha256(path) == entry['sha256']
+
+
+def aggregate_chunk(chunk):
+    # 거래 행 → 법정동별 거래건수·평당가격 합·제곱합, 평당가격 스케치
+    price = pd.to_numeric(chunk['거래금액(만원)'].str.replace(',', ''), errors='coerce')
+    area = pd.to_numeric(chunk['전용면적(㎡)'], errors='coerce')
+    # 평당가격 계산 (전용면적당 가격 * 3.3)
+    per_pyeong = price / (area / 3.3)
+    valid = per_pyeong.notna() & (area > 0)
+
+    parsed = parse_region(chunk.loc[valid, '시군구'])
+    df = pd.DataFrame({
+        '시도': parsed['시도'],
+        '시군구': parsed['시군구'],
+        '법정동': parsed['읍면동'],
+        '거래건수': 1,
+        '평당가격_합': per_pyeong[valid],
+        '평당가격_제곱합': per_pyeong[valid] ** 2,
+    })
+    sketch = SketchSet(STATS_KEYS).from_values(df[STATS_KEYS], per_pyeong[valid])
+    return df.groupby(STATS_KEYS)[STATS_COLS].sum(), sketch
+
+
+def aggregate_file(path, chunksize=CHUNKSIZE):
+    encoding = sniff_encoding(path) or 'cp949'
+    partials = []
+    sketch = SketchSet(STATS_KEYS)
+    rows = 0
+    reader = pd.read_csv(path, encoding=encoding, skiprows=SKIPROWS, usecols=HOUSING_COLUMNS,
+                         dtype=str, chunksize=chunksize)
+    for chunk in reader:
+        rows += len(chunk)
+        chunk_stats, chunk_sketch = aggregate_chunk(chunk)
+        partials.append(chunk_stats)
+        sketch = sketch.merge(chunk_sketch)
+    if not partials:
+        return empty_stats(), sketch, rows
+    return merge_stats(empty_stats(), pd.concat(partials)), sketch, rows
+
+
+def aggregate_partition(path, chunksize=CHUNKSIZE, out_dir=None):
+    # 작업 프로세스용: out_dir 이 있으면 집계 결과를 파일로 저장하고 경로만 반환 (큰 결과를 pickle로 넘기지 않음)
+    stats, sketch, rows = aggregate_file(path, chunksize)
+    if out_dir is None:
+        return stats, sketch, rows
+    base = os.path.join(out_dir, hashlib.sha256(path.encode()).hexdigest()[:16])
+    stats_path = write_frame(stats.reset_index(), base + '_stats')
+    return stats_path, sketch.save(base + '_sketch.npz'), rows
+
+
+def load_partition(result):
+    stats, sketch, rows = result
+    if isinstance(stats, str):
+        stats = read_frame(stats).astype({key: str for key in STATS_KEYS}).set_index(STATS_KEYS)
+        sketch = SketchSet.load(sketch)
+    return stats, sketch, rows
+
+
+def empty_stats():
+    index = pd.MultiIndex.from_arrays([[], [], []], names=STATS_KEYS)
+    return pd.DataFrame({col: pd.Series(dtype='float64') for col in STATS_COLS}, index=index)
+
+
+def merge_stats(stats, delta):
+    # 키가 같은 행만 더해지고, 새 법정동은 추가됨 (다른 행은 그대로)
+    delta = delta.groupby(level=STATS_KEYS).sum()
+    merged = stats.add(delta, fill_value=0)
+    merged['거래건수'] = merged['거래건수'].astype('int64')
+    return merged
+
+
+def ingest_housing(patterns=HOUSING_PATTERNS, chunksize=CHUNKSIZE, rebuild=False):
+    files = housing_files(patterns)
+    if not files:
+        print("실거래 데이터 파일이 없습니다. (data_raw/*_housing.csv 또는 data_raw/housing/*.csv)")
+        return None
+
+    # 1. 이전 적재 기록 확인 (처리한 파일이 바뀌었으면 전체 재집계)
+    manifest = {} if rebuild else load_manifest()
+    changed = [path for path, entry in manifest.items() if not file_unchanged(path, entry)]
+    if changed:
+        print(f"이미 적재한 파일이 변경/삭제되어 전체를 다시 집계합니다: {changed}")
+        manifest = {}
+    if manifest and table_exists(STATS_TABLE) and os.path.exists(SKETCH_PATH):
+        stats = load_table(STATS_TABLE).fillna({key: '' for key in STATS_KEYS})
+        stats = stats.astype({key: str for key in STATS_KEYS}).set_index(STATS_KEYS)
+        sketch = SketchSet.load(SKETCH_PATH)
+    else:
+        manifest = {}
+        stats = empty_stats()
+        sketch = SketchSet(STATS_KEYS)
+
+    # 2. 새 파일만 청크 단위로 집계해 누적 합계에 더함
+    new_files = [path for path in files if path not in manifest]
+    print(f"실거래 파일 {len(files)}개 중 새 파일 {len(new_files)}개 적재")
+    # 병렬 실행이어도 결과는 파일 순서대로 더하므로 합계·스케치가 순차 실행과 같음
+    start = time.time()
+    total_rows = 0
+    with PartitionPool() as pool, profiling.step('파일 집계'):
+        results = pool.imap(aggregate_partition, new_files, chunksize, pool.tmp_dir)
+        for path, result in zip(new_files, results):
+            delta, delta_sketch, rows = load_partition(result)
+            stats = merge_stats(stats, delta)
+            sketch = sketch.merge(delta_sketch)
+            total_rows += rows
+            st = os.stat(path)
+            manifest[path] = {
+                'size': st.st_size,
+                'mtime_ns': st.st_mtime_ns,
+                'sha256': file_sha256(path),
+                'rows': rows,
+                'legal_dongs': len(delta),
+                'ingested_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            }
+            print(f"  {path}: {rows}건, 법정동 {len(delta)}개 갱신 ({time.time() - start:.1f}초)")
+        profiling.rows('거래', total_rows)
+
+    # 3. 저장 (집계표·스케치를 먼저 저장한 뒤 manifest 기록)
+    df_stats = stats.reset_index().sort_values(STATS_KEYS).reset_index(drop=True)
+    profiling.rows('새 파일', len(new_files))
+    profiling.rows('출력', df_stats)
+    output_path = save_table(df_stats, STATS_TABLE)
+    sketch.save(SKETCH_PATH)
+    save_manifest(manifest)
+    print(f"법정동 {len(df_stats)}개, 누적 거래 {int(df_stats['거래건수'].sum())}건 → {output_path}")
+    return df_stats
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="아파트 실거래가 파일 증분 적재")
+    parser.add_argument('--rebuild', action='store_true', help="적재 기록을 무시하고 모든 파일을 다시 집계")
+    parser.add_argument('--chunksize', type=int, default=CHUNKSIZE, help="한 번에 읽을 행 수")
+    parser.add_argument('--workers', type=int, help="병렬 집계 프로세스 수 (0: CPU 코어 수)")
+    args = parser.parse_args()
+    if args.workers is not None:
+        os.environ[WORKERS_ENV] = str(args.workers)
+    ingest_housing(chunksize=args.chunksize, rebuild=args.rebuild)
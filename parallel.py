@@ -0,0 +1,123 @@
+# 시도별 분할 병렬 처리
+# 주소 파싱·실거래 집계처럼 시도(또는 시도별 원본 파일)마다 독립적인 작업을 프로세스 풀에서 나눠 실행합니다.
+# - 작업 프로세스 수: 환경변수 DENTAL_WORKERS (pipeline.py --workers), 기본 1 = 기존처럼 현재 프로세스에서 실행
+# - 큰 DataFrame을 프로세스 간에 pickle로 주고받지 않도록 분할 데이터는 임시 폴더의 열 지향 파일
+#   (pyarrow가 있으면 Parquet, 없으면 pickle 파일)로 쓰고 경로만 전달
+# - 결과는 완료 순서와 관계없이 분할 키 순서로 합치므로 병렬 여부·작업자 수와 무관하게 항상 같은 결과
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from data_store import parquet_available
+
+WORKERS_ENV = 'DENTAL_WORKERS'
+
+
+def worker_count(workers=None):
+    # 지정값 → 환경변수 → 1 순서 (0 이하는 CPU 코어 수)
+    if workers is None:
+        workers = int(os.environ.get(WORKERS_ENV, '1') or 1)
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return workers
+
+
+def partition_keys(values, sizes=None):
+    # 분할 키 정렬: 큰 분할부터 먼저 실행해 마지막에 작업자 하나만 남는 시간을 줄임 (동률은 키 순서)
+    keys = sorted(values)
+    if sizes is None:
+        return keys
+    return sorted(keys, key=lambda k: -sizes[k])
+
+
+def write_frame(df, path):
+    # 분할 데이터 임시 저장 (index 포함) → 저장된 파일 경로
+    if parquet_available():
+        df.to_parquet(path + '.parquet')
+        return path + '.parquet'
+    df.to_pickle(path + '.pkl')
+    return path + '.pkl'
+
+
+def read_frame(path):
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_pickle(path)
+
+
+def _run_frame_task(func, in_path, out_path, args):
+    # 작업 프로세스: 분할 파일 읽기 → 처리 → 결과 파일 경로 반환
+    result = func(read_frame(in_path), *args)
+    return write_frame(result, out_path)
+
+
+def _run_task(func, item, args):
+    return func(item, *args)
+
+
+class PartitionPool:
+    # with PartitionPool(workers) as pool: pool.map_frames(...) / pool.imap(...)
+    # workers=1 이면 프로세스를 만들지 않고 현재 프로세스에서 순서대로 실행
+    def __init__(self, workers=None):
+        self.workers = worker_count(workers)
+        self.tmp_dir = None
+        self._executor = None
+
+    def __enter__(self):
+        if self.workers > 1:
+            self.tmp_dir = tempfile.mkdtemp(prefix='dental_partitions_')
+            # fork 대신 spawn: 부모 프로세스의 큰 DataFrame 메모리를 물려받지 않음
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=exc_type is not None)
+            self._executor = None
+        if self.tmp_dir is not None:
+            shutil.rmtree(self.tmp_dir, ignore_errors=True)
+            self.tmp_dir = None
+
+    def map_frames(self, func, partitions, *args):
+        # {키: DataFrame} 분할마다 func(df, *args) 실행 → 키 순서대로 [(키, 결과 DataFrame)]
+        # func 는 작업 프로세스에서 불러올 수 있도록 모듈 최상위 함수여야 함
+        keys = partition_keys(partitions, {k: len(v) for k, v in partitions.items()})
+        if self._executor is None:
+            return [(key, func(partitions[key], *args)) for key in sorted(keys)]
+
+        futures = {}
+        for i, key in enumerate(keys):
+            base = os.path.join(self.tmp_dir, f'part{i:05d}')
+            in_path = write_frame(partitions[key], base + '_in')
+            futures[key] = self._executor.submit(_run_frame_task, func, in_path, base + '_out', args)
+        return [(key, read_frame(futures[key].result())) for key in sorted(keys)]
+
+    def imap(self, func, items, *args):
+        # 파일 경로처럼 작은 값 목록에 대해 func(item, *args) 실행 → items 순서대로 결과를 하나씩 반환
+        # (앞 결과를 합치는 동안 뒤 작업이 계속 진행되고, 결과를 한꺼번에 메모리에 쌓지 않음)
+        # 큰 결과는 func 가 tmp_dir 아래 파일로 저장하고 경로를 반환하도록 작성
+        if self._executor is None:
+            for item in items:
+                yield func(item, *args)
+            return
+        futures = [self._executor.submit(_run_task, func, item, args) for item in items]
+        for future in futures:
+            yield future.result()
+
+
+def split_by(df, col):
+    # col 값별 분할 {값: DataFrame} (원래 index 유지 → 합친 뒤 원래 행 순서로 복원 가능)
+    codes, uniques = pd.factorize(df[col], sort=True)
+    return {value: df[codes == i] for i, value in enumerate(uniques)}
+
+
+def combine(results):
+    # map_frames 결과를 index 순서로 합침 (split_by 전에 위치 번호를 index로 두면 원래 행 순서가 됨)
+    frames = [frame for _, frame in results]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames).sort_index(kind='stable')
@@ -0,0 +1,37 @@
+# 시도별 백분위 순위 / 분위 기준값
+# 대시보드의 강점 배지(상위 20%)나 백분위 필터를 화면이 바뀔 때마다 quantile로 다시 계산하지 않도록
+# 파이프라인에서 지표별 백분위 순위 컬럼과 작은 분위 기준값 표를 미리 만들어 둡니다.
+from scoring_engine import FEATURE_COLS
+
+# 백분위를 계산할 지표 (대시보드 스코어링 지표와 동일)
+RANK_COLS = FEATURE_COLS
+QUANTILES = [0.5, 0.8, 0.9]
+RANK_SUFFIX = '_백분위'
+THRESHOLD_COLS = ['시도', '지표', '분위', '기준값']
+
+
+def rank_col(col):
+    return col + RANK_SUFFIX
+
+
+def add_percentile_ranks(df, cols=RANK_COLS, group_col='시도'):
+    # 그룹 내 백분위 순위 (0~1, 자기 값 이하인 행의 비율 → 1이면 그룹 최댓값)
+    df = df.copy()
+    grouped = df.groupby(group_col, observed=True)
+    for col in cols:
+        df[rank_col(col)] = grouped[col].rank(pct=True, method='max')
+    return df
+
+
+def quantile_thresholds(df, cols=RANK_COLS, quantiles=QUANTILES, group_col='시도'):
+    # 그룹별·지표별 분위 기준값 (pandas quantile 기본값인 선형 보간과 동일) → 긴 형태 표
+    q = df.groupby(group_col, observed=True)[cols].quantile(quantiles)
+    q.index.names = ['시도', '분위']
+    table = q.reset_index().melt(id_vars=['시도', '분위'], var_name='지표', value_name='기준값')
+    return table[THRESHOLD_COLS].sort_values(['시도', '지표', '분위']).reset_index(drop=True)
+
+
+def threshold_lookup(table):
+    # {(시도, 지표, 분위): 기준값} 사전 (화면 루프에서는 사전 조회만 수행)
+    keys = zip(table['시도'].astype(str), table['지표'].astype(str), table['분위'].astype(float))
+    return dict(zip(keys, table['기준값'].astype(float)))
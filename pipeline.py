@@ -0,0 +1,433 @@
+# 실행 방법: 터미널에서 `python pipeline.py` 입력
+# 전처리 → 분석 → 경제력 반영 단계를 의존성 그래프로 묶어 순서대로 실행합니다.
+# 각 단계의 입력 파일 내용, 파라미터, 스크립트 코드를 지문(해시)으로 남겨두고
+# 지문이 바뀌지 않았고 출력 파일도 그대로라면 해당 단계는 건너뜁니다.
+# 필수 입력(requires)이 없는 단계(실거래 파일이 없는 housing 등)는 실패가 아니라 건너뛰고,
+# 그 출력을 필요로 하는 하위 단계도 차례로 건너뜁니다.
+import argparse
+import ast
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+import time
+
+import profiling
+from data_store import FORMAT_ENV, store_format, table_path
+from analyze_radius_competition import CENTROID_PATH
+from clinic_registry import REGISTRY_PATH, SUPPLY_TABLE
+from competition_history import HISTORY_PATH
+from housing_ingest import HOUSING_PATTERNS, MANIFEST_PATH, housing_files
+from parallel import WORKERS_ENV
+from preprocess_dental import FULL_FILES, dental_change_files
+from quantile_sketch import SKETCH_PATH
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+STATE_PATH = os.path.join('data_processed', '.pipeline_state.json')
+
+
+# 단계 정의
+# - inputs: 단계가 읽는 파일 (다른 단계의 outputs와 겹치면 자동으로 의존 관계가 됨)
+# - params: 단계 함수에 키워드 인자로 전달되며 지문에도 포함됨
+# - requires (선택): 하나라도 없으면 단계를 건너뛰는 입력 (없으면 선택 입력만 있는 단계)
+# 중간 결과 경로는 저장 형식(CSV/Parquet)에 따라 달라지므로 실행 시점에 만듦
+def build_stages():
+    return [
+        {
+            'name': 'population',
+            'script': 'preprocess_population.py',
+            'func': 'preprocess_population_data',
+            'inputs': ['data_raw/연령별인구현황.csv'],
+            'outputs': [
+                table_path('population_preprocessed'),
+                table_path('region_dim'),
+                'data_processed/population_cube.npz',
+            ],
+            # 전국 다개월 파일도 메모리가 일정하도록 청크 단위로 처리
+            'params': {'chunksize': 100000},
+        },
+        {
+            'name': 'dental',
+            'script': 'preprocess_dental.py',
+            'func': 'preprocess_dental_data',
+            # 주소 이름 → 행정구역코드 변환에 인구 단계의 차원 테이블 사용
+            # 변동분 파일 목록은 실행 시점에 검색 (새 변동분이 추가되면 지문이 바뀜)
+            'inputs': FULL_FILES + dental_change_files() + [table_path('region_dim')],
+            'outputs': [table_path('dental_preprocessed'), table_path(SUPPLY_TABLE), REGISTRY_PATH,
+                        HISTORY_PATH, table_path('dental_duplicate_clusters')],
+            'params': {},
+        },
+        {
+            'name': 'gu_competition',
+            'script': 'analyze_gu_competition.py',
+            'func': 'analyze_gu_competition',
+            'inputs': [table_path(SUPPLY_TABLE), table_path('population_preprocessed'), HISTORY_PATH],
+            'outputs': [table_path('gu_competition_score')],
+            'params': {},
+        },
+        {
+            'name': 'radius_competition',
+            'script': 'analyze_radius_competition.py',
+            'func': 'analyze_radius_competition',
+            'inputs': [
+                table_path('dental_preprocessed'),
+                table_path('population_preprocessed'),
+                table_path('region_dim'),
+                CENTROID_PATH,
+            ],
+            'requires': [table_path('dental_preprocessed'), table_path('population_preprocessed'), CENTROID_PATH],
+            'outputs': [table_path('dong_radius_competition')],
+            'params': {'radii': [500, 1000, 2000]},
+        },
+        {
+            'name': 'accessibility',
+            'script': 'accessibility.py',
+            'func': 'analyze_accessibility',
+            'inputs': [
+                table_path('dental_preprocessed'),
+                table_path('population_preprocessed'),
+                table_path('region_dim'),
+                CENTROID_PATH,
+            ],
+            'requires': [table_path('dental_preprocessed'), table_path('population_preprocessed'), CENTROID_PATH],
+            'outputs': [table_path('dong_accessibility')],
+            'params': {'cutoff': 3000.0, 'beta': 2.0},
+        },
+        {
+            'name': 'final_analysis',
+            'script': 'analyze_final.py',
+            'func': 'final_analysis',
+            'inputs': [table_path(SUPPLY_TABLE), table_path('population_preprocessed')],
+            'outputs': [table_path('final_analysis_result')],
+            'params': {},
+        },
+        {
+            'name': 'final_v2',
+            'script': 'analyze_final_v2.py',
+            'func': 'analyze_final_v2',
+            'inputs': [table_path('population_preprocessed'), table_path('gu_competition_score')],
+            'outputs': [table_path('final_ranking_v2')],
+            'params': {},
+        },
+        {
+            # 실거래 파일 목록은 실행 시점에 검색 (새 달 파일이 추가되면 지문이 바뀜)
+            'name': 'housing',
+            'script': 'housing_ingest.py',
+            'func': 'ingest_housing',
+            'inputs': housing_files(),
+            # 파일이 하나도 없으면 검색 패턴이 그대로 남아 '없는 입력'으로 표시됨
+            'requires': housing_files() or HOUSING_PATTERNS,
+            'outputs': [table_path('housing_legal_stats'), SKETCH_PATH, MANIFEST_PATH],
+            'params': {'chunksize': 200000},
+        },
+        {
+            'name': 'dong_mapping',
+            'script': 'dong_mapping.py',
+            'func': 'build_dong_mapping',
+            'inputs': [
+                table_path('population_preprocessed'),
+                table_path('housing_legal_stats'),
+                'data_raw/dong_mapping_manual.csv',
+            ],
+            'requires': [table_path('population_preprocessed'), table_path('housing_legal_stats')],
+            'outputs': [
+                table_path('dong_mapping'),
+                table_path('dong_mapping_report'),
+                table_path('dong_mapping_unmatched'),
+            ],
+            'params': {},
+        },
+        {
+            'name': 'economics',
+            'script': 'src/2_add_economics.py',
+            'func': 'add_economic_data',
+            'inputs': [
+                table_path('final_ranking_v2'),
+                table_path('dong_mapping'),
+                table_path('housing_legal_stats'),
+                table_path('dong_accessibility'),
+                SKETCH_PATH,
+            ],
+            'requires': [table_path('final_ranking_v2'), table_path('housing_legal_stats')],
+            'outputs': [table_path('final_ranking_v3_economic'), table_path('percentile_thresholds')],
+            'params': {},
+        },
+        {
+            'name': 'weight_sweep',
+            'script': 'weight_sweep.py',
+            'func': 'run_weight_sweep',
+            'inputs': [table_path('final_ranking_v3_economic')],
+            'requires': [table_path('final_ranking_v3_economic')],
+            'outputs': ['data_processed/weight_sweep.npz', table_path('weight_sweep_stability')],
+            'params': {},
+        },
+    ]
+
+
+def load_state():
+    if not os.path.exists(STATE_PATH):
+        return {'files': {}, 'stages': {}}
+    with open(STATE_PATH, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_state(state):
+    os.makedirs(os.path.dirname(STATE_PATH), exist_ok=True)
+    tmp_path = STATE_PATH + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, STATE_PATH)
+
+
+def file_digest(path, state):
+    # 파일 내용 해시 (크기·수정시각이 그대로면 이전 해시를 재사용해 대용량 파일 재해싱 방지)
+    if not os.path.exists(path):
+        return 'missing'
+    st = os.stat(path)
+    cached = state['files'].get(path)
+    if cached and cached['size'] == st.st_size and cached['mtime_ns'] == st.st_mtime_ns:
+        return cached['sha256']
+
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    digest = h.hexdigest()
+    state['files'][path] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': digest}
+    return digest
+
+
+def local_modules(script):
+    # 스크립트가 import 하는 저장소 내 모듈까지 포함 (공통 모듈이 바뀌어도 다시 실행되도록)
+    found = []
+    stack = [script]
+    while stack:
+        path = stack.pop()
+        if path in found:
+            continue
+        found.append(path)
+        with open(path, encoding='utf-8') as f:
+            tree = ast.parse(f.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                candidate = name.split('.')[0] + '.py'
+                if os.path.exists(candidate):
+                    stack.append(candidate)
+    return sorted(found)
+
+
+def stage_fingerprint(stage, state):
+    h = hashlib.sha256()
+    for path in local_modules(stage['script']):
+        h.update(path.encode())
+        h.update(file_digest(path, state).encode())
+    h.update(json.dumps(stage['params'], sort_keys=True, ensure_ascii=False).encode())
+    for path in stage['inputs']:
+        h.update(path.encode())
+        h.update(file_digest(path, state).encode())
+    return h.hexdigest()
+
+
+def build_graph(stages):
+    # 입력 파일이 다른 단계의 출력이면 그 단계에 의존
+    producers = {}
+    for stage in stages:
+        for path in stage['outputs']:
+            producers[path] = stage['name']
+
+    deps = {}
+    for stage in stages:
+        deps[stage['name']] = sorted({producers[p] for p in stage['inputs'] if p in producers} - {stage['name']})
+    return deps
+
+
+def topological_order(stages, deps):
+    # 정의 순서를 유지하는 위상 정렬 (순환 의존은 오류)
+    order = []
+    done = set()
+    remaining = [s['name'] for s in stages]
+    while remaining:
+        ready = [name for name in remaining if all(d in done for d in deps[name])]
+        if not ready:
+            raise ValueError(f"단계 사이에 순환 의존이 있습니다: {remaining}")
+        for name in ready:
+            order.append(name)
+            done.add(name)
+        remaining = [name for name in remaining if name not in done]
+    return order
+
+
+def select_stages(targets, deps):
+    # 지정한 단계와 그 상위(선행) 단계만 선택
+    selected = set()
+    stack = list(targets)
+    while stack:
+        name = stack.pop()
+        if name in selected:
+            continue
+        selected.add(name)
+        stack.extend(deps[name])
+    return selected
+
+
+def missing_requirements(stage, producers, skipped):
+    # 파일이 없거나, 건너뛴 단계의 출력이라 지난 결과(저장소에 포함된 파일 등)만 남은 필수 입력
+    return [p for p in stage.get('requires', []) if not os.path.exists(p) or producers.get(p) in skipped]
+
+
+def drop_stale_outputs(stage, state):
+    # 건너뛴 단계가 이전 실행에서 만든 출력은 지움 → 하위 단계가 지난 결과를 현재 결과처럼 쓰지 않음
+    # (파이프라인이 만든 기록이 없는 파일, 예: 저장소에 포함된 결과 파일은 그대로 둠)
+    record = state['stages'].get(stage['name'], {})
+    removed = [p for p in stage['outputs'] if p in record.get('outputs', {}) and os.path.exists(p)]
+    for path in removed:
+        os.remove(path)
+    state['stages'].pop(stage['name'], None)
+    return removed
+
+
+def outputs_valid(stage, record, state):
+    for path in stage['outputs']:
+        if not os.path.exists(path):
+            return False
+        if record.get('outputs', {}).get(path) != file_digest(path, state):
+            return False
+    return True
+
+
+def load_stage_function(stage):
+    # src/2_add_economics.py 처럼 숫자로 시작하는 파일도 불러올 수 있도록 경로로 로드
+    # import 가능한 이름이면 그 이름으로 등록해 병렬 작업 프로세스가 같은 모듈의 함수를 찾을 수 있게 함
+    stem = os.path.splitext(os.path.basename(stage['script']))[0]
+    module_name = stem if stem.isidentifier() else 'stage_' + stage['name']
+    spec = importlib.util.spec_from_file_location(module_name, stage['script'])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return getattr(module, stage['func'])
+
+
+def run_pipeline(targets=None, force=False, dry_run=False, profile=False):
+    os.chdir(ROOT_DIR)
+    if profile and not dry_run:
+        profiling.enable({'targets': list(targets or []), 'force': force, 'format': store_format()})
+    stage_list = build_stages()
+    stages = {s['name']: s for s in stage_list}
+    deps = build_graph(stage_list)
+    order = topological_order(stage_list, deps)
+
+    if targets:
+        unknown = [t for t in targets if t not in stages]
+        if unknown:
+            print(f"알 수 없는 단계: {unknown} (가능한 단계: {order})")
+            return False
+        selected = select_stages(targets, deps)
+        order = [name for name in order if name in selected]
+
+    producers = {path: s['name'] for s in stage_list for path in s['outputs']}
+    skipped = set()
+    state = load_state()
+    print(f"--- 파이프라인 실행 순서: {' → '.join(order)} ---")
+
+    # dry-run에서 상위 단계가 다시 실행될 예정이면 하위 단계도 다시 실행될 수 있음
+    pending = set()
+    for name in order:
+        stage = stages[name]
+        fingerprint = stage_fingerprint(stage, state)
+        record = state['stages'].get(name, {})
+
+        upstream_pending = any(d in pending for d in deps[name])
+        # dry-run 에서 상위 단계가 실행될 예정이면 그 출력이 생길 수 있으므로 판단하지 않음
+        missing = [] if dry_run and upstream_pending else missing_requirements(stage, producers, skipped)
+        if missing:
+            skipped.add(name)
+            print(f"[건너뜀] {name}: 필수 입력이 없습니다: {missing}")
+            if not dry_run:
+                removed = drop_stale_outputs(stage, state)
+                if removed:
+                    print(f"  이전 실행 출력 삭제: {removed}")
+            profiling.skipped(name, 'missing_inputs')
+            continue
+
+        if (not force and not upstream_pending and record.get('fingerprint') == fingerprint
+                and outputs_valid(stage, record, state)):
+            print(f"[건너뜀] {name}: 입력과 출력이 이전 실행과 동일합니다.")
+            profiling.skipped(name, 'unchanged')
+            continue
+
+        if dry_run:
+            pending.add(name)
+            print(f"[실행 예정] {name}")
+            continue
+
+        print(f"\n[실행] {name} ({stage['script']})")
+        start = time.time()
+        before = {p: os.stat(p).st_mtime_ns for p in stage['outputs'] if os.path.exists(p)}
+        try:
+            func = load_stage_function(stage)
+            with profiling.stage(name):
+                func(**stage['params'])
+        except Exception as e:
+            print(f"[실패] {name}: {e}")
+            save_state(state)
+            finish_profile()
+            return False
+
+        # 단계 함수는 입력이 없으면 메시지만 출력하고 반환하므로 출력 갱신 여부로 성공을 판단
+        missing = [p for p in stage['outputs']
+                   if not os.path.exists(p) or os.stat(p).st_mtime_ns == before.get(p)]
+        if missing:
+            print(f"[실패] {name}: 출력 파일이 생성(갱신)되지 않았습니다: {missing}")
+            save_state(state)
+            finish_profile()
+            return False
+
+        state['stages'][name] = {
+            'fingerprint': fingerprint,
+            'outputs': {p: file_digest(p, state) for p in stage['outputs']},
+            'finished_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        save_state(state)
+        print(f"[완료] {name} ({time.time() - start:.1f}초)")
+
+    if not dry_run:
+        save_state(state)
+    finish_profile()
+    return True
+
+
+def finish_profile():
+    # 프로파일링 모드였다면 실행 기록 저장 (실패한 실행도 실패 지점까지 기록)
+    if not profiling.enabled():
+        return
+    path = profiling.save_report()
+    profiling.disable()
+    print(f"\n실행 기록 저장: {path} (이전 실행과 비교: python profiling.py diff)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="치과 입지 분석 파이프라인 실행")
+    parser.add_argument('stages', nargs='*', help="실행할 단계 이름 (지정하지 않으면 전체)")
+    parser.add_argument('--force', action='store_true', help="지문과 관계없이 모든 단계를 다시 실행")
+    parser.add_argument('--dry-run', action='store_true', help="실행하지 않고 다시 실행될 단계만 출력")
+    parser.add_argument('--format', choices=['csv', 'parquet'], help="중간 결과 저장 형식 (기본: 환경변수 또는 csv)")
+    parser.add_argument('--workers', type=int,
+                        help="시도별 병렬 처리 프로세스 수 (0: CPU 코어 수, 기본: 환경변수 또는 1). 결과는 같고 지문에 영향 없음")
+    parser.add_argument('--profile', action='store_true',
+                        help="단계별 시간·메모리·행 수·조인 매칭률을 data_processed/run_report.json 에 기록")
+    args = parser.parse_args()
+
+    if args.format:
+        os.environ[FORMAT_ENV] = args.format
+    if args.workers is not None:
+        os.environ[WORKERS_ENV] = str(args.workers)
+
+    ok = run_pipeline(targets=args.stages, force=args.force, dry_run=args.dry_run, profile=args.profile)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,128 @@
+# 지역 × 월 × 연령 인구 누적합 큐브
+# 연령 축으로 누적합을 저장해두면 임의의 연령대(예: 60세 이상, 75세 이상) 인구를
+# 원본 CSV를 다시 읽지 않고 뺄셈 한 번(O(1))으로 구할 수 있습니다.
+# cumsum[r, m, a] = 지역 r, 월 m 에서 (a-1)세 이하 인구 합계 (cumsum[..., 0] = 0)
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from region_dim import CODE_COL
+
+CUBE_PATH = os.path.join('data_processed', 'population_cube.npz')
+MAX_AGE = 100  # '100세 이상' 컬럼을 100세로 취급
+AGE_COL_PATTERN = re.compile(r'^(\d{4}년\d{2}월)_계_(\d+)세( 이상)?$')
+REGION_KEYS = ['시도', '시군구', '읍면동']
+
+
+def parse_age_columns(columns):
+    # 헤더에서 월별·연령별(계) 컬럼을 찾아 [(컬럼명, 월, 나이)] 와 정렬된 월 목록 반환
+    age_cols = []
+    for col in columns:
+        match = AGE_COL_PATTERN.match(col)
+        if match:
+            age = min(int(match.group(2)), MAX_AGE)
+            age_cols.append((col, match.group(1), age))
+    months = sorted({month for _, month, _ in age_cols})
+    return age_cols, months
+
+
+class PopulationCube:
+    def __init__(self, regions, months, cumsum):
+        self.regions = regions.reset_index(drop=True)
+        self.months = list(months)
+        self.cumsum = cumsum
+        self._key_index = None
+
+    @classmethod
+    def load(cls, path=CUBE_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            regions = pd.DataFrame({
+                CODE_COL: data['codes'],
+                '시도': data['sido'],
+                '시군구': data['sigungu'],
+                '읍면동': data['dong'],
+            })
+            return cls(regions, data['months'].tolist(), data['cumsum'])
+
+    def save(self, path=CUBE_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.savez_compressed(
+            path,
+            codes=self.regions[CODE_COL].to_numpy(dtype=np.int64),
+            sido=self.regions['시도'].to_numpy(dtype=str),
+            sigungu=self.regions['시군구'].to_numpy(dtype=str),
+            dong=self.regions['읍면동'].to_numpy(dtype=str),
+            months=np.array(self.months, dtype=str),
+            cumsum=self.cumsum,
+        )
+        return path
+
+    def month_index(self, month=None):
+        # 월을 지정하지 않으면 가장 최근 월
+        if month is None:
+            return len(self.months) - 1
+        return self.months.index(month)
+
+    def band(self, min_age=0, max_age=None, month=None):
+        # min_age 이상 max_age 이하 인구 (max_age=None 이면 100세 이상까지 포함)
+        hi = MAX_AGE if max_age is None else min(max_age, MAX_AGE)
+        lo = max(min_age, 0)
+        m = self.month_index(month)
+        return self.cumsum[:, m, hi + 1].astype(np.int64) - self.cumsum[:, m, lo]
+
+    def band_trend(self, min_age=0, max_age=None):
+        # (지역, 월) 배열: 모든 월의 연령대 인구를 한 번에
+        hi = MAX_AGE if max_age is None else min(max_age, MAX_AGE)
+        lo = max(min_age, 0)
+        return self.cumsum[:, :, hi + 1].astype(np.int64) - self.cumsum[:, :, lo]
+
+    def region_index(self, keys):
+        # keys(시도/시군구/읍면동 DataFrame)의 각 행에 해당하는 큐브 지역 위치 (없으면 -1)
+        # keys 에 행정구역코드가 있으면 이름 대신 정수 코드로 찾음
+        if CODE_COL in keys.columns:
+            codes = self.regions[CODE_COL].to_numpy(dtype=np.int64)
+            first = ~pd.Index(codes).duplicated() & (codes != 0)
+            pos = pd.Index(codes[first]).get_indexer(keys[CODE_COL].to_numpy(dtype=np.int64))
+            return np.where(pos >= 0, np.flatnonzero(first)[np.maximum(pos, 0)], -1)
+        if self._key_index is None:
+            key_tuples = zip(*(self.regions[col].astype(str) for col in REGION_KEYS))
+            self._key_index = {}
+            for i, key in enumerate(key_tuples):
+                self._key_index.setdefault(key, i)
+        query = zip(*(keys[col].fillna('').astype(str) for col in REGION_KEYS))
+        return np.array([self._key_index.get(key, -1) for key in query], dtype=np.int64)
+
+
+class CubeBuilder:
+    # 청크 단위로 큐브 블록을 만들어 모아두었다가 마지막에 하나로 합침
+    def __init__(self, age_cols, months):
+        self.age_cols = age_cols
+        self.months = months
+        self._month_pos = {month: i for i, month in enumerate(months)}
+        self._regions = []
+        self._blocks = []
+
+    @property
+    def columns(self):
+        return [col for col, _, _ in self.age_cols]
+
+    def add(self, df, regions):
+        # df: 원본 청크 (연령별 컬럼 포함), regions: 같은 행 순서의 행정구역코드/시도/시군구/읍면동
+        block = np.zeros((len(df), len(self.months), MAX_AGE + 2), dtype=np.int64)
+        for col, month, age in self.age_cols:
+            # '100세 이상'이 별도로 있는 경우 100세 칸에 더해짐
+            block[:, self._month_pos[month], age + 1] += df[col].fillna(0).to_numpy(dtype=np.int64)
+        np.cumsum(block, axis=2, out=block)
+        self._blocks.append(block.astype(np.int32))
+        self._regions.append(regions.reset_index(drop=True))
+
+    def build(self):
+        if not self._blocks:
+            cumsum = np.zeros((0, len(self.months), MAX_AGE + 2), dtype=np.int32)
+            regions = pd.DataFrame(columns=[CODE_COL] + REGION_KEYS)
+        else:
+            cumsum = np.concatenate(self._blocks, axis=0)
+            regions = pd.concat(self._regions, ignore_index=True)
+        return PopulationCube(regions, self.months, cumsum)
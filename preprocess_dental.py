@@ -1,77 +1,76 @@
+import argparse
+import glob
 import pandas as pd
+import numpy as np
 import os
 
-def preprocess_dental_data():
-    # 1. 파일 경로 설정
-    raw_dir = 'data_raw'
-    processed_dir = 'data_processed'
-    
-    file1 = os.path.join(raw_dir, '치과병원.csv')
-    file2 = os.path.join(raw_dir, '치과의원.csv')
-    
-    # 2. 파일 로드 함수 (인코딩 시도)
-    def load_csv(path):
-        if not os.path.exists(path):
-            print(f"파일을 찾을 수 없습니다: {path}")
-            return None
-        
-        # 사용자가 언급한 cp949, euc-kr을 먼저 시도
-        for enc in ['cp949', 'euc-kr', 'utf-8-sig', 'utf-8']:
-            try:
-                df = pd.read_csv(path, encoding=enc)
-                print(f"성공적으로 로드함 ({enc}): {path}")
-                return df
-            except Exception:
-                continue
-        print(f"파일 로드 실패: {path}")
-        return None
+import clinic_registry
+import profiling
+from clinic_dedup import DEDUP_COLUMNS, POSITION_COLUMNS, affected_rows, cluster_report, find_duplicates
+from competition_history import HISTORY_COLUMNS, CompetitionHistory
+from coord_transform import epsg5174_to_wgs84
+from address_parser import parse_region_by_sido
+from csv_loader import read_projected_csv
+from data_store import save_table, table_path
+from housing_ingest import file_unchanged
+from region_dim import CODE_COL, GU_CODE_COL, REGION_DIM_TABLE, REGION_KEYS, UNKNOWN_CODE, attach_codes, load_region_dim
 
-    print("데이터 로딩 중...")
-    df_hosp = load_csv(file1)
-    df_clinic = load_csv(file2)
+# 원본에서 실제로 사용하는 컬럼만 로드 (병원명, 영업상태, 주소, 좌표, 개방자치단체코드, 관리번호·일자, 종별·규모)
+X_COL = '좌표정보X(EPSG5174)'
+Y_COL = '좌표정보Y(EPSG5174)'
+LOCAL_GOV_COL = '개방자치단체코드'
+DENTAL_COLUMNS = ['사업장명', '병원명', '영업상태명', '상세영업상태명', '소재지전체주소', '도로명전체주소', X_COL, Y_COL, LOCAL_GOV_COL,
+                  '관리번호', '인허가일자', '폐업일자', '최종수정시점', '데이터갱신구분', '데이터갱신일자',
+                  '의료기관종별명', '의료인수', '병상수', '총면적']
+FULL_FILES = ['data_raw/치과병원.csv', 'data_raw/치과의원.csv']
+# LOCALDATA 변동분 파일 (전체 파일과 같은 컬럼 + 데이터갱신구분 I/U/D, 데이터갱신일자), 파일명 순서대로 적용
+CHANGE_PATTERNS = ['data_raw/dental_changes/*.csv']
+EXPORT_COLUMNS = ['관리번호', '병원명', '시도', '시군구', '읍면동', '좌표X', '좌표Y', '위도', '경도', CODE_COL, GU_CODE_COL,
+                  LOCAL_GOV_COL, '의료인수']
 
-    # 3. 데이터 합치기
-    if df_hosp is None and df_clinic is None:
-        print("데이터를 로드할 수 없습니다.")
-        return
 
-    df_dental = pd.concat([df_hosp, df_clinic], ignore_index=True)
-    print(f"전체 데이터 개수: {len(df_dental)}")
+def dental_change_files(patterns=CHANGE_PATTERNS):
+    files = set()
+    for pattern in patterns:
+        files.update(path.replace(os.sep, '/') for path in glob.glob(pattern))
+    return sorted(files)
+
+
+def load_csv(path):
+    # 앞부분 바이트로 인코딩 감지 후 필요한 컬럼만 문자열로 로드
+    if not os.path.exists(path):
+        print(f"파일을 찾을 수 없습니다: {path}")
+        return None
+
+    try:
+        df, enc = read_projected_csv(path, DENTAL_COLUMNS, dtype=str)
+    except Exception as e:
+        print(f"파일 로드 실패: {path} ({e})")
+        return None
+    print(f"성공적으로 로드함 ({enc}): {path}")
+    return df
+
 
-    # 4. '영업상태명' 필터링 (영업/정상인 행만 유지)
-    # 데이터에 따라 '영업상태명'이 없거나 '상세영업상태명'만 있을 수 있음
-    status_col = None
+def active_status(df_dental):
+    # '영업상태명'이 영업/정상인 행만 영업 중으로 봄
+    # 데이터에 따라 '영업상태명'이 없거나 '상세영업상태명'만 있을 수 있음 (둘 다 없으면 모두 영업 중)
     if '영업상태명' in df_dental.columns:
-        status_col = '영업상태명'
-        target_status = '영업/정상'
-    elif '상세영업상태명' in df_dental.columns:
-        status_col = '상세영업상태명'
-        target_status = '영업중'
-        
-    if status_col:
-        df_dental = df_dental[df_dental[status_col] == target_status].copy()
-        print(f"영업 중인 데이터 개수 ({status_col}='{target_status}'): {len(df_dental)}")
-    else:
-        print("영업 상태 관련 컬럼을 찾을 수 없어 필터링을 건너뜁니다.")
+        return df_dental['영업상태명'], df_dental['영업상태명'] == '영업/정상'
+    if '상세영업상태명' in df_dental.columns:
+        return df_dental['상세영업상태명'], df_dental['상세영업상태명'] == '영업중'
+    return pd.Series(None, index=df_dental.index, dtype=object), pd.Series(True, index=df_dental.index)
+
+
+def normalize_dental(df_dental, dim, source):
+    # 원본(전체 파일 또는 변동분) 행 → 등록부 컬럼 (clinic_registry.CLINIC_COLUMNS)
+    df_dental = df_dental.reset_index(drop=True)
+    df_result = pd.DataFrame(index=df_dental.index)
+
+    # 관리번호가 없는 행은 파일명과 행 번호로 대신함
+    fallback_keys = pd.Series([f"{os.path.basename(source)}:{i}" for i in df_dental.index], dtype=object)
+    keys = df_dental['관리번호'] if '관리번호' in df_dental.columns else pd.Series(None, index=df_dental.index, dtype=object)
+    df_result['관리번호'] = keys.where(keys.notna() & (keys.astype(str).str.strip() != ''), fallback_keys)
 
-    # 5. 주소 정보 추출 (시도, 시군구, 읍면동)
-    # '소재지전체주소'가 지번 주소이므로 우선 사용, 없으면 '도로명전체주소' 사용
-    # NaN 처리를 위해 두 컬럼을 합침
-    df_dental['address'] = df_dental['소재지전체주소'].fillna(df_dental['도로명전체주소']).fillna('')
-    
-    def extract_addr(addr):
-        if not addr:
-            return pd.Series(['', '', ''])
-        parts = addr.split()
-        sido = parts[0] if len(parts) > 0 else ''
-        sigungu = parts[1] if len(parts) > 1 else ''
-        # 읍면동: 지번주소(소재지전체주소)의 3번째 토큰이 보통 읍면동임
-        dong = parts[2] if len(parts) > 2 else ''
-        return pd.Series([sido, sigungu, dong])
-
-    df_dental[['시도', '시군구', '읍면동']] = df_dental['address'].apply(extract_addr)
-    
-    # 6. 필요한 컬럼만 선택 [병원명, 시도, 시군구, 읍면동]
     # '사업장명'이 보통 병원 이름임
     name_col = '사업장명'
     if name_col not in df_dental.columns:
@@ -79,23 +78,219 @@ def preprocess_dental_data():
             name_col = '병원명'
         else:
             name_col = df_dental.columns[0]
-            
-    df_result = df_dental[[name_col, '시도', '시군구', '읍면동']].copy()
-    df_result.columns = ['병원명', '시도', '시군구', '읍면동']
-
-    # 7. 결과 저장
-    if not os.path.exists(processed_dir):
-        os.makedirs(processed_dir)
-        
-    output_path = os.path.join(processed_dir, 'dental_preprocessed.csv')
-    df_result.to_csv(output_path, index=False, encoding='utf-8-sig')
+    df_result['병원명'] = df_dental[name_col]
+
+    # 주소 정보 추출 (시도, 시군구, 읍면동)
+    # '소재지전체주소'가 지번 주소이므로 우선 사용, 없으면 '도로명전체주소' 사용
+    # NaN 처리를 위해 두 컬럼을 합침
+    address = df_dental['소재지전체주소'].fillna(df_dental['도로명전체주소']).fillna('')
+
+    # 읍면동: 지번주소(소재지전체주소)의 시군구 다음 토큰이 보통 읍면동임
+    with profiling.step('주소 파싱'):
+        df_result[['시도', '시군구', '읍면동']] = parse_region_by_sido(address)
+
+    # 좌표 (EPSG:5174, 미터 단위) - 공백 등 잘못된 값은 결측 처리
+    for src_col, dst_col in [(X_COL, '좌표X'), (Y_COL, '좌표Y')]:
+        if src_col in df_dental.columns:
+            df_result[dst_col] = pd.to_numeric(df_dental[src_col], errors='coerce')
+        else:
+            df_result[dst_col] = float('nan')
+    df_result['주소'] = address
+    # 지도 표시용 WGS84 위도·경도 (파일 전체를 한 번에 변환해 등록부에 저장 → 내보낼 때 다시 계산하지 않음)
+    df_result['위도'], df_result['경도'] = epsg5174_to_wgs84(df_result['좌표X'].to_numpy(), df_result['좌표Y'].to_numpy())
+
+    # 개방자치단체코드 (인허가 담당 지자체, 없거나 잘못된 값은 0)
+    if LOCAL_GOV_COL in df_dental.columns:
+        local_gov = pd.to_numeric(df_dental[LOCAL_GOV_COL], errors='coerce')
+        df_result[LOCAL_GOV_COL] = local_gov.fillna(UNKNOWN_CODE).astype('int64')
+    else:
+        df_result[LOCAL_GOV_COL] = UNKNOWN_CODE
+
+    # 주소 이름 → 행정구역코드·시군구코드 (인구 전처리에서 만든 차원 테이블 기준, 분석 단계는 코드로 조인)
+    if dim is not None:
+        df_result = attach_codes(df_result, dim)
+    else:
+        df_result[CODE_COL] = UNKNOWN_CODE
+        df_result[GU_CODE_COL] = UNKNOWN_CODE
+
+    # 영업 상태·일자 (최종수정시점은 숫자만 남겨 문자열 비교로 선후를 가림)
+    status, active = active_status(df_dental)
+    df_result['영업상태'] = status
+    df_result['영업중'] = active.astype('int64')
+    df_result['중복제외'] = 0
+    df_result['중복클러스터'] = None
+    for col in ['인허가일자', '폐업일자']:
+        df_result[col] = df_dental[col] if col in df_dental.columns else None
+    modified = df_dental.get('최종수정시점', df_dental.get('데이터갱신일자'))
+    if modified is not None:
+        modified = modified.str.replace(r'\D', '', regex=True)
+        modified = modified.where(modified != '')
+    df_result['최종수정시점'] = modified
+
+    # 공급 규모 (종별, 의료인·병상 수는 없거나 잘못된 값이면 0, 총면적은 결측으로 둠)
+    df_result['의료기관종별명'] = df_dental['의료기관종별명'] if '의료기관종별명' in df_dental.columns else None
+    for col in ['의료인수', '병상수']:
+        if col in df_dental.columns:
+            df_result[col] = pd.to_numeric(df_dental[col], errors='coerce').fillna(0).astype('int64')
+        else:
+            df_result[col] = 0
+    df_result['총면적'] = pd.to_numeric(df_dental['총면적'], errors='coerce') if '총면적' in df_dental.columns else float('nan')
+    return df_result[clinic_registry.CLINIC_COLUMNS]
+
+
+def load_full_files(full_files, dim):
+    print("데이터 로딩 중...")
+    frames = [df for df in (load_csv(path) for path in full_files) if df is not None]
+    if not frames:
+        return None
+
+    # 영업 중이 아닌 치과도 등록부에는 남김 (변동분으로 다시 영업하거나 폐업 이력을 볼 때 사용)
+    df_dental = pd.concat(frames, ignore_index=True)
+    print(f"전체 데이터 개수: {len(df_dental)}")
+    profiling.rows('원본', df_dental)
+    df_full = normalize_dental(df_dental, dim, 'full')
+    duplicated = int(df_full['관리번호'].duplicated().sum())
+    if duplicated:
+        print(f"관리번호가 중복된 행 {duplicated}개는 마지막 행만 등록부에 남습니다.")
+    return df_full
+
+
+def apply_change_file(conn, path, dim):
+    # 변동분 파일 하나 적용 → (상태 변화 통계, 바뀐 관리번호, 적용 전 위치) 또는 None
+    df_change = load_csv(path)
+    if df_change is None:
+        return None
+    df_change = normalize_dental(df_change, dim, path).assign(
+        _deleted=(df_change.get('데이터갱신구분', pd.Series('', index=df_change.index)).fillna('').str.upper() == 'D').to_numpy())
+    # 한 파일에 같은 관리번호가 여러 번 나오면 마지막(가장 최근) 변경만 적용
+    df_change = df_change.sort_values('최종수정시점', kind='stable', na_position='first')
+    df_change = df_change.drop_duplicates('관리번호', keep='last')
+    before = clinic_registry.load_positions(conn, df_change['관리번호'], POSITION_COLUMNS)
+    stats = clinic_registry.apply_changes(conn, df_change, df_change['_deleted'].to_numpy())
+    clinic_registry.record_file(conn, path, 'change', len(df_change))
+    conn.commit()
+    return stats, df_change['관리번호'], before
+
+
+def preprocess_dental_data(rebuild=False):
+    # 전체 파일은 바뀌었을 때만 다시 읽어 등록부(관리번호 기준 SQLite)를 만들고,
+    # 변동분 파일은 새로 생긴 것만 바뀐 행 단위로 적용한 뒤 영업 중인 치과와 지역별 치과 수를 내보냄
+    full_files = [path for path in FULL_FILES if os.path.exists(path)]
+    if not full_files:
+        print(f"파일을 찾을 수 없습니다: {FULL_FILES}")
+        print("데이터를 로드할 수 없습니다.")
+        return
+
+    dim = load_region_dim()
+    if dim is None:
+        print("행정구역 차원 테이블(region_dim)이 없어 코드를 0으로 둡니다. 인구 전처리를 먼저 수행해주세요.")
+    dim_path = table_path(REGION_DIM_TABLE)
+    dim_files = [dim_path] if dim is not None else []
+
+    conn = clinic_registry.connect()
+    try:
+        # 등록부를 새로 만들었거나 행정구역코드가 바뀌면 중복 등재를 전체 다시 묶음
+        full_dedup = True
+        # 1. 전체 파일 (처음 실행이거나 전체 파일이 바뀌었으면 등록부를 새로 만듦 → 변동분도 다시 적용)
+        if rebuild or not clinic_registry.files_unchanged(conn, 'full', full_files):
+            df_full = load_full_files(full_files, dim)
+            if df_full is None:
+                print("데이터를 로드할 수 없습니다.")
+                return
+            with profiling.step('등록부 생성'):
+                clinic_registry.replace_all(conn, df_full)
+                for path in full_files:
+                    clinic_registry.record_file(conn, path, 'full', None)
+                conn.commit()
+            print(f"등록부 생성: {len(df_full)}개 (영업 중 {int(df_full['영업중'].sum())}개)")
+        elif not clinic_registry.files_unchanged(conn, 'region_dim', dim_files):
+            # 행정구역 차원 테이블만 바뀌면 저장된 주소 이름으로 코드만 다시 찾음 (주소 재파싱 없음)
+            with profiling.step('행정구역코드 갱신'):
+                df_codes = clinic_registry.load_clinics(conn, active_only=False, columns=['관리번호'] + REGION_KEYS)
+                if dim is not None:
+                    df_codes = attach_codes(df_codes, dim)
+                else:
+                    df_codes[[CODE_COL, GU_CODE_COL]] = UNKNOWN_CODE
+                clinic_registry.update_codes(conn, df_codes)
+            print("행정구역 차원 테이블이 바뀌어 등록부의 행정구역코드를 갱신했습니다.")
+        else:
+            full_dedup = False
+            print("전체 파일이 그대로여서 저장된 등록부를 사용합니다.")
+        clinic_registry.set_files(conn, 'region_dim', dim_files)
+        conn.commit()
+
+        # 2. 변동분 파일 (적용하지 않았거나 내용이 바뀐 파일만, 파일명 순서대로)
+        applied = clinic_registry.file_records(conn, 'change')
+        change_files = [path for path in dental_change_files()
+                        if path not in applied or not file_unchanged(path, applied[path])]
+        changed_keys, before = [], []
+        with profiling.step('변동분 적용'):
+            for path in change_files:
+                result = apply_change_file(conn, path, dim)
+                if result is not None:
+                    stats, keys, positions = result
+                    changed_keys.append(keys)
+                    before.append(positions)
+                    print(f"  {path}: " + ', '.join(f"{name} {count}" for name, count in stats.items()))
+        profiling.rows('변동분 파일', len(change_files))
+
+        # 3. 중복 등재 정리 (바뀐 표시·클러스터만 등록부에 반영, 폐업·삭제한 치과는 표시를 지움)
+        # 등록부를 새로 만들었으면 영업 중인 치과 전체를, 변동분만 적용했으면 바뀐 치과와 후보 쌍으로 이어진 묶음만 다시 묶음
+        # → 변동분을 적용한 등록부와 새로 만든 등록부의 결과가 같음
+        with profiling.step('중복 치과 정리'):
+            df_all = clinic_registry.load_clinics(conn, active_only=False,
+                                                  columns=DEDUP_COLUMNS + ['중복제외', '중복클러스터'])
+            active = (df_all['영업중'] == 1).to_numpy()
+            changed_keys = pd.concat(changed_keys, ignore_index=True) if changed_keys else pd.Series(dtype=object)
+            target = active.copy() if full_dedup else np.zeros(len(df_all), dtype=bool)
+            if not full_dedup and len(changed_keys):
+                target[active] = affected_rows(df_all[active], changed_keys, pd.concat(before, ignore_index=True))
+            # 대상이 아닌 행은 기존 값 유지, 폐업·삭제한 치과는 표시를 지움 (전체 다시 묶을 때는 폐업한 치과 모두)
+            excluded = df_all['중복제외'].to_numpy() == 1
+            clusters = np.where(df_all['중복클러스터'].isna(), None, df_all['중복클러스터'].to_numpy(dtype=object))
+            closed = ~active & (full_dedup | df_all['관리번호'].isin(changed_keys).to_numpy())
+            excluded[closed], clusters[closed] = False, None
+            if target.any():
+                excluded[target], clusters[target] = find_duplicates(df_all[target])
+            update = target | closed
+            changed = clinic_registry.set_duplicates(conn, df_all['관리번호'].to_numpy()[update],
+                                                     excluded[update], clusters[update])
+            df_all['중복제외'] = excluded.astype('int64')
+            df_all['중복클러스터'] = clusters
+            df_clusters = cluster_report(df_all[active & pd.notna(clusters)])
+        print(f"중복 클러스터 {df_clusters['클러스터'].nunique()}개 (다시 묶은 치과 {int(target.sum())}개), "
+              f"공급 집계에서 제외 {int(excluded.sum())}개 (표시 변경 {changed}개)")
+
+        # 4. 영업 중인 치과(중복 제외)·지역 단위별 공급 지표(치과 수, 종별, 의료인·병상 수, 총면적) 내보내기
+        df_result = clinic_registry.load_clinics(conn, columns=EXPORT_COLUMNS)
+        df_supply = clinic_registry.load_supply(conn)
+
+        # 5. 폐업한 치과까지 포함한 개업·폐업 이력 (시점별 지역 치과 수 조회용)
+        with profiling.step('개업·폐업 이력'):
+            history = CompetitionHistory.build(
+                clinic_registry.load_clinics(conn, active_only=False, columns=HISTORY_COLUMNS))
+            history_path = history.save()
+    finally:
+        conn.close()
+
+    print(f"영업 중인 데이터 개수: {len(df_result)}")
+    print(f"행정구역코드 매칭: {(df_result[CODE_COL] != UNKNOWN_CODE).sum()} / {len(df_result)}")
+
+    # 6. 결과 저장
+    output_path = save_table(df_result, 'dental_preprocessed')
+    save_table(df_supply, clinic_registry.SUPPLY_TABLE)
+    save_table(df_clusters, 'dental_duplicate_clusters')
+    profiling.rows('출력', df_result)
     print(f"전처리 완료. 파일 저장됨: {output_path}")
+    print(f"개업·폐업 이력 저장됨: {history_path}")
 
-    # 8. 시도별 치과 개수 출력
+    # 7. 시도별 치과 개수 출력
     print("\n--- 시도별 치과 개수 확인 ---")
     counts = df_result['시도'].value_counts()
     print(counts.head(20)) # 너무 많을 수 있으니 상위 20개 출력
 
 if __name__ == "__main__":
-    preprocess_dental_data()
-
+    parser = argparse.ArgumentParser(description="치과 등록부 갱신 및 전처리")
+    parser.add_argument('--rebuild', action='store_true', help="적용 기록을 무시하고 전체 파일부터 등록부를 다시 생성")
+    args = parser.parse_args()
+    preprocess_dental_data(rebuild=args.rebuild)
@@ -1,58 +1,28 @@
+import argparse
 import pandas as pd
-import os
 import re
 
-def preprocess_population_data():
-    raw_path = 'data_raw/연령별인구현황.csv'
-    processed_dir = 'data_processed'
-    output_path = os.path.join(processed_dir, 'population_preprocessed.csv')
-    
-    # 1. 파일 로드
-    print(f"Loading {raw_path}...")
-    try:
-        # 천단위 구분자(,) 처리 및 인코딩 설정
-        df = pd.read_csv(raw_path, encoding='cp949', thousands=',')
-    except Exception as e:
-        print(f"Error loading file: {e}")
-        return
+import profiling
+from address_parser import parse_region
+from csv_loader import sniff_encoding
+from data_store import TableWriter, save_table
+from population_cube import CubeBuilder, parse_age_columns
+from region_dim import CODE_COL, GU_CODE_COL, REGION_KEYS, build_region_dim, parse_admin_codes, region_gu_codes, save_region_dim
+
 
-    # 2. 행정구역 전처리
-    print("Processing '행정구역' column...")
-    
-    # 괄호와 코드 제거
-    df['clean_addr'] = df['행정구역'].str.split('(').str[0].str.strip()
-    
-    # 시도, 시군구, 읍면동 분리 로직
-    # 주소 형식이 "시도 시군구 읍면동" 형태임
-    def split_address(addr):
-        parts = addr.split()
-        sido = parts[0] if len(parts) > 0 else ''
-        
-        if len(parts) == 1:
-            return pd.Series([sido, '', ''])
-        elif len(parts) == 2:
-            return pd.Series([sido, parts[1], ''])
-        elif len(parts) >= 3:
-            # 시군구가 두 단어일 수도 있음 (예: 수원시 팔달구)
-            # 하지만 보통 마지막이 읍면동이므로 뒤에서부터 채우는 것이 안전할 수 있음
-            # 여기서는 사용자 요청에 따라 앞부분 시군구, 마지막 읍면동으로 처리
-            sigungu = ' '.join(parts[1:-1])
-            dong = parts[-1]
-            return pd.Series([sido, sigungu, dong])
-        return pd.Series(['', '', ''])
-
-    df[['시도', '시군구', '읍면동']] = df['clean_addr'].apply(split_address)
-
-    # 3. 인구수 계산 (노인인구수: 65세 이상 합계)
-    print("Calculating population counts...")
-    
+def find_population_columns(columns):
+    # 헤더만 보고 필요한 컬럼 선택
     # 총인구수 컬럼 찾기 (날짜가 바뀔 수 있으므로 '총인구수' 키워드로 검색)
-    total_pop_col = [col for col in df.columns if '총인구수' in col][0]
-    
-    # 연령별 컬럼 추출 (65세 ~ 100세 이상)
+    # 여러 달이 함께 있는 파일이면 가장 최근 월 기준 (컬럼명이 'YYYY년MM월_...' 형태라 정렬 가능)
+    total_pop_col = max(col for col in columns if '총인구수' in col)
+    prefix = total_pop_col[:-len('총인구수')]
+
+    # 연령별 컬럼 추출 (65세 ~ 100세 이상, 총인구수와 같은 월)
     # 컬럼명 예: '2026년01월_계_65세'
     senior_cols = []
-    for col in df.columns:
+    for col in columns:
+        if not col.startswith(prefix):
+            continue
         # '65세'부터 '99세'까지 찾기
         match = re.search(r'_(\d+)세$', col)
         if match:
@@ -62,25 +32,108 @@ def preprocess_population_data():
         # '100세 이상' 컬럼 포함
         if '100세 이상' in col:
             senior_cols.append(col)
-            
-    # 노인인구수 합산 (숫자 데이터로 자동 변환됐는지 확인 필요, thousands=',' 옵션 사용함)
-    df['노인인구수'] = df[senior_cols].sum(axis=1)
-    df['총인구수'] = df[total_pop_col]
+    return total_pop_col, senior_cols
+
+
+def summarize_population(df, total_pop_col, senior_cols):
+    # 행정구역 전처리: 괄호와 코드 제거 후 시도, 시군구, 읍면동 분리
+    # (주소 형식이 "시도 시군구 읍면동" 형태, 시군구가 두 단어일 수도 있음)
+    clean_addr = df['행정구역'].str.split('(').str[0].str.strip()
+    df_result = parse_region(clean_addr).reset_index(drop=True)
+    # 괄호 안 행정기관코드는 이후 단계의 조인·그룹화 키로 사용 (시군구코드: 해당 시군구 합계 행의 코드)
+    df_result.insert(0, CODE_COL, parse_admin_codes(df['행정구역']))
+    df_result.insert(1, GU_CODE_COL, region_gu_codes(df_result))
+
+    # 인구수 계산 (노인인구수: 65세 이상 합계, thousands=',' 옵션으로 숫자 변환됨)
+    df_result['총인구수'] = df[total_pop_col].to_numpy()
+    df_result['노인인구수'] = df[senior_cols].sum(axis=1).to_numpy()
 
-    # 4. 필요한 컬럼만 선택 [시도, 시군구, 읍면동, 총인구수, 노인인구수]
-    # '읍면동'이 비어있는 행(시도 전체, 시군구 전체)은 제외할지 고민... 
+    # '읍면동'이 비어있는 행(시도 전체, 시군구 전체)은 제외할지 고민...
     # 요구사항에 명시되지 않았으므로 일단 모든 행 유지
-    df_result = df[['시도', '시군구', '읍면동', '총인구수', '노인인구수']].copy()
+    return df_result
+
+
+def region_keys(df_result):
+    # 큐브 지역 키: 행정구역코드 + 시도/시군구/읍면동
+    return df_result[[CODE_COL] + REGION_KEYS]
+
+
+def preprocess_population_data(chunksize=None, build_cube=True):
+    # chunksize를 지정하면 원본을 청크 단위로 읽어 결과를 이어서 저장 (파일 크기와 무관하게 메모리 제한)
+    # build_cube=True 이면 지역 × 월 × 연령 누적합 큐브도 함께 저장 (연령대·월 선택용)
+    raw_path = 'data_raw/연령별인구현황.csv'
+
+    # 1. 헤더만 읽어 필요한 컬럼 선택
+    print(f"Loading {raw_path}...")
+    try:
+        encoding = sniff_encoding(raw_path) or 'cp949'
+        header = pd.read_csv(raw_path, encoding=encoding, nrows=0).columns
+        total_pop_col, senior_cols = find_population_columns(header)
+    except Exception as e:
+        print(f"Error loading file: {e}")
+        return
+
+    usecols = ['행정구역', total_pop_col] + senior_cols
+    cube_builder = None
+    if build_cube:
+        age_cols, months = parse_age_columns(header)
+        cube_builder = CubeBuilder(age_cols, months)
+        usecols += [col for col in cube_builder.columns if col not in usecols]
+
+    # 천단위 구분자(,) 처리 및 인코딩 설정, 필요한 컬럼만 로드
+    read_options = dict(
+        encoding=encoding,
+        thousands=',',
+        usecols=usecols,
+        dtype={'행정구역': str},
+    )
+
+    # 2. 행정구역 전처리 및 인구수 계산
+    print("Processing '행정구역' column and calculating population counts...")
+    df_head = None
+    regions = []
+    if chunksize:
+        with TableWriter('population_preprocessed') as writer:
+            for chunk in pd.read_csv(raw_path, chunksize=chunksize, **read_options):
+                df_chunk = summarize_population(chunk, total_pop_col, senior_cols)
+                if cube_builder is not None:
+                    cube_builder.add(chunk, region_keys(df_chunk))
+                regions.append(region_keys(df_chunk))
+                if df_head is None:
+                    df_head = df_chunk.head(5)
+                writer.write(df_chunk)
+        output_path = writer.path
+        profiling.rows('출력', writer.rows)
+        print(f"청크 단위 처리 완료: {writer.rows}행")
+    else:
+        df = pd.read_csv(raw_path, **read_options)
+        df_result = summarize_population(df, total_pop_col, senior_cols)
+        if cube_builder is not None:
+            cube_builder.add(df, region_keys(df_result))
+        regions.append(region_keys(df_result))
+        output_path = save_table(df_result, 'population_preprocessed')
+        profiling.rows('출력', df_result)
+        df_head = df_result.head(5)
+
+    # 행정구역 차원 테이블 (코드 → 이름, 다른 단계에서 이름만 있는 데이터에 코드를 붙일 때 사용)
+    dim = build_region_dim(pd.concat(regions, ignore_index=True))
+    dim_path = save_region_dim(dim)
+    print(f"행정구역 차원 테이블 저장: {dim_path} ({len(dim)}개 지역)")
+
+    if cube_builder is not None:
+        with profiling.step('연령 누적합 큐브'):
+            cube = cube_builder.build()
+            cube_path = cube.save()
+        print(f"연령 누적합 큐브 저장: {cube_path} (지역 {len(cube.regions)}, 월 {len(cube.months)})")
 
-    # 5. 결과 저장 및 출력
-    if not os.path.exists(processed_dir):
-        os.makedirs(processed_dir)
-        
-    df_result.to_csv(output_path, index=False, encoding='utf-8-sig')
+    # 3. 결과 출력
     print(f"Preprocessing complete. Saved to: {output_path}")
 
     print("\n--- 상위 5개 데이터 확인 ---")
-    print(df_result.head(5))
+    print(df_head)
 
 if __name__ == "__main__":
-    preprocess_population_data()
+    parser = argparse.ArgumentParser(description="연령별 인구현황 전처리")
+    parser.add_argument('--chunksize', type=int, default=None, help="청크 단위 스트리밍 처리 시 한 번에 읽을 행 수")
+    args = parser.parse_args()
+    preprocess_population_data(chunksize=args.chunksize)
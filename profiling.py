@@ -0,0 +1,227 @@
+# 단계·세부 단계별 실행 기록 (프로파일링 모드)
+# `python pipeline.py --profile` 로 실행하면 단계마다, 그리고 단계 안의 주요 작업(step)마다
+# 실행 시간, 최대 할당 메모리(tracemalloc), 입출력 행 수, 조인 매칭률(키가 상대편에 있는 행 비율)을 기록해
+# data_processed/run_report.json 으로 저장합니다. 이전 보고서는 run_report_prev.json 으로 남겨 비교할 수 있습니다.
+# 프로파일링 모드가 아니면 step()/rows()는 아무 일도 하지 않고 merge()는 pd.merge 와 같습니다.
+# tracemalloc 때문에 프로파일링 모드의 실행 시간은 평소보다 길어지므로 시간은 같은 모드끼리만 비교하세요.
+# (단계별 절대 성능 측정은 benchmark.py 사용)
+#   python profiling.py diff data_processed/run_report_prev.json data_processed/run_report.json
+import argparse
+import contextlib
+import json
+import os
+import time
+import tracemalloc
+
+import pandas as pd
+
+REPORT_PATH = os.path.join('data_processed', 'run_report.json')
+PREV_REPORT_PATH = os.path.join('data_processed', 'run_report_prev.json')
+
+_enabled = False
+_stack = []
+_report = None
+
+
+def enabled():
+    return _enabled
+
+
+def enable(meta=None):
+    # 보고서를 새로 시작하고 메모리 추적 시작
+    global _enabled, _report
+    _enabled = True
+    _report = {'meta': dict(meta or {}, started_at=time.strftime('%Y-%m-%d %H:%M:%S')), 'stages': []}
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def disable():
+    global _enabled
+    _enabled = False
+    _stack.clear()
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def _new_frame(name):
+    return {'name': name, 'seconds': 0.0, 'peak_mb': 0.0, 'rows': {}, 'joins': [], 'steps': []}
+
+
+@contextlib.contextmanager
+def step(name):
+    # 시간·최대 메모리 측정 구간 (중첩 가능, 바깥 구간의 최대값에도 반영)
+    if not _enabled:
+        yield
+        return
+    current, peak = tracemalloc.get_traced_memory()
+    if _stack:
+        _stack[-1]['_peak'] = max(_stack[-1]['_peak'], peak)
+    tracemalloc.reset_peak()
+
+    frame = _new_frame(name)
+    frame['_base'] = current
+    frame['_peak'] = current
+    parent = _stack[-1] if _stack else None
+    (parent['steps'] if parent else _report['stages']).append(frame)
+    _stack.append(frame)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        frame['seconds'] = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        frame['_peak'] = max(frame['_peak'], peak)
+        # 구간 시작 시점 대비 추가로 할당된 최대 메모리
+        frame['peak_mb'] = (frame['_peak'] - frame['_base']) / 2**20
+        _stack.pop()
+        tracemalloc.reset_peak()
+        if parent is not None:
+            parent['_peak'] = max(parent['_peak'], frame['_peak'])
+        del frame['_base'], frame['_peak']
+
+
+def stage(name):
+    return step(name)
+
+
+def skipped(name, reason):
+    # 건너뛴 단계도 보고서에 남겨 실행 간 비교 시 누락으로 보이지 않게 함
+    if _enabled:
+        frame = _new_frame(name)
+        frame['skipped'] = reason
+        _report['stages'].append(frame)
+
+
+def rows(name, data):
+    # 현재 구간의 행 수 기록 (DataFrame/Series 또는 정수)
+    if _enabled and _stack:
+        _stack[-1]['rows'][name] = int(len(data) if hasattr(data, '__len__') else data)
+
+
+def _matched(frame, keys, other, other_keys):
+    # frame 의 각 행이 other 에 같은 키를 가지고 있는지 여부
+    index = pd.MultiIndex.from_frame(frame[keys])
+    return index.isin(pd.MultiIndex.from_frame(other[other_keys].drop_duplicates()))
+
+
+def merge(left, right, name, **kwargs):
+    # pd.merge + 조인 통계 (왼쪽/오른쪽/결과 행 수, 양쪽 각각 상대편과 키가 맞는 행의 비율)
+    result = pd.merge(left, right, **kwargs)
+    if not (_enabled and _stack):
+        return result
+    left_keys = kwargs.get('left_on', kwargs.get('on'))
+    right_keys = kwargs.get('right_on', kwargs.get('on'))
+    left_keys = [left_keys] if isinstance(left_keys, str) else list(left_keys)
+    right_keys = [right_keys] if isinstance(right_keys, str) else list(right_keys)
+    left_matched = int(_matched(left, left_keys, right, right_keys).sum())
+    right_matched = int(_matched(right, right_keys, left, left_keys).sum())
+    _stack[-1]['joins'].append({
+        'name': name,
+        'how': kwargs.get('how', 'inner'),
+        'left_rows': len(left),
+        'right_rows': len(right),
+        'output_rows': len(result),
+        'left_matched': left_matched,
+        'right_matched': right_matched,
+        'match_rate': left_matched / len(left) if len(left) else 0.0,
+        'right_match_rate': right_matched / len(right) if len(right) else 0.0,
+    })
+    return result
+
+
+def save_report(path=REPORT_PATH, prev_path=PREV_REPORT_PATH):
+    if _report is None:
+        return None
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if os.path.exists(path):
+        os.replace(path, prev_path)
+    _report['meta']['finished_at'] = time.strftime('%Y-%m-%d %H:%M:%S')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(_report, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def flatten(report):
+    # {'단계/세부단계': frame} (보고서 비교용)
+    flat = {}
+
+    def walk(frames, prefix):
+        for frame in frames:
+            key = prefix + frame['name']
+            flat[key] = frame
+            walk(frame.get('steps', []), key + '/')
+
+    walk(report['stages'], '')
+    return flat
+
+
+def diff_reports(old, new, time_ratio=1.2):
+    # 두 보고서의 구간별 시간·행 수·매칭률 변화 (변화가 있는 항목만)
+    # 어느 한쪽에서 건너뛴 단계는 세부 구간이 없으므로 비교하지 않음
+    lines = []
+    old_flat, new_flat = flatten(old), flatten(new)
+    skipped_stages = {f['name'] for f in old['stages'] + new['stages'] if 'skipped' in f}
+
+    def compared(key):
+        return key.split('/')[0] not in skipped_stages
+
+    for key, frame in new_flat.items():
+        before = old_flat.get(key)
+        if before is None:
+            if compared(key):
+                lines.append(f"[추가] {key}")
+            continue
+        if not compared(key):
+            continue
+        if frame['seconds'] > before['seconds'] * time_ratio and frame['seconds'] - before['seconds'] > 0.05:
+            lines.append(f"[시간] {key}: {before['seconds']:.2f}초 → {frame['seconds']:.2f}초")
+        for name, count in frame['rows'].items():
+            if before['rows'].get(name) != count:
+                lines.append(f"[행 수] {key} {name}: {before['rows'].get(name)} → {count}")
+        old_joins = {j['name']: j for j in before['joins']}
+        for join in frame['joins']:
+            prev = old_joins.get(join['name'])
+            if prev and (prev['left_matched'] != join['left_matched'] or prev['right_matched'] != join['right_matched']
+                         or prev['output_rows'] != join['output_rows']):
+                lines.append(f"[조인] {key} {join['name']}: 매칭률 {prev['match_rate']:.1%} → {join['match_rate']:.1%}, "
+                             f"오른쪽 {prev['right_match_rate']:.1%} → {join['right_match_rate']:.1%}, "
+                             f"결과 {prev['output_rows']} → {join['output_rows']}행")
+    for key in old_flat:
+        if key not in new_flat and compared(key):
+            lines.append(f"[삭제] {key}")
+    return lines
+
+
+def print_summary(report):
+    print("\n--- [단계별 실행 기록] ---")
+    for key, frame in flatten(report).items():
+        depth = key.count('/')
+        if 'skipped' in frame:
+            print(f"{'  ' * depth}{frame['name']}: 건너뜀")
+            continue
+        joins = ', '.join(f"{j['name']} {j['match_rate']:.1%}/{j['right_match_rate']:.1%}" for j in frame['joins'])
+        print(f"{'  ' * depth}{frame['name']}: {frame['seconds']:.2f}초, +{frame['peak_mb']:.1f}MB"
+              + (f", 행 {frame['rows']}" if frame['rows'] else '')
+              + (f", 매칭률(왼쪽/오른쪽) [{joins}]" if joins else ''))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="실행 기록(run_report.json) 비교")
+    sub = parser.add_subparsers(dest='command', required=True)
+    diff_parser = sub.add_parser('diff', help="두 실행 기록 비교")
+    diff_parser.add_argument('old', nargs='?', default=PREV_REPORT_PATH)
+    diff_parser.add_argument('new', nargs='?', default=REPORT_PATH)
+    show_parser = sub.add_parser('show', help="실행 기록 요약 출력")
+    show_parser.add_argument('path', nargs='?', default=REPORT_PATH)
+    args = parser.parse_args()
+
+    if args.command == 'show':
+        with open(args.path, encoding='utf-8') as f:
+            print_summary(json.load(f))
+    else:
+        with open(args.old, encoding='utf-8') as f:
+            old = json.load(f)
+        with open(args.new, encoding='utf-8') as f:
+            new = json.load(f)
+        changes = diff_reports(old, new)
+        print("\n".join(changes) if changes else "변화 없음")
@@ -0,0 +1,123 @@
+# 법정동별 평당가격 분포 스케치 (DDSketch 방식의 로그 버킷 히스토그램)
+# - 값 x를 ceil(log_gamma(x)) 버킷에 세어두면 분위수를 상대 오차 ALPHA 이내로 구할 수 있음
+# - 버킷 배치(ALPHA, 최소/최대값)가 고정이므로 스케치끼리는 버킷 개수를 더하기만 하면 병합됨
+#   (파일·월별 스케치 병합, 행정동 하나에 대응하는 여러 법정동 합산 모두 덧셈)
+# - 키(법정동) 하나당 메모리는 거래 건수와 무관하게 버킷 수(약 350개)로 고정
+import os
+
+import numpy as np
+import pandas as pd
+
+SKETCH_PATH = os.path.join('data_processed', 'housing_sketch.npz')
+ALPHA = 0.01            # 분위수 상대 오차 1%
+MIN_VALUE = 100.0       # 평당가격(만원) 하한 — 범위 밖 값은 양 끝 버킷에 포함
+MAX_VALUE = 100000.0    # 평당가격(만원) 상한
+QUANTILES = [0.25, 0.5, 0.75, 0.9]
+QUANTILE_COLS = ['평당가격_p25', '평당가격_중앙값', '평당가격_p75', '평당가격_p90']
+
+
+class SketchSet:
+    # 키별 스케치 묶음: keys(DataFrame)의 i번째 행 ↔ counts[i] (버킷별 개수)
+    def __init__(self, key_cols, keys=None, counts=None, alpha=ALPHA, min_value=MIN_VALUE, max_value=MAX_VALUE):
+        self.key_cols = list(key_cols)
+        self.alpha = float(alpha)
+        self.min_value = float(min_value)
+        self.max_value = float(max_value)
+        self.gamma = (1 + self.alpha) / (1 - self.alpha)
+        self._log_gamma = np.log(self.gamma)
+        self.offset = int(np.ceil(np.log(self.min_value) / self._log_gamma))
+        self.n_buckets = int(np.ceil(np.log(self.max_value) / self._log_gamma)) - self.offset + 1
+
+        if keys is None:
+            keys = pd.DataFrame(columns=self.key_cols)
+            counts = np.zeros((0, self.n_buckets), dtype=np.int64)
+        self.keys = keys[self.key_cols].astype(str).reset_index(drop=True)
+        self.counts = counts
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _empty_like(self, keys, counts):
+        return SketchSet(self.key_cols, keys, counts, self.alpha, self.min_value, self.max_value)
+
+    def _key_frame(self, index):
+        # factorize 결과(MultiIndex)는 레벨 이름이 빠질 수 있으므로 키 컬럼명을 다시 지정
+        frame = index.to_frame(index=False)
+        frame.columns = self.key_cols
+        return frame
+
+    def bucket_index(self, values):
+        values = np.clip(np.asarray(values, dtype=np.float64), self.min_value, self.max_value)
+        return np.ceil(np.log(values) / self._log_gamma).astype(np.int64) - self.offset
+
+    def bucket_value(self, index):
+        # 버킷 대표값 (버킷 경계 gamma^(i-1) ~ gamma^i 사이에서 상대 오차가 가장 작은 값)
+        return 2 * self.gamma ** (np.asarray(index) + self.offset) / (self.gamma + 1)
+
+    def from_values(self, keys, values):
+        # 거래 행(keys, values) → 같은 버킷 배치의 새 스케치 묶음 (키 정렬)
+        keys = keys[self.key_cols].astype(str).reset_index(drop=True)
+        codes, uniques = pd.MultiIndex.from_frame(keys).factorize(sort=True)
+        flat = codes * self.n_buckets + self.bucket_index(values)
+        counts = np.bincount(flat, minlength=len(uniques) * self.n_buckets)
+        return self._empty_like(self._key_frame(uniques), counts.reshape(len(uniques), self.n_buckets))
+
+    def merge(self, other):
+        # 키 합집합 기준으로 버킷 개수를 더함 (버킷 배치가 같아야 함)
+        if (other.alpha, other.min_value, other.max_value) != (self.alpha, self.min_value, self.max_value):
+            raise ValueError("버킷 배치가 다른 스케치는 병합할 수 없습니다.")
+        keys = pd.concat([self.keys, other.keys], ignore_index=True)
+        codes, uniques = pd.MultiIndex.from_frame(keys).factorize(sort=True)
+        counts = np.zeros((len(uniques), self.n_buckets), dtype=np.int64)
+        np.add.at(counts, codes, np.vstack([self.counts, other.counts]))
+        return self._empty_like(self._key_frame(uniques), counts)
+
+    def positions(self, keys):
+        # keys 각 행의 스케치 위치 (없으면 -1)
+        index = pd.MultiIndex.from_frame(self.keys)
+        return index.get_indexer(pd.MultiIndex.from_frame(keys[self.key_cols].astype(str)))
+
+    def grouped_counts(self, groups, positions, n_groups):
+        # positions 의 스케치를 groups 번호별로 합산 → (n_groups, 버킷 수)
+        groups = np.asarray(groups)
+        positions = np.asarray(positions)
+        found = positions >= 0
+        counts = np.zeros((n_groups, self.n_buckets), dtype=np.int64)
+        np.add.at(counts, groups[found], self.counts[positions[found]])
+        return counts
+
+    def quantiles(self, quantiles=QUANTILES, counts=None):
+        # (키 수, 분위 수) 분위수 배열 (거래가 없는 키는 NaN)
+        counts = self.counts if counts is None else counts
+        cum = np.cumsum(counts, axis=1)
+        total = cum[:, -1] if cum.shape[1] else np.zeros(len(cum))
+        result = np.full((len(counts), len(quantiles)), np.nan)
+        has_data = total > 0
+        for j, q in enumerate(quantiles):
+            rank = q * (total[has_data] - 1)
+            idx = (cum[has_data] > rank[:, None]).argmax(axis=1)
+            result[has_data, j] = self.bucket_value(idx)
+        return result
+
+    @classmethod
+    def load(cls, path=SKETCH_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            key_cols = data['key_cols'].tolist()
+            keys = pd.DataFrame({col: data[f'key_{i}'] for i, col in enumerate(key_cols)})
+            return cls(key_cols, keys, data['counts'], float(data['alpha']),
+                       float(data['min_value']), float(data['max_value']))
+
+    def save(self, path=SKETCH_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        keys = {f'key_{i}': self.keys[col].to_numpy(dtype=str) for i, col in enumerate(self.key_cols)}
+        # 버킷 개수는 대부분 0이므로 압축 저장
+        np.savez_compressed(
+            path,
+            key_cols=np.array(self.key_cols, dtype=str),
+            counts=self.counts.astype(np.int64),
+            alpha=self.alpha,
+            min_value=self.min_value,
+            max_value=self.max_value,
+            **keys,
+        )
+        return path
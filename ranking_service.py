@@ -0,0 +1,159 @@
+# 실행 방법: 터미널에서 `python ranking_service.py --port 8502` 입력
+# 브라우저 없이 유망 입지 순위를 조회하는 로컬 HTTP/JSON 서비스 (표준 라이브러리만 사용)
+# 최종 결과(final_ranking_v3_economic)를 시작할 때 한 번만 읽어 대시보드와 같은 스코어링 엔진·가중치 스윕으로 응답합니다.
+# - GET /top?sido=서울특별시&k=10&pop=1.0&econ=1.0  : 시도별 상위 k개 (pop/econ: 노인 인구·경제력 가중치)
+# - GET /groups                                     : 조회 가능한 시도와 동 수
+# - GET /health                                     : 상태 확인
+# 요청마다 스레드가 하나씩 처리하며, 엔진과 배열은 읽기 전용이라 잠금 없이 동시에 조회합니다.
+import argparse
+import json
+import math
+import os
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from data_store import load_table, table_exists
+from scoring_engine import FEATURE_COLS, ScoringEngine, in_scoring_scope
+from weight_sweep import SWEEP_PATH, WeightSweep, top_k_rows
+
+REGION_KEYS = ['시도', '시군구', '읍면동']
+DEFAULT_PORT = 8502
+MAX_K = 1000
+
+
+class RankingIndex:
+    # 스코어링 엔진 + 응답용 배열 (지역명·원본 지표를 NumPy 배열로 보관해 DataFrame 생성 없이 응답)
+    def __init__(self, engine, sweep=None):
+        self.engine = engine
+        self.sweep = sweep
+        self.sigungu = engine.df['시군구'].astype(str).to_numpy(dtype=object)
+        self.dong = engine.df['읍면동'].astype(str).to_numpy(dtype=object)
+        self.features = engine.df[FEATURE_COLS].to_numpy(dtype=np.float64)
+        self.group_sizes = {group: len(engine.group_rows(group)) for group in engine.groups}
+
+    def top(self, group, k=10, pop_weight=1.0, econ_weight=1.0):
+        rows, scores = top_k_rows(self.engine, group, k, pop_weight, econ_weight, self.sweep)
+        results = []
+        for rank, (row, score) in enumerate(zip(rows.tolist(), scores.tolist()), start=1):
+            item = {'순위': rank, '시군구': self.sigungu[row], '읍면동': self.dong[row], '유망지수': score}
+            item.update(zip(FEATURE_COLS, self.features[row].tolist()))
+            results.append(item)
+        return results
+
+
+def load_ranking_index():
+    # 대시보드 기본 화면과 같은 데이터·필터 (경제력 데이터가 있는 동 단위 행)
+    if not table_exists('final_ranking_v3_economic'):
+        return None
+    df = load_table('final_ranking_v3_economic', columns=REGION_KEYS + FEATURE_COLS)
+    engine = ScoringEngine(df[in_scoring_scope(df)], group_col='시도')
+    # 스윕이 현재 데이터와 다르면(파이프라인 중간 실행 등) 엔진으로만 계산
+    sweep = WeightSweep.load(SWEEP_PATH) if os.path.exists(SWEEP_PATH) else None
+    if sweep is not None and not sweep.matches(engine.df):
+        sweep = None
+    return RankingIndex(engine, sweep)
+
+
+def parse_number(params, name, default, cast=float):
+    values = params.get(name)
+    if not values:
+        return default
+    try:
+        value = cast(values[0])
+    except ValueError:
+        raise ValueError(f"{name} 값이 숫자가 아닙니다: {values[0]}")
+    if not math.isfinite(value):
+        raise ValueError(f"{name} 값이 올바르지 않습니다: {values[0]}")
+    return value
+
+
+class RankingHandler(BaseHTTPRequestHandler):
+    # keep-alive 로 연결을 재사용해 요청마다 TCP 연결을 새로 맺지 않음
+    # (헤더와 본문을 따로 쓰므로 Nagle 알고리즘을 끄지 않으면 지연 ACK 때문에 응답마다 약 40ms 대기)
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    index = None
+    quiet = True
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = parse_qs(url.query)
+        try:
+            if url.path == '/top':
+                self.send_json(200, self.handle_top(params))
+            elif url.path == '/groups':
+                self.send_json(200, {'groups': self.index.group_sizes})
+            elif url.path == '/health':
+                self.send_json(200, {'status': 'ok', 'rows': len(self.index.engine.df),
+                                     'sweep': self.index.sweep is not None})
+            else:
+                self.send_json(404, {'error': f"알 수 없는 경로입니다: {url.path}"})
+        except KeyError as e:
+            self.send_json(404, {'error': str(e.args[0])})
+        except ValueError as e:
+            self.send_json(400, {'error': str(e)})
+
+    def handle_top(self, params):
+        start = time.perf_counter()
+        group = params.get('sido', [None])[0]
+        if group is None:
+            raise ValueError("sido 파라미터가 필요합니다.")
+        if not self.index.engine.has_group(group):
+            raise KeyError(f"데이터가 없는 시도입니다: {group}")
+        k = parse_number(params, 'k', 10, int)
+        if not 1 <= k <= MAX_K:
+            raise ValueError(f"k 는 1~{MAX_K} 사이여야 합니다: {k}")
+        pop_weight = parse_number(params, 'pop', 1.0)
+        econ_weight = parse_number(params, 'econ', 1.0)
+        results = self.index.top(group, k, pop_weight, econ_weight)
+        return {
+            '시도': group,
+            'k': k,
+            'pop': pop_weight,
+            'econ': econ_weight,
+            'results': results,
+            'elapsed_ms': (time.perf_counter() - start) * 1000,
+        }
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(index, host='127.0.0.1', port=DEFAULT_PORT, quiet=True):
+    handler = type('BoundRankingHandler', (RankingHandler,), {'index': index, 'quiet': quiet})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="유망 입지 순위 조회 HTTP/JSON 서비스")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--verbose', action='store_true', help="요청마다 접속 로그 출력")
+    args = parser.parse_args()
+
+    index = load_ranking_index()
+    if index is None:
+        print("분석 결과(final_ranking_v3_economic)가 없습니다. 파이프라인을 먼저 실행해주세요.")
+        raise SystemExit(1)
+    server = make_server(index, args.host, args.port, quiet=not args.verbose)
+    print(f"순위 서비스 시작: http://{args.host}:{server.server_port}/top?sido=서울특별시&k=10 "
+          f"(동 {len(index.engine.df)}개, 시도 {len(index.group_sizes)}개, 가중치 스윕 {'사용' if index.sweep else '없음'})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n서비스 종료")
+    finally:
+        server.server_close()
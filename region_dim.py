@@ -0,0 +1,98 @@
+# 행정구역 차원 테이블 (정수 행정기관코드 기준)
+# 행안부 인구 데이터의 '행정구역' 괄호 안 10자리 코드(시도 2 + 시군구 3 + 읍면동 3 + 리 2자리)를
+# 지역 키로 사용해 단계 간 조인·그룹화를 문자열 3개(시도/시군구/읍면동) 대신 정수 하나로 처리합니다.
+# - 시군구코드 = 코드의 앞 5자리 (뒤는 0), 시도코드 = 앞 2자리 (뒤는 0)
+#   단, 세종시처럼 읍면동이 시군구 칸에 들어간 행은 이름 기준 시군구 합계 행과 맞추기 위해 자기 코드를 사용
+# - 이름 → 코드 변환은 치과 주소, 동 중심점 파일처럼 코드가 없는 원본을 읽을 때 한 번만 수행
+#   (차원 테이블에 없는 지역은 0)
+import numpy as np
+import pandas as pd
+
+from data_store import load_table, save_table, table_exists
+
+REGION_DIM_TABLE = 'region_dim'
+REGION_KEYS = ['시도', '시군구', '읍면동']
+CODE_COL = '행정구역코드'
+GU_CODE_COL = '시군구코드'
+SIDO_CODE_COL = '시도코드'
+UNKNOWN_CODE = 0
+
+
+def parse_admin_codes(names):
+    # '서울특별시 종로구 청운효자동(1111051500)' → 1111051500 (코드가 없으면 0)
+    codes = pd.Series(names).str.extract(r'\((\d+)\)', expand=False)
+    return pd.to_numeric(codes, errors='coerce').fillna(UNKNOWN_CODE).astype('int64').to_numpy()
+
+
+def gu_codes(codes):
+    codes = np.asarray(codes, dtype=np.int64)
+    return np.where(codes > 0, codes // 10**5 * 10**5, UNKNOWN_CODE)
+
+
+def sido_codes(codes):
+    codes = np.asarray(codes, dtype=np.int64)
+    return np.where(codes > 0, codes // 10**8 * 10**8, UNKNOWN_CODE)
+
+
+def region_gu_codes(regions):
+    # 행마다 (시도, 시군구) 이름에 해당하는 시군구 합계 행의 코드 (시군구가 빈 값이면 0)
+    # 동 단위 행은 앞 5자리, 시군구 합계 행(읍면동이 빈 값)은 자기 코드
+    codes = regions[CODE_COL].to_numpy(dtype=np.int64)
+    sigungu = regions['시군구'].fillna('').to_numpy(dtype=str)
+    dong = regions['읍면동'].fillna('').to_numpy(dtype=str)
+    gu = np.where(dong == '', codes, gu_codes(codes))
+    return np.where(sigungu == '', UNKNOWN_CODE, gu)
+
+
+def build_region_dim(regions):
+    # regions: 행정구역코드 + 시도/시군구/읍면동 (인구 전처리 결과의 모든 행)
+    dim = regions[[CODE_COL] + REGION_KEYS].copy()
+    dim = dim[dim[CODE_COL] > 0].drop_duplicates(CODE_COL)
+    for col in REGION_KEYS:
+        dim[col] = dim[col].fillna('').astype(str)
+    dim[GU_CODE_COL] = region_gu_codes(dim)
+    dim[SIDO_CODE_COL] = sido_codes(dim[CODE_COL])
+    return dim.sort_values(CODE_COL).reset_index(drop=True)
+
+
+def save_region_dim(dim):
+    return save_table(dim, REGION_DIM_TABLE)
+
+
+def load_region_dim():
+    if not table_exists(REGION_DIM_TABLE):
+        return None
+    dim = load_table(REGION_DIM_TABLE)
+    return dim.fillna({col: '' for col in REGION_KEYS}).astype({col: str for col in REGION_KEYS})
+
+
+def _name_lookup(dim, df, keys):
+    # df 각 행의 이름 키가 dim 의 몇 번째 행인지 (같은 이름이 여러 번이면 코드가 가장 작은 행, 없으면 -1)
+    first = dim.drop_duplicates(keys)
+    index = pd.MultiIndex.from_frame(first[keys])
+    query = pd.MultiIndex.from_frame(df[keys].fillna('').astype(str))
+    pos = index.get_indexer(query)
+    return first, pos
+
+
+def lookup_codes(df, dim):
+    # 시도/시군구/읍면동 이름 → 행정구역코드
+    first, pos = _name_lookup(dim, df, REGION_KEYS)
+    codes = first[CODE_COL].to_numpy(dtype=np.int64)
+    return np.where(pos >= 0, codes[np.maximum(pos, 0)], UNKNOWN_CODE)
+
+
+def lookup_gu_codes(df, dim):
+    # 시도/시군구 이름 → 시군구코드 (시군구 합계 행 기준, 시군구가 빈 값이면 0)
+    gu_rows = dim[(dim['시군구'] != '') & (dim['읍면동'] == '')]
+    first, pos = _name_lookup(gu_rows, df, ['시도', '시군구'])
+    codes = first[CODE_COL].to_numpy(dtype=np.int64)
+    return np.where(pos >= 0, codes[np.maximum(pos, 0)], UNKNOWN_CODE)
+
+
+def attach_codes(df, dim):
+    # 이름만 있는 데이터에 행정구역코드·시군구코드 추가
+    df = df.copy()
+    df[CODE_COL] = lookup_codes(df, dim)
+    df[GU_CODE_COL] = lookup_gu_codes(df, dim)
+    return df
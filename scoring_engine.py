@@ -0,0 +1,114 @@
+# 유망 지수 스코어링 엔진
+# 각 지표를 1~10점으로 정규화한 뒤 로그를 취해두면
+#   Score = (인구 점수^w1) × (공급부족 점수^1) × (경제력 점수^w2)
+#   log Score = F @ [w1, 1, w2]
+# 이므로 가중치가 바뀔 때마다 행렬-벡터 곱 한 번으로 점수를 구할 수 있습니다.
+# 정규화·로그 변환은 그룹(시도)별로 한 번만 해두고, 상위 k개는 부분 선택(argpartition)으로 뽑습니다.
+import numpy as np
+
+# 인구, 공급부족, 경제력 순서 (가중치 벡터 [w1, 1, w2]와 같은 순서)
+# 공급부족 지표는 2_add_economics 단계가 동 단위 중력모형 접근성(없으면 구별_지표)으로 채움
+SUPPLY_COL = '공급부족_지표'
+FEATURE_COLS = ['노인인구수', SUPPLY_COL, '경제력_지수']
+SCORE_COL = '실시간_유망_지수'
+
+
+def normalize_score(values):
+    # 1~10점 스케일로 변환 (0점 방지 위해 1부터 시작, 모든 값이 같으면 1점, 결측은 결측 그대로)
+    values = np.asarray(values, dtype=np.float64)
+    if np.isnan(values).all():
+        return values
+    min_val = np.nanmin(values)
+    max_val = np.nanmax(values)
+    if max_val == min_val:
+        return np.ones_like(values)
+    return 1 + (values - min_val) / (max_val - min_val) * 9
+
+
+def log_features(df, feature_cols=FEATURE_COLS):
+    # (행 수, 지표 수) 로그 정규화 점수 행렬
+    return np.column_stack([np.log(normalize_score(df[col].to_numpy())) for col in feature_cols])
+
+
+def weight_vector(pop_weight, econ_weight):
+    return np.array([pop_weight, 1.0, econ_weight], dtype=np.float64)
+
+
+def weight_matrix(pop_weights, econ_weights):
+    # (지표 수, 조합 수) 가중치 행렬: 열 순서는 인구 가중치 바깥, 경제력 가중치 안쪽 루프
+    pop, econ = np.meshgrid(pop_weights, econ_weights, indexing='ij')
+    return np.vstack([pop.ravel(), np.ones(pop.size), econ.ravel()])
+
+
+def in_scoring_scope(df):
+    # 대시보드 스코어링 대상: 동 단위 행 중 경제력 데이터가 있고 공급부족 지표를 계산한 지역
+    # (중심점이 없어 접근성을 구하지 못한 동은 공급부족 지표가 결측)
+    return df['읍면동'].notna() & (df['읍면동'] != '') & (df['경제력_지수'] > 0) & df[SUPPLY_COL].notna()
+
+
+class ScoringEngine:
+    def __init__(self, df, group_col='시도', feature_cols=FEATURE_COLS):
+        # group_col=None 이면 전체를 하나의 그룹으로 정규화
+        self.df = df.reset_index(drop=True)
+        self.group_col = group_col
+        self.feature_cols = list(feature_cols)
+        self._groups = {}
+
+        if group_col is None:
+            positions = {None: np.arange(len(self.df))}
+        else:
+            positions = self.df.groupby(group_col, observed=True, sort=False).indices
+        for group, rows in positions.items():
+            rows = np.asarray(rows, dtype=np.int64)
+            self._groups[group] = (rows, log_features(self.df.iloc[rows], self.feature_cols))
+
+    @property
+    def groups(self):
+        return list(self._groups)
+
+    def has_group(self, group):
+        return group in self._groups
+
+    def log_scores(self, group, pop_weight=1.0, econ_weight=1.0):
+        _, features = self._groups[group]
+        return features @ weight_vector(pop_weight, econ_weight)
+
+    def log_score_matrix(self, group, weights):
+        # 여러 가중치 조합(weight_matrix 의 열)을 행렬 곱 한 번으로 → (그룹 행 수, 조합 수)
+        _, features = self._groups[group]
+        return features @ weights
+
+    def group_rows(self, group):
+        # 그룹 행의 self.df 내 위치
+        return self._groups[group][0]
+
+    def scores(self, group, pop_weight=1.0, econ_weight=1.0):
+        return np.exp(self.log_scores(group, pop_weight, econ_weight))
+
+    def frame(self, group, pop_weight=1.0, econ_weight=1.0, score_col=SCORE_COL):
+        # 그룹 전체 행 + 점수 컬럼 (정렬하지 않음)
+        rows, _ = self._groups[group]
+        df = self.df.iloc[rows].copy()
+        df[score_col] = self.scores(group, pop_weight, econ_weight)
+        return df
+
+    def top_k_positions(self, group, k, pop_weight=1.0, econ_weight=1.0):
+        # 상위 k개 그룹 내 위치 (점수 내림차순) - 전체 정렬 없이 부분 선택
+        log_scores = self.log_scores(group, pop_weight, econ_weight)
+        k = min(k, len(log_scores))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), log_scores
+        top = np.argpartition(-log_scores, k - 1)[:k]
+        return top[np.argsort(-log_scores[top], kind='stable')], log_scores
+
+    def top_k(self, group, k, pop_weight=1.0, econ_weight=1.0, score_col=SCORE_COL):
+        rows, _ = self._groups[group]
+        top, log_scores = self.top_k_positions(group, k, pop_weight, econ_weight)
+        df = self.df.iloc[rows[top]].copy()
+        df[score_col] = np.exp(log_scores[top])
+        return df
+
+    def ranked(self, group, pop_weight=1.0, econ_weight=1.0, score_col=SCORE_COL):
+        # 전체 순위표 (필요할 때만 전체 정렬)
+        df = self.frame(group, pop_weight, econ_weight, score_col)
+        return df.sort_values(by=score_col, ascending=False)
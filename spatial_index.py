@@ -0,0 +1,123 @@
+# 평면 좌표(EPSG:5174, 미터 단위) 점들에 대한 격자(grid) 공간 인덱스
+# 점을 cell_size 크기의 격자 칸으로 묶어 정렬해두고, 질의점 주변 칸만 확인하므로
+# 모든 치과 × 모든 동 거리 계산(brute-force) 없이 반경 내 점을 찾을 수 있습니다.
+# 여러 질의점·여러 반경을 한 번에 처리하도록 전부 NumPy 벡터 연산으로 작성했습니다.
+import numpy as np
+
+DEFAULT_CELL_SIZE = 500.0
+
+
+class GridIndex:
+    def __init__(self, x, y, cell_size=DEFAULT_CELL_SIZE):
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        valid = np.isfinite(x) & np.isfinite(y)
+
+        self.cell_size = float(cell_size)
+        # 좌표가 없는 점은 인덱스에서 제외하고, 원래 위치(ids)를 기억
+        self.ids = np.flatnonzero(valid)
+        self.x = x[valid]
+        self.y = y[valid]
+        if len(self.x):
+            self.origin = (self.x.min(), self.y.min())
+        else:
+            self.origin = (0.0, 0.0)
+
+        keys = self._cell_keys(*self._cells(self.x, self.y))
+        order = np.argsort(keys, kind='stable')
+        self.ids = self.ids[order]
+        self.x = self.x[order]
+        self.y = self.y[order]
+        self.cell_keys, self.cell_start, self.cell_count = np.unique(
+            keys[order], return_index=True, return_counts=True
+        )
+
+    def __len__(self):
+        return len(self.x)
+
+    def _cells(self, x, y):
+        cx = np.floor((x - self.origin[0]) / self.cell_size).astype(np.int64)
+        cy = np.floor((y - self.origin[1]) / self.cell_size).astype(np.int64)
+        return cx, cy
+
+    @staticmethod
+    def _cell_keys(cx, cy):
+        # 음수 칸(원점 밖 질의점)도 겹치지 않도록 오프셋을 더해 하나의 정수 키로 합침
+        return (cx + (1 << 31)) * (1 << 32) + (cy + (1 << 31))
+
+    def neighbors(self, qx, qy, radius):
+        # 반경 안의 (질의 번호, 점 번호, 거리) 쌍을 반환 (점 번호는 생성 시 입력 배열 기준)
+        qx = np.asarray(qx, dtype=np.float64)
+        qy = np.asarray(qy, dtype=np.float64)
+        q_valid = np.flatnonzero(np.isfinite(qx) & np.isfinite(qy))
+        empty = (np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.float64))
+        if len(self) == 0 or len(q_valid) == 0:
+            return empty
+
+        qcx, qcy = self._cells(qx[q_valid], qy[q_valid])
+        reach = int(np.ceil(radius / self.cell_size))
+
+        q_parts, p_parts, d_parts = [], [], []
+        for dx in range(-reach, reach + 1):
+            for dy in range(-reach, reach + 1):
+                keys = self._cell_keys(qcx + dx, qcy + dy)
+                pos = np.searchsorted(self.cell_keys, keys)
+                pos_clipped = np.minimum(pos, len(self.cell_keys) - 1)
+                hit = self.cell_keys[pos_clipped] == keys
+                if not hit.any():
+                    continue
+
+                # 질의점마다 길이가 다른 칸 구간을 한 번에 펼침 (ragged gather)
+                q_hit = q_valid[hit]
+                starts = self.cell_start[pos_clipped[hit]]
+                counts = self.cell_count[pos_clipped[hit]]
+                q_rep = np.repeat(q_hit, counts)
+                offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+                p_idx = np.repeat(starts, counts) + offsets
+
+                dist = np.hypot(self.x[p_idx] - qx[q_rep], self.y[p_idx] - qy[q_rep])
+                within = dist <= radius
+                q_parts.append(q_rep[within])
+                p_parts.append(p_idx[within])
+                d_parts.append(dist[within])
+
+        if not q_parts:
+            return empty
+        q_all = np.concatenate(q_parts)
+        p_all = np.concatenate(p_parts)
+        d_all = np.concatenate(d_parts)
+        return q_all, self.ids[p_all], d_all
+
+    def candidate_counts(self, qx, qy, radius):
+        # 질의점별로 neighbors 가 거리를 계산하게 될 점 수 (반경을 덮는 칸들의 점 수 합, 실제 반경 내 점 수의 상한)
+        # 쌍을 만들지 않고 칸별 개수만 더하므로 메모리 예산에 맞춰 질의점을 나눌 때 사용
+        qx = np.asarray(qx, dtype=np.float64)
+        qy = np.asarray(qy, dtype=np.float64)
+        counts = np.zeros(len(qx), dtype=np.int64)
+        q_valid = np.flatnonzero(np.isfinite(qx) & np.isfinite(qy))
+        if len(self) == 0 or len(q_valid) == 0:
+            return counts
+
+        qcx, qcy = self._cells(qx[q_valid], qy[q_valid])
+        reach = int(np.ceil(radius / self.cell_size))
+        for dx in range(-reach, reach + 1):
+            for dy in range(-reach, reach + 1):
+                keys = self._cell_keys(qcx + dx, qcy + dy)
+                pos = np.minimum(np.searchsorted(self.cell_keys, keys), len(self.cell_keys) - 1)
+                hit = self.cell_keys[pos] == keys
+                counts[q_valid[hit]] += self.cell_count[pos[hit]]
+        return counts
+
+    def count_within(self, qx, qy, radii, block_size=4096):
+        # 질의점별·반경별 점 개수 → (질의점 수, 반경 수) 배열
+        # 가장 큰 반경으로 한 번만 탐색하고, 질의점을 block_size 단위로 나눠 메모리를 제한
+        qx = np.atleast_1d(np.asarray(qx, dtype=np.float64))
+        qy = np.atleast_1d(np.asarray(qy, dtype=np.float64))
+        radii = np.atleast_1d(np.asarray(radii, dtype=np.float64))
+        counts = np.zeros((len(qx), len(radii)), dtype=np.int64)
+        for start in range(0, len(qx), block_size):
+            end = min(start + block_size, len(qx))
+            q_idx, _, dist = self.neighbors(qx[start:end], qy[start:end], radii.max())
+            for j, r in enumerate(radii):
+                counts[start:end, j] = np.bincount(q_idx[dist <= r], minlength=end - start)
+        return counts
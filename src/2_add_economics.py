@@ -1,114 +1,111 @@
-import pandas as pd
 import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import profiling
+from data_store import load_table, save_table, table_exists
+from dong_mapping import MAPPING_COLS, attach_legal_values, build_mapping, legal_pairs
+from housing_ingest import STATS_KEYS, STATS_TABLE
+from percentile_rank import add_percentile_ranks, quantile_thresholds
+from quantile_sketch import QUANTILE_COLS, QUANTILES, SKETCH_PATH, SketchSet
+from region_dim import CODE_COL, UNKNOWN_CODE
+from scoring_engine import FEATURE_COLS, SUPPLY_COL, ScoringEngine, in_scoring_scope, normalize_score
 
 def add_economic_data():
-    # 1. 경로 설정
-    raw_dir = 'data_raw'
-    processed_dir = 'data_processed'
-    ranking_path = os.path.join(processed_dir, 'final_ranking_v2.csv')
-    seoul_housing = os.path.join(raw_dir, 'seoul_housing.csv')
-    gyeonggi_housing = os.path.join(raw_dir, 'gyeonggi_housing.csv')
-    output_path = os.path.join(processed_dir, 'final_ranking_v3_economic.csv')
-
-    if not os.path.exists(ranking_path):
+    # 1. 입력 확인
+    if not table_exists('final_ranking_v2'):
         print("기존 분석 결과(v2)가 없습니다.")
         return
+    if not table_exists(STATS_TABLE):
+        print("실거래 집계가 없습니다. housing_ingest.py 를 먼저 실행해주세요.")
+        return
 
-    # 2. 아파트 실거래가 데이터 로드 및 병합
-    print("하우징 데이터 로드 중...")
-    def load_housing(path):
-        # 국토교통부 데이터 보충: 보통 15줄 정도가 안내 문구임
-        df = pd.read_csv(path, encoding='cp949', skiprows=15)
-        return df
-
-    df_seoul = load_housing(seoul_housing)
-    df_gyeonggi = load_housing(gyeonggi_housing)
-    df_housing = pd.concat([df_seoul, df_gyeonggi], ignore_index=True)
-
-    # 3. 데이터 전처리
-    print("하우징 데이터 전처리 중...")
-    # 거래금액(만원) 숫자 변환
-    df_housing['거래금액(만원)'] = df_housing['거래금액(만원)'].astype(str).str.replace(',', '').astype(int)
-    
-    # 평당가격 계산 (전용면적당 가격 * 3.3)
-    df_housing['평당가격'] = df_housing['거래금액(만원)'] / (df_housing['전용면적(㎡)'] / 3.3)
-
-    # 주소 파싱 (시군구 컬럼: "서울특별시 강남구 개포동")
-    # ranking 데이터의 '시도', '시군구', '읍면동'과 맞춰야 함
-    def parse_addr(full_addr):
-        parts = full_addr.split()
-        sido = parts[0] if len(parts) > 0 else ''
-        # 시군구가 두 단어인 경우 고려 (예: 수원시 팔달구)
-        if len(parts) == 3:
-            sigungu = parts[1]
-            dong = parts[2]
-        elif len(parts) >= 4:
-            sigungu = ' '.join(parts[1:-1])
-            dong = parts[-1]
-        else:
-            sigungu = ''
-            dong = ''
-        return pd.Series([sido, sigungu, dong])
-
-    df_housing[['시도', '시군구_parsed', '읍면동_parsed']] = df_housing['시군구'].apply(parse_addr)
-
-    # 4. 동별 경제력 지표 산출
-    print("경제력 지표 산출 중...")
-    # 법정동 기준 평균가 계산
-    legal_dong_avg = df_housing.groupby(['시도', '시군구_parsed', '읍면동_parsed'])['평당가격'].mean().reset_index()
-    legal_dong_avg.columns = ['시도', '시군구', '읍면동_legal', '경제력_지수']
-
-    # 5. 기존 분석 결과와 병합 및 매칭 고도화
-    print("최종 데이터 병합 및 행정동-법정동 매칭 개선...")
-    df_ranking = pd.read_csv(ranking_path).fillna('')
-
-    # [매칭 로직 개선] 행정동(신정3동) -> 법정동(신정동) 변환 함수
-    import re
-    def get_base_dong(dong):
-        # 1. 숫자 및 '제', '.' 제거 (예: 신정3동 -> 신정동, 창제1동 -> 창동)
-        # 2. '동/면/읍'으로 끝나는 부분까지만 추출
-        base = re.sub(r'[0-9제\.]', '', dong)
-        return base
-
-    # 랭킹 데이터의 읍면동을 법정동 기준으로 변환한 임시 컬럼 생성
-    df_ranking['읍면동_base'] = df_ranking['읍면동'].apply(get_base_dong)
-
-    # 법정동 평균 데이터와 병합 (시도, 시군구, 법정동명으로 매칭)
-    df_final = pd.merge(
-        df_ranking, 
-        legal_dong_avg, 
-        left_on=['시도', '시군구', '읍면동_base'], 
-        right_on=['시도', '시군구', '읍면동_legal'], 
-        how='left'
-    )
+    # 2. 법정동별 경제력 지표 (housing_ingest 단계에서 누적 집계한 거래건수·평당가격 합계)
+    # 여러 법정동을 합쳐도 평균을 정확히 구할 수 있도록 합계로 보관되어 있음
+    print("법정동별 실거래 집계 로드 중...")
+    legal_stats = load_table(STATS_TABLE, columns=STATS_KEYS + ['거래건수', '평당가격_합'])
+    legal_stats = legal_stats.fillna({key: '' for key in STATS_KEYS}).astype({key: str for key in STATS_KEYS})
+
+    # 3. 기존 분석 결과와 병합 (행정동 → 법정동 매핑 테이블 사용)
+    print("최종 데이터 병합 및 행정동-법정동 매칭...")
+    # 숫자 컬럼의 결측값은 유지하고 지역 컬럼만 빈 문자열로 채움 (Parquet 저장 시 타입 유지)
+    df_ranking = load_table('final_ranking_v2').fillna({'시군구': '', '읍면동': ''})
+    profiling.rows('v2', df_ranking)
+    profiling.rows('법정동 집계', legal_stats)
+
+    # 미리 만들어 둔 매핑 테이블이 없으면 현재 데이터로 즉석에서 생성
+    if table_exists('dong_mapping'):
+        mapping = load_table('dong_mapping').fillna({col: '' for col in MAPPING_COLS}).astype({col: str for col in MAPPING_COLS})
+    else:
+        print("매핑 테이블(dong_mapping)이 없어 즉석에서 생성합니다.")
+        admin_cols = [col for col in [CODE_COL, '시도', '시군구', '읍면동'] if col in df_ranking.columns]
+        admin_dongs = df_ranking[admin_cols].astype({col: str for col in ['시도', '시군구', '읍면동']})
+        admin_dongs = admin_dongs.rename(columns={'읍면동': '행정동'})
+        mapping = build_mapping(admin_dongs, legal_stats)
+
+    # 행정동 하나가 여러 법정동에 대응하면 거래건수 가중 평균
+    with profiling.step('경제력 결합'):
+        sums = attach_legal_values(df_ranking, mapping, legal_stats, '거래건수', ['평당가격_합'])
+        df_final = df_ranking.reset_index(drop=True)
+        df_final['경제력_지수'] = (sums['평당가격_합'] / sums['거래건수']).to_numpy()
+
+    matched = df_final['경제력_지수'].notna()
+    profiling.rows('경제력 매칭', int(matched.sum()))
+    print(f"경제력 지표 매칭: {matched.sum()} / {len(df_final)}개 동")
+
+    # 고가 거래 몇 건에 평균이 끌려가지 않도록 분위 스케치로 중앙값·분위수도 산출
+    # (행정동에 대응하는 법정동 스케치를 더한 뒤 분위수 계산)
+    if os.path.exists(SKETCH_PATH):
+        with profiling.step('분위 스케치'):
+            sketches = SketchSet.load(SKETCH_PATH)
+            pairs = legal_pairs(df_ranking, mapping)
+            counts = sketches.grouped_counts(pairs['_row'], sketches.positions(pairs), len(df_final))
+            quantiles = sketches.quantiles(QUANTILES, counts)
+            for j, col in enumerate(QUANTILE_COLS):
+                df_final[col] = quantiles[:, j]
+
+    # 공급부족 지표: 동 단위 중력모형 접근성(accessibility 단계, 동 중심점 파일이 있을 때만)이 있으면 사용,
+    # 없으면 구 단위 구별_지표. 중심점이 없는 동·구 합계 행은 결측으로 남겨 스코어링 대상에서 빠짐
+    # (동 중심점 위도·경도는 대시보드 지도에 사용)
+    access = None
+    if table_exists('dong_accessibility'):
+        access = load_table('dong_accessibility', columns=[CODE_COL, '접근성_지수', '접근성_공급부족', '위도', '경도'])
+        access = access[(access[CODE_COL] != UNKNOWN_CODE) & access['접근성_공급부족'].notna()]
+    if access is not None and len(access):
+        df_final = profiling.merge(df_final, access, name='v2×동별접근성', on=CODE_COL, how='left')
+        df_final[SUPPLY_COL] = df_final['접근성_공급부족']
+        is_dong = df_final['읍면동'] != ''
+        print(f"공급부족 지표: 동 단위 중력모형 접근성 (중심점이 없어 제외되는 동 {int((is_dong & df_final[SUPPLY_COL].isna()).sum())}개)")
+    else:
+        df_final[SUPPLY_COL] = df_final['구별_지표']
+        print("접근성 결과(dong_accessibility)가 없어 공급부족 지표로 구별_지표를 사용합니다.")
 
     # 데이터가 없는 곳은 0으로 처리 (사용자 요청: 외부 검색 데이터 배제)
     df_final['경제력_지수'] = df_final['경제력_지수'].fillna(0)
-    
-    # 임시 컬럼 정리
-    df_final = df_final.drop(columns=['읍면동_base', '읍면동_legal'])
+    for col in QUANTILE_COLS:
+        if col in df_final.columns:
+            df_final[col] = df_final[col].fillna(0)
 
-    # 6. 최종 스코어링 업데이트 (Streamlit 앱과 동일 로직 적용)
-    print("스코어링 로직 고도화 적용 중...")
-    
-    def normalize_score(col_series):
-        min_val = col_series.min()
-        max_val = col_series.max()
-        # 1~10점 스케일로 변환
-        return 1 + (col_series - min_val) / (max_val - min_val) * 9
-
-    # 각 지표 정규화 (1~10점)
-    df_final['노인인구_점수'] = normalize_score(df_final['노인인구수'])
-    df_final['공급부족_점수'] = normalize_score(df_final['구별_지표']) # 구별_지표는 '구별_치과수' 대비 인구 등을 의미한다고 가정
-    df_final['경제력_점수'] = normalize_score(df_final['경제력_지수'])
-
-    # 가중치 설정 (기본값: 노인 1.0, 경제력 1.0)
+    # 4. 최종 스코어링 (대시보드·순위 서비스와 같은 스코어링 엔진, 전국 단위 정규화, 가중치 1.0)
     # Score = (Pop^1.0) * (Comp^1.0) * (Econ^1.0)
-    df_final['Total_Score'] = (df_final['노인인구_점수'] ** 1.0) * (df_final['공급부족_점수'] ** 1.0) * (df_final['경제력_점수'] ** 1.0)
-
-    # 7. 결과 저장 및 출력
+    print("스코어링 로직 고도화 적용 중...")
+    for col, score_col in zip(FEATURE_COLS, ['노인인구_점수', '공급부족_점수', '경제력_점수']):
+        df_final[score_col] = normalize_score(df_final[col])
+    df_final['Total_Score'] = ScoringEngine(df_final, group_col=None).scores(None)
+
+    # 5. 시도별 백분위 순위·분위 기준값 (대시보드와 같은 대상: 동 단위, 경제력 데이터가 있는 지역)
+    with profiling.step('백분위'):
+        in_scope = in_scoring_scope(df_final)
+        profiling.rows('스코어링 대상', int(in_scope.sum()))
+        ranked = add_percentile_ranks(df_final[in_scope])
+        df_final = df_final.join(ranked.drop(columns=df_final.columns))
+        thresholds = quantile_thresholds(df_final[in_scope])
+        save_table(thresholds, 'percentile_thresholds')
+
+    # 6. 결과 저장 및 출력
     df_final = df_final.sort_values(by='Total_Score', ascending=False)
-    df_final.to_csv(output_path, index=False, encoding='utf-8-sig')
+    output_path = save_table(df_final, 'final_ranking_v3_economic')
+    profiling.rows('출력', df_final)
     
     print("\n--- [경제력 반영 최종 유망 입지 TOP 20 (v3)] ---")
     cols = ['시도', '시군구', '읍면동', '노인인구수', '구별_치과수', '경제력_지수', 'Total_Score']
@@ -1,8 +1,35 @@
 # 실행 방법: 터미널에서 `streamlit run src/app.py` 입력
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
+import pydeck as pdk
 import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analyze_radius_competition import CENTROID_PATH
+from data_store import load_table, table_columns, table_exists
+from percentile_rank import quantile_thresholds, threshold_lookup
+from population_cube import CUBE_PATH, MAX_AGE, PopulationCube
+from quantile_sketch import QUANTILE_COLS
+from region_dim import CODE_COL
+from scoring_engine import SUPPLY_COL, ScoringEngine, in_scoring_scope
+from weight_sweep import SWEEP_PATH, WeightSweep, top_k_rows
+
+# 대시보드에서 사용하는 컬럼 (필요한 컬럼만 로드하여 시작 시간과 메모리 절약)
+# 공급부족_지표: 동 단위 중력모형 접근성 기준 (접근성 결과가 없으면 구별_지표), 구별_지표는 구별 막대 차트용
+APP_COLUMNS = ['시도', '시군구', '읍면동', '노인인구수', SUPPLY_COL, '구별_지표', '경제력_지수']
+# 경제력 지표 선택지 (분위 스케치 컬럼은 파이프라인 결과에 있을 때만 표시)
+ECON_OPTIONS = {'경제력_지수': '평균 평당가격', '평당가격_중앙값': '중앙값 평당가격 (고가 거래 영향 적음)'}
+DEFAULT_ECON = '경제력_지수'
+# 산점도 점 수 상한 (넘으면 상위 점수 지역은 모두 남기고 나머지를 표본 추출), WebGL 전환 기준
+MAX_SCATTER_POINTS = 5000
+KEEP_TOP_POINTS = 1000
+WEBGL_MIN_POINTS = 1000
+# 지도: TOP 10 동을 감싸는 영역(여백 포함)의 치과만 격자로 솎아 점 수 상한 이하로 표시
+MAX_MAP_POINTS = 3000
+MAP_MARGIN_DEG = 0.02
 
 # 페이지 설정
 st.set_page_config(page_title="치과 개원 유망 지역 분석 대시보드 V3.1", layout="wide")
@@ -11,15 +38,213 @@ try:
     # 데이터 로드 함수
     @st.cache_data
     def load_data():
-        path = 'data_processed/final_ranking_v3_economic.csv'
-        if not os.path.exists(path):
+        if not table_exists('final_ranking_v3_economic'):
             return None
-        df = pd.read_csv(path)
+        available = table_columns('final_ranking_v3_economic')
+        optional = [c for c in [CODE_COL, '위도', '경도'] + QUANTILE_COLS if c in available]
+        columns = [c for c in APP_COLUMNS if c in available or c != SUPPLY_COL]
+        df = load_table('final_ranking_v3_economic', columns=columns + optional)
+        # 공급부족_지표가 생기기 전에 만든 결과 파일은 구별_지표로 대신함
+        if SUPPLY_COL not in df.columns:
+            df[SUPPLY_COL] = df['구별_지표']
         # 데이터 정제: 읍면동이 없는 구 합계 행 등은 제외하고 동 단위만 보기
         df = df[df['읍면동'].notna() & (df['읍면동'] != '')]
+        # 인구 큐브의 지역 위치를 미리 계산해두어 연령대·월 변경 시 배열 인덱싱만 수행
+        cube = load_population_cube()
+        if cube is not None:
+            df = df.assign(큐브_위치=cube.region_index(df))
         return df
 
+    # 지역 × 월 × 연령 누적합 큐브 (없으면 파이프라인의 65세 이상 노인인구수 사용)
+    @st.cache_resource
+    def load_population_cube():
+        if not os.path.exists(CUBE_PATH):
+            return None
+        return PopulationCube.load(CUBE_PATH)
+
+    # 스코어링 엔진: 시도별 로그 정규화 지표를 한 번만 계산해두고 슬라이더 변경 시 재사용
+    # (연령대·기준 월·경제력 기준이 바뀌면 지표가 달라지므로 그 조합별로 캐시)
+    @st.cache_resource(max_entries=16)
+    def get_engine(age_band=None, econ_col=DEFAULT_ECON):
+        df = load_data()
+        if age_band is not None:
+            age_min, age_max, month = age_band
+            band_pop = load_population_cube().band(age_min, age_max, month)
+            cube_pos = df['큐브_위치'].to_numpy()
+            df['노인인구수'] = np.where(cube_pos >= 0, band_pop[cube_pos], df['노인인구수'])
+        # 선택한 경제력 기준을 '경제력_지수' 자리에 넣어 이후 화면 로직은 그대로 사용
+        if econ_col != DEFAULT_ECON:
+            df['경제력_지수'] = df[econ_col]
+        # 데이터 필터링 (경제력 데이터가 0인 지역은 제외)
+        df = df[in_scoring_scope(df)]
+        return ScoringEngine(df, group_col='시도')
+
+    # 가중치 스윕 순위표 (파이프라인 weight_sweep 단계 결과, 기본 연령대 엔진과 행 순서가 같을 때만 사용)
+    @st.cache_resource
+    def load_weight_sweep():
+        if not os.path.exists(SWEEP_PATH):
+            return None
+        sweep = WeightSweep.load(SWEEP_PATH)
+        if not sweep.matches(get_engine().df):
+            return None
+        return sweep
+
+    # 시도별 분위 기준값 {(시도, 지표, 분위): 값} (강점 배지 판정용)
+    # 기본 연령대는 파이프라인이 만든 표를 그대로 쓰고, 연령대를 바꾸면 엔진 데이터로 한 번만 계산
+    @st.cache_data(max_entries=16)
+    def get_thresholds(age_band=None, econ_col=DEFAULT_ECON):
+        if age_band is None and econ_col == DEFAULT_ECON and table_exists('percentile_thresholds'):
+            return threshold_lookup(load_table('percentile_thresholds'))
+        return threshold_lookup(quantile_thresholds(get_engine(age_band, econ_col).df))
+
+    # 상세 데이터 순위표 (정렬된 전체 순위를 받아 표시)
+    def render_ranking_table(ranked_df):
+        display_df = ranked_df[['시군구', '읍면동', '노인인구수', SUPPLY_COL, '경제력_지수', '실시간_유망_지수']].copy()
+        display_df['경제력_지수'] = display_df['경제력_지수'] / 1000 # 천만원 단위
+        
+        # 보기 좋게 컬럼 정규화 점수도 보여줄까요? 아니면 원본? 사용자는 원본을 선호함.
+        display_df.columns = ['시군구', '읍면동', '노인인구(명)', '공급부족도', '평단가(천만)', '유망지수']
+
+        st.dataframe(
+            display_df,
+            column_config={
+                "유망지수": st.column_config.NumberColumn(
+                    "🎨 유망지수", 
+                    format="%.0f",
+                    help="노인 인구, 치과 공급, 경제력을 종합적으로 계산한 최종 입지 점수입니다."
+                ),
+                "공급부족도": st.column_config.NumberColumn(
+                    "공급부족도",
+                    format="%.0f",
+                    help="동 중심에서 거리가 가까울수록 크게 반영한 치과 의료인 수 대비 노인 인구수입니다. 값이 클수록 경쟁이 낮고 수요가 많음을 의미합니다."
+                ),
+                "노인인구(명)": st.column_config.NumberColumn("👴 노인", format="%d"),
+                "평단가(천만)": st.column_config.ProgressColumn(
+                    "💰 평단가", 
+                    min_value=0, 
+                    max_value=int(display_df['평단가(천만)'].max()), 
+                    format="%.1f"
+                ),
+            },
+            hide_index=True,
+            use_container_width=True
+        )
+
+    def downsample_points(df, score_col, max_points=MAX_SCATTER_POINTS, keep_top=KEEP_TOP_POINTS, seed=0):
+        # 점이 너무 많으면 점수 상위 keep_top 개는 그대로 두고 나머지에서 고정 seed로 균등 추출
+        if len(df) <= max_points:
+            return df
+        order = np.argsort(-df[score_col].to_numpy(), kind='stable')
+        rest = np.random.default_rng(seed).choice(order[keep_top:], max_points - keep_top, replace=False)
+        return df.iloc[np.sort(np.concatenate([order[:keep_top], rest]))]
+
+    # 경제력 vs 공급부족도 산점도 (시도·가중치·연령대·경제력 기준 조합별로 캐시, 오래된 조합부터 제거)
+    @st.cache_data(max_entries=64)
+    def build_scatter(target_sido, pop_weight, econ_weight, age_band=None, econ_col=DEFAULT_ECON):
+        engine = get_engine(age_band, econ_col)
+        df_all = engine.frame(target_sido, pop_weight, econ_weight)
+        df = downsample_points(df_all, '실시간_유망_지수')
+        # 점이 많으면 SVG 대신 WebGL로 그림 (점 테두리는 WebGL에서 비용이 커서 SVG일 때만 사용)
+        webgl = len(df) > WEBGL_MIN_POINTS
+        fig = px.scatter(
+            df,
+            x='경제력_지수',
+            y=SUPPLY_COL,
+            color='실시간_유망_지수',
+            hover_name='읍면동',
+            hover_data={
+                '경제력_지수': ':.0f',
+                SUPPLY_COL: ':.0f',
+                '노인인구수': ':,.0f',
+                '실시간_유망_지수': ':.0f'
+            },
+            labels={
+                '경제력_지수': '아파트 평단가 (만원)',
+                SUPPLY_COL: '접근 가능 의료인 대비 노인 인구 (수요)',
+                '실시간_유망_지수': '유망 점수'
+            },
+            template='plotly_white',
+            color_continuous_scale='Viridis',
+            opacity=0.7,  # 투명도 조절로 겹침 시인성 확보
+            render_mode='webgl' if webgl else 'svg'
+        )
+
+        # 점 크기 고정 및 테두리 추가로 시인성 강화
+        if webgl:
+            fig.update_traces(marker=dict(size=8))
+        else:
+            fig.update_traces(marker=dict(size=12, line=dict(width=1, color='DarkSlateGrey')))
+        return fig, len(df), len(df_all)
+
+    # 치과 위치 (전처리에서 변환해 둔 WGS84 위도·경도, 없으면 None)
+    @st.cache_data
+    def load_clinic_points():
+        if not table_exists('dental_preprocessed') or '위도' not in table_columns('dental_preprocessed'):
+            return None
+        df = load_table('dental_preprocessed', columns=['병원명', '위도', '경도']).dropna(subset=['위도', '경도'])
+        return df.rename(columns={'병원명': 'name', '위도': 'lat', '경도': 'lon'}).reset_index(drop=True)
+
+    def thin_points(df, bounds, max_points=MAX_MAP_POINTS):
+        # 화면 영역 밖의 점은 버리고, 남은 점이 많으면 영역을 약 max_points 개 격자 칸으로 나눠 칸마다 한 점만 남김
+        lat_min, lat_max, lon_min, lon_max = bounds
+        df = df[df['lat'].between(lat_min, lat_max) & df['lon'].between(lon_min, lon_max)]
+        if len(df) <= max_points:
+            return df
+        side = int(np.sqrt(max_points))
+        row = np.minimum(((df['lat'].to_numpy() - lat_min) / (lat_max - lat_min) * side).astype(np.int64), side - 1)
+        col = np.minimum(((df['lon'].to_numpy() - lon_min) / (lon_max - lon_min) * side).astype(np.int64), side - 1)
+        _, first = np.unique(row * side + col, return_index=True)
+        return df.iloc[np.sort(first)]
+
+    # TOP 10 동과 주변 치과 지도 (점은 GPU로 그리는 ScatterplotLayer, 같은 영역이면 솎아낸 치과 재사용)
+    @st.cache_data(max_entries=64)
+    def map_clinics(bounds):
+        clinics = load_clinic_points()
+        return None if clinics is None else thin_points(clinics, bounds)
+
+    def build_map(top_df):
+        dongs = top_df.dropna(subset=['위도', '경도'])
+        if dongs.empty:
+            return None, 0, 0
+        dongs = pd.DataFrame({
+            'name': dongs['시군구'].astype(str) + ' ' + dongs['읍면동'].astype(str),
+            'rank': [str(i + 1) for i in dongs.index],  # top_df 는 순위 순서로 0부터 번호가 매겨진 표
+            'lat': dongs['위도'].to_numpy(),
+            'lon': dongs['경도'].to_numpy(),
+        })
+        bounds = (round(dongs['lat'].min() - MAP_MARGIN_DEG, 4), round(dongs['lat'].max() + MAP_MARGIN_DEG, 4),
+                  round(dongs['lon'].min() - MAP_MARGIN_DEG, 4), round(dongs['lon'].max() + MAP_MARGIN_DEG, 4))
+        clinics = map_clinics(bounds)
+        layers = []
+        if clinics is not None:
+            layers.append(pdk.Layer(
+                'ScatterplotLayer', data=clinics, get_position='[lon, lat]', get_radius=40,
+                radius_min_pixels=2, get_fill_color=[90, 90, 90, 150], pickable=True,
+            ))
+        layers.append(pdk.Layer(
+            'ScatterplotLayer', data=dongs, get_position='[lon, lat]', get_radius=400,
+            radius_min_pixels=8, get_fill_color=[255, 75, 75, 200], pickable=True,
+        ))
+        layers.append(pdk.Layer(
+            'TextLayer', data=dongs, get_position='[lon, lat]', get_text='rank', get_size=14,
+            get_color=[255, 255, 255], get_alignment_baseline="'center'",
+        ))
+        # 영역 전체가 보이는 확대 수준 (경도 360도가 화면 폭 한 장인 0단계부터 절반씩)
+        span = max(bounds[3] - bounds[2], (bounds[1] - bounds[0]) * 1.3)
+        view = pdk.ViewState(latitude=(bounds[0] + bounds[1]) / 2, longitude=(bounds[2] + bounds[3]) / 2,
+                             zoom=float(np.clip(np.log2(360 / span), 5, 14)))
+        deck = pdk.Deck(layers=layers, initial_view_state=view, map_style=None, tooltip={'text': '{name}'})
+        return deck, len(dongs), 0 if clinics is None else len(clinics)
+
+    # 구별 공급 부족도 (가중치·연령대와 무관하므로 시도·경제력 기준별로만 캐시)
+    @st.cache_data(max_entries=64)
+    def get_gu_intensity(target_sido, econ_col=DEFAULT_ECON):
+        engine = get_engine(None, econ_col)
+        df = engine.df.iloc[engine.group_rows(target_sido)]
+        return df.groupby('시군구', observed=True)['구별_지표'].first().sort_values(ascending=False)
+
     df_raw = load_data()
+    cube = load_population_cube()
 
     if df_raw is None:
         st.error("분석 결과 파일(final_ranking_v3_economic.csv)을 찾을 수 없습니다. 고도화 코드를 먼저 실행해주세요.")
@@ -54,39 +279,53 @@ try:
             help="아파트 평당 가격이 높은 지역의 가점을 조절합니다."
         )
 
-        # 전체 경제력 평균 산출 (기준값)
-        # avg_econ = df_raw[df_raw['경제력_지수'] > 0]['경제력_지수'].mean() # 구 로직 사용 안함
+        # 경제력 기준 (평균은 고가 거래 몇 건에 크게 흔들리므로 중앙값 선택 가능)
+        econ_col = DEFAULT_ECON
+        econ_choices = [col for col in ECON_OPTIONS if col in df_raw.columns]
+        if len(econ_choices) > 1:
+            econ_col = st.sidebar.radio(
+                "🏠 경제력 기준",
+                options=econ_choices,
+                format_func=lambda x: ECON_OPTIONS[x],
+                index=0
+            )
+
+        # 타겟 연령대 및 기준 월 (큐브에서 바로 계산하므로 전처리 재실행 불필요)
+        age_band = None
+        age_label = "65세 이상"
+        if cube is not None and '큐브_위치' in df_raw.columns:
+            age_min, age_max = st.sidebar.slider(
+                "🎂 타겟 연령대",
+                min_value=0,
+                max_value=MAX_AGE,
+                value=(65, MAX_AGE),
+                step=1,
+                help=f"{MAX_AGE}세는 '{MAX_AGE}세 이상'을 포함합니다. 선택한 연령대 인구가 '노인 인구' 점수에 사용됩니다."
+            )
+            age_label = f"{age_min}세 이상" if age_max == MAX_AGE else f"{age_min}~{age_max}세"
+            target_month = cube.months[-1]
+            if len(cube.months) > 1:
+                target_month = st.sidebar.select_slider("📅 기준 월", options=cube.months, value=target_month)
+
+            # 기본값(65세 이상, 최근 월)은 파이프라인 결과와 같으므로 큐브를 거치지 않음
+            if (age_min, age_max, target_month) != (65, MAX_AGE, cube.months[-1]):
+                age_band = (age_min, age_max, target_month)
 
-        # 데이터 필터링 (경제력 데이터가 0인 지역은 제외)
-        df = df_raw[(df_raw['시도'] == target_sido) & (df_raw['경제력_지수'] > 0)].copy()
-        
         # --- 스코어링 로직 고도화 ---
         # 문제점 해결: 단순 곱셈 가중치는 순위에 영향을 주지 않음 (A*W > B*W == A > B)
-        # 해결책: Min-Max 정규화(0~10점) 후 지수(Exponent)가중치 방식 적용 (기하평균 응용)
-        
-        def normalize_score(col_series):
-            min_val = col_series.min()
-            max_val = col_series.max()
-            # 0으로 나누기 방지
-            if max_val == min_val:
-                return pd.Series([1] * len(col_series), index=col_series.index)
-                
-            # 1~10점 스케일로 변환 (0점 방지 위해 1부터 시작)
-            return 1 + (col_series - min_val) / (max_val - min_val) * 9
-
-        # 각 지표 정규화 (1~10점)
-        if not df.empty:
-            norm_pop = normalize_score(df['노인인구수'])
-            norm_comp = normalize_score(df['구별_지표'])
-            norm_econ = normalize_score(df['경제력_지수'])
-
-            # 최종 유망 지수 계산 (Cobb-Douglas 효용함수 형태)
-            # Score = (Pop^w1) * (Comp^1) * (Econ^w2)
-            # 가중치가 클수록 해당 지표가 높은 지역이 더 큰 점수 폭으로 상승함
-            df['실시간_유망_지수'] = (norm_pop ** pop_weight) * (norm_comp ** 1.0) * (norm_econ ** econ_weight)
-            
-            df = df.sort_values(by='실시간_유망_지수', ascending=False)
+        # 해결책: Min-Max 정규화(1~10점) 후 지수(Exponent)가중치 방식 적용 (기하평균 응용)
+        # 최종 유망 지수 (Cobb-Douglas 효용함수 형태): Score = (Pop^w1) * (Comp^1) * (Econ^w2)
+        # 가중치가 클수록 해당 지표가 높은 지역이 더 큰 점수 폭으로 상승함
+        engine = get_engine(age_band, econ_col)
+        thresholds = get_thresholds(age_band, econ_col)
+        sweep = load_weight_sweep() if age_band is None and econ_col == DEFAULT_ECON else None
+        if engine.has_group(target_sido):
+            has_data = True
+            # 슬라이더 격자 위의 가중치는 미리 계산된 순위표 조회, 그 외에는 엔진으로 계산 (ranking_service 와 같은 경로)
+            top_rows, top_scores = top_k_rows(engine, target_sido, 10, pop_weight, econ_weight, sweep)
+            top_10 = engine.df.iloc[top_rows].assign(실시간_유망_지수=top_scores)
         else:
+            has_data = False
             st.warning("선택하신 조건에 해당하는 데이터가 없습니다.")
 
         # 2. 메인 화면 타이틀
@@ -96,9 +335,9 @@ try:
         ### 🎯 분석 목적: **"프리미엄 시니어 타겟"** 최적 입지 선정
         이 대시보드는 단순한 인구수 분석을 넘어, 고부가가치 진료 수요가 높은 지역을 발굴하기 위해 설계되었습니다.
         
-        1. **65세 이상 노인 인구**: 핵심 타겟층인 시니어 인구의 밀집도를 분석합니다.
+        1. **{age_label} 인구**: 사이드바에서 선택한 타겟 연령대 인구의 밀집도를 분석합니다.
         2. **경제력 (아파트 평단가)**: 지역별 자산 가치를 통해 시니어 계층의 **구매력**을 간접 측정합니다.
-        3. **치과 공급 현황**: 지역 내 기존 치과 개수 대비 수요를 고려하여 경쟁이 낮은 블루오션을 찾습니다.
+        3. **치과 공급 현황**: 동에서 가까운 치과일수록 크게 반영한 치과 접근성 대비 수요를 고려하여 경쟁이 낮은 블루오션을 찾습니다.
         
         이를 종합하여 **임플란트, 틀니 등 프리미엄 진료에 가장 적합한 전략적 개원지**를 제안합니다.
         """)
@@ -123,11 +362,11 @@ try:
 
         st.markdown("---")
 
-        if not df.empty:
+        if has_data:
             # 3. TOP 10 유망 지역 랭킹 보드
             st.subheader(f"🏆 {target_sido} 개원 추천 TOP 10")
             
-            top_10 = df.head(10).reset_index()
+            top_10 = top_10.reset_index()
             
             for i, row in top_10.iterrows():
                 rank = i + 1
@@ -150,18 +389,21 @@ try:
                         score_val = row['실시간_유망_지수']
                         max_score = top_10['실시간_유망_지수'].max()
                         
-                        # 강점 분석 (상위 20% 기준)
+                        # 강점 분석 (상위 20% 기준, 미리 계산된 기준값 조회)
                         reasons = []
-                        if row['노인인구수'] >= df['노인인구수'].quantile(0.8):
+                        if row['노인인구수'] >= thresholds[(target_sido, '노인인구수', 0.8)]:
                             reasons.append("👵 시니어 밀집")
-                        if row['경제력_지수'] >= df['경제력_지수'].quantile(0.8):
+                        if row['경제력_지수'] >= thresholds[(target_sido, '경제력_지수', 0.8)]:
                             reasons.append("💰 고구매력 부촌")
-                        if row['구별_지표'] >= df['구별_지표'].quantile(0.8):
+                        if row[SUPPLY_COL] >= thresholds[(target_sido, SUPPLY_COL, 0.8)]:
                             reasons.append("🛡️ 낮은 경쟁도")
                         
                         # 우측 상단 메트릭 요약
                         c1, c2 = st.columns(2)
                         c1.markdown(f"**{int(row['노인인구수']):,}**명 / **{row['경제력_지수']/1000:.1f}**천만")
+                        # 순위 안정성: 전체 가중치 조합 중 TOP 10에 든 비율
+                        if sweep is not None:
+                            c2.caption(f"🔁 가중치 조합의 {sweep.top_ratio[row['index']]:.0%}에서 TOP 10 유지")
                         
                         # 강점 배지 표시
                         if reasons:
@@ -204,37 +446,27 @@ try:
             
             st.markdown("---")
 
+            # 지도: TOP 10 동(빨간 점, 숫자는 순위)과 주변 치과(회색 점)
+            # 동 위치는 동 중심점 파일에서 온 좌표만 사용 (파일이 없으면 지도를 그리지 않음)
+            if '위도' in top_10.columns and os.path.exists(CENTROID_PATH):
+                st.subheader("🗺️ TOP 10 위치와 주변 치과")
+                deck, n_dongs, n_clinics = build_map(top_10)
+                unplaced = len(top_10) - n_dongs
+                if deck is not None:
+                    st.pydeck_chart(deck, use_container_width=True)
+                    st.caption(f"※ 빨간 점(숫자는 순위)은 위치가 확인된 TOP 10 동 {n_dongs}곳의 중심, 회색 점은 주변 치과 {n_clinics:,}곳입니다. (밀집 지역은 격자 단위로 솎아 표시)"
+                               + (f" 중심점이 없어 표시하지 못한 동: {unplaced}곳" if unplaced else ""))
+                else:
+                    st.info(f"TOP 10 동 {len(top_10)}곳 모두 동 중심점 좌표가 없어 지도를 표시할 수 없습니다.")
+                st.markdown("---")
+            else:
+                st.caption(f"※ 동 중심점 파일({CENTROID_PATH})이 없어 TOP 10 위치 지도를 표시하지 않습니다.")
+
             # 4. 분석 시각화 Section
             st.subheader("📊 상세 데이터 순위")
-            display_df = df[['시군구', '읍면동', '노인인구수', '구별_지표', '경제력_지수', '실시간_유망_지수']].copy()
-            display_df['경제력_지수'] = display_df['경제력_지수'] / 1000 # 천만원 단위
-            
-            # 보기 좋게 컬럼 정규화 점수도 보여줄까요? 아니면 원본? 사용자는 원본을 선호함.
-            display_df.columns = ['시군구', '읍면동', '노인인구(명)', '구공급부족도', '평단가(천만)', '유망지수']
-
-            st.dataframe(
-                display_df,
-                column_config={
-                    "유망지수": st.column_config.NumberColumn(
-                        "🎨 유망지수", 
-                        format="%.0f",
-                        help="노인 인구, 치과 공급, 경제력을 종합적으로 계산한 최종 입지 점수입니다."
-                    ),
-                    "구공급부족도": st.column_config.NumberColumn(
-                        "구공급부족도",
-                        help="해당 구 전체의 치과 1개당 노인 인구수입니다. 값이 클수록 경쟁이 낮고 수요가 많음을 의미합니다."
-                    ),
-                    "노인인구(명)": st.column_config.NumberColumn("👴 노인", format="%d"),
-                    "평단가(천만)": st.column_config.ProgressColumn(
-                        "💰 평단가", 
-                        min_value=0, 
-                        max_value=int(display_df['평단가(천만)'].max()), 
-                        format="%.1f"
-                    ),
-                },
-                hide_index=True,
-                use_container_width=True
-            )
+            # 전체 정렬은 순위표를 펼칠 때만 수행
+            if st.toggle("전체 순위표 보기", value=False):
+                render_ranking_table(engine.ranked(target_sido, pop_weight, econ_weight))
 
             st.markdown("---")
 
@@ -242,37 +474,15 @@ try:
             st.info("""
             **분석 가이드:**
             - **X축 (오른쪽일수록)**: 아파트 평당 가격이 높아 **경제력(소비력)이 큰 지역**입니다.
-            - **Y축 (위쪽일수록)**: 치과 1개당 노인 인구가 많아 **경쟁이 낮고(공급부족) 잠재 수요가 큰 지역**입니다.
+            - **Y축 (위쪽일수록)**: 가까운 치과의 의료인 대비 노인 인구가 많아 **경쟁이 낮고(공급부족) 잠재 수요가 큰 지역**입니다.
             - **색상 (밝을수록)**: 위 요소들을 종합한 **최종 개원 유망 점수**가 높은 지역입니다.
             """)
 
-            # 산점도 개선
-            fig = px.scatter(
-                df,
-                x='경제력_지수',
-                y='구별_지표',
-                color='실시간_유망_지수',
-                hover_name='읍면동',
-                hover_data={
-                    '경제력_지수': ':.0f',
-                    '구별_지표': ':.0f',
-                    '노인인구수': ':,.0f',
-                    '실시간_유망_지수': ':.0f'
-                },
-                labels={
-                    '경제력_지수': '아파트 평단가 (만원)',
-                    '구별_지표': '치과 1개당 노인 인구 (수요)',
-                    '실시간_유망_지수': '유망 점수'
-                },
-                template='plotly_white',
-                color_continuous_scale='Viridis',
-                opacity=0.7  # 투명도 조절로 겹침 시인성 확보
-            )
-            
-            # 점 크기 고정 및 테두리 추가로 시인성 강화
-            fig.update_traces(marker=dict(size=12, line=dict(width=1, color='DarkSlateGrey')))
-            
+            # 산점도 (같은 조건이면 캐시된 그림 재사용)
+            fig, n_points, n_total = build_scatter(target_sido, pop_weight, econ_weight, age_band, econ_col)
             st.plotly_chart(fig, use_container_width=True)
+            if n_points < n_total:
+                st.caption(f"※ 전체 {n_total:,}개 동 중 유망 점수 상위 {KEEP_TOP_POINTS:,}개와 표본 {n_points - KEEP_TOP_POINTS:,}개를 표시합니다.")
             st.success("🎯 **우상향(오른쪽 위)**에 위치한 밝은(노란색) 점들이 가장 유망한 지역들입니다.")
 
             # 5. 구별 공급 부족도 (추가 지표)
@@ -280,7 +490,7 @@ try:
             st.subheader(f"📍 {target_sido} 구별 공급 부족도 (Potential Demand)")
             st.info("💡 **공급 부족도**란? 해당 구 전체의 **치과 1개당 노인 인구수**를 의미합니다. 막대가 길수록 치과 대비 노인 인구가 많아, 경쟁이 낮고 개원 시 잠재 수요가 높음을 뜻합니다.")
             
-            gu_intensity = df.groupby('시군구')['구별_지표'].first().sort_values(ascending=False)
+            gu_intensity = get_gu_intensity(target_sido, econ_col)
             
             # 막대 차트 생성
             st.bar_chart(gu_intensity, horizontal=True)
@@ -0,0 +1,204 @@
+# 벤치마크용 합성 원본 데이터 생성기
+# 실제 원본(LOCALDATA 치과, 행안부 연령별 인구, 국토교통부 아파트 실거래)과 같은 파일 형식·인코딩·컬럼으로
+# 전국 규모 데이터를 만들어 data_raw/ 에 저장합니다. 같은 seed·scale이면 항상 같은 파일이 만들어집니다.
+# - scale=1: 행정동 약 3,400개(실제 전국과 비슷), 치과 약 18,000곳, 실거래 월 40,000건
+# - scale=N: 시군구별 동 수·치과 수·실거래 건수가 N배
+import os
+
+import numpy as np
+import pandas as pd
+
+# 시군구가 없는 세종특별자치시는 주소 구조가 달라 제외
+SIDO_NAMES = [
+    '서울특별시', '부산광역시', '대구광역시', '인천광역시', '광주광역시', '대전광역시', '울산광역시',
+    '경기도', '강원특별자치도', '충청북도', '충청남도', '전북특별자치도',
+    '전라남도', '경상북도', '경상남도', '제주특별자치도',
+]
+# 동 이름 음절 (숫자·'제'·'가' 없이 조합해 행정동/법정동 매칭 규칙이 실제와 같이 동작하도록 함)
+SYLLABLES = list('신정상도목동원미화성청송문명남북서봉양천수진평안하은금월산광연영덕중대소구인용석')
+GU_PER_SIDO = 15
+DONG_PER_GU = 14
+CLINICS = 18000
+HOSPITALS = 300
+TRANSACTIONS_PER_MONTH = 40000
+MONTH = '2026년01월'
+MAX_AGE = 100
+
+DENTAL_HEADER = [
+    '개방서비스명', '개방자치단체코드', '관리번호', '인허가일자', '상세영업상태명', '폐업일자', '소재지우편번호',
+    '소재지전체주소', '도로명전체주소', '도로명우편번호', '사업장명', '업태구분명',
+    '좌표정보X(EPSG5174)', '좌표정보Y(EPSG5174)', '의료기관종별명', '의료인수', '입원실수', '병상수', '총면적',
+    '진료과목내용', '진료과목내용명',
+]
+HOUSING_HEADER = ['NO', '시군구', '번지', '단지명', '전용면적(㎡)', '계약년월', '계약일', '거래금액(만원)']
+
+
+def dong_stems(rng, n):
+    # 서로 다른 동 이름 어간 n개 (2음절 조합이 모자라면 3음절까지 사용)
+    two = [a + b for a in SYLLABLES for b in SYLLABLES if a != b]
+    stems = list(rng.permutation(two))
+    if n > len(stems):
+        stems += [s + c for s in two for c in SYLLABLES][: n - len(stems)]
+    return stems[:n]
+
+
+def build_regions(scale=1, seed=0):
+    # 시도/시군구/행정동/법정동 구조와 좌표 중심 (행 = 행정동)
+    rng = np.random.default_rng(seed)
+    rows = []
+    n_dong = DONG_PER_GU * scale
+    for s, sido in enumerate(SIDO_NAMES):
+        for g in range(GU_PER_SIDO):
+            gu = f'{sido[:2]}{g + 1}구'
+            # 시군구 중심 (EPSG:5174 평면 좌표 범위 안에서 시도별로 떨어뜨려 배치)
+            cx = 150000 + (s % 6) * 60000 + rng.uniform(-15000, 15000)
+            cy = 250000 + (s // 6) * 120000 + g * 4000 + rng.uniform(-2000, 2000)
+            stems = dong_stems(rng, n_dong)
+            i = 0
+            while i < n_dong:
+                stem = stems[i]
+                # 40%는 법정동 하나가 번호 붙은 행정동 여러 개로 나뉨 (신정1동·신정2동 → 신정동)
+                split = rng.integers(2, 4) if rng.random() < 0.4 else 1
+                split = min(split, n_dong - i)
+                for k in range(split):
+                    admin = f'{stem}{k + 1}동' if split > 1 else f'{stem}동'
+                    # 동 코드 뒤 5자리는 0이 아니어야 시군구 합계 행 코드와 겹치지 않음
+                    code = (11 + s) * 10**8 + (g + 1) * 10**5 + 1 + len(rows) % (10**5 - 1)
+                    rows.append((sido, gu, admin, f'{stem}동', code,
+                                 cx + rng.normal(0, 2500), cy + rng.normal(0, 2500)))
+                i += split
+    return pd.DataFrame(rows, columns=['시도', '시군구', '행정동', '법정동', '코드', '중심X', '중심Y'])
+
+
+def write_population(regions, path, rng):
+    # 행안부 연령별 인구현황 형식 (cp949, 시도/시군구 합계 행 포함, 0세~100세 이상 '계' 컬럼)
+    n = len(regions)
+    ages = np.arange(MAX_AGE + 1)
+    profile = np.exp(-((ages - 45) / 28.0) ** 2)
+    profile /= profile.sum()
+    totals = rng.integers(3000, 40000, n)
+    counts = rng.poisson(totals[:, None] * profile[None, :])
+
+    dong = pd.DataFrame(counts, columns=ages)
+    dong['시도'] = regions['시도'].to_numpy()
+    dong['시군구'] = regions['시군구'].to_numpy()
+    gu = dong.groupby(['시도', '시군구'], sort=False)[list(ages)].sum().reset_index()
+    sido = dong.groupby('시도', sort=False)[list(ages)].sum().reset_index()
+
+    names = (
+        [f'{r}  ({(11 + i) * 10**8})' for i, r in enumerate(sido['시도'])]
+        + [f'{a} {b} ({c // 10**5 * 10**5})' for a, b, c in zip(gu['시도'], gu['시군구'],
+                                                              regions.groupby(['시도', '시군구'], sort=False)['코드'].first())]
+        + [f'{a} {b} {d}({c})' for a, b, d, c in zip(regions['시도'], regions['시군구'], regions['행정동'], regions['코드'])]
+    )
+    values = np.vstack([sido[list(ages)].to_numpy(), gu[list(ages)].to_numpy(), counts])
+    age_cols = [f'{MONTH}_계_{a}세' for a in ages[:-1]] + [f'{MONTH}_계_{MAX_AGE}세 이상']
+    df = pd.DataFrame(values, columns=age_cols)
+    total = values.sum(axis=1)
+    df.insert(0, f'{MONTH}_계_연령구간인구수', total)
+    df.insert(0, f'{MONTH}_계_총인구수', total)
+    df.insert(0, '행정구역', names)
+    df.to_csv(path, index=False, encoding='cp949')
+    return len(df)
+
+
+def write_centroids(regions, path):
+    # 동 중심점 파일 (행정동 경계 중심점 형식: 시도, 시군구, 읍면동, 좌표X, 좌표Y — 합성 동 중심 그대로)
+    df = pd.DataFrame({
+        '시도': regions['시도'],
+        '시군구': regions['시군구'],
+        '읍면동': regions['행정동'],
+        '좌표X': regions['중심X'].round(3),
+        '좌표Y': regions['중심Y'].round(3),
+    })
+    df.to_csv(path, index=False, encoding='utf-8')
+    return len(df)
+
+
+def write_dental(regions, path, n, rng, kind):
+    # LOCALDATA 치과병원/치과의원 형식 (utf-8, 지번 주소는 법정동 기준)
+    pick = rng.integers(0, len(regions), n)
+    r = regions.iloc[pick].reset_index(drop=True)
+    lot = rng.integers(1, 999, n).astype(str)
+    status = np.where(rng.random(n) < 0.85, '영업중', '폐업')
+    staff = rng.integers(1, 12, n)
+    opened = rng.integers(7300, 20400, n)
+    df = pd.DataFrame({
+        '개방서비스명': '병원' if kind == '치과병원' else '의원',
+        '개방자치단체코드': 3000000,
+        '관리번호': [f'SYN{"H" if kind == "치과병원" else "C"}{i:09d}' for i in range(n)],
+        '인허가일자': pd.to_datetime(opened, unit='D').strftime('%Y-%m-%d'),
+        '상세영업상태명': status,
+        '소재지우편번호': '',
+        '소재지전체주소': r['시도'] + ' ' + r['시군구'] + ' ' + r['법정동'] + ' ' + lot + '번지',
+        '도로명전체주소': r['시도'] + ' ' + r['시군구'] + ' 가상로 ' + lot,
+        '도로명우편번호': '',
+        '사업장명': [f'합성{kind}{i}' for i in range(n)],
+        '업태구분명': kind,
+        '좌표정보X(EPSG5174)': (r['중심X'] + rng.normal(0, 800, n)).round(6),
+        '좌표정보Y(EPSG5174)': (r['중심Y'] + rng.normal(0, 800, n)).round(6),
+        '의료기관종별명': kind,
+        '의료인수': staff,
+        '입원실수': 0,
+        '병상수': 0,
+        '총면적': (staff * rng.uniform(40, 80, n)).round(2),
+        '진료과목내용': '409',
+        '진료과목내용명': '치과',
+    })
+    # 폐업한 치과는 개업 1~14년 뒤 폐업 (생성 기준일 2025-12-31 이전)
+    closed = np.minimum(opened + rng.integers(365, 5000, n), 20453)
+    df['폐업일자'] = np.where(status == '폐업', pd.to_datetime(closed, unit='D').strftime('%Y-%m-%d'), '')
+    df[DENTAL_HEADER].to_csv(path, index=False, encoding='utf-8')
+    return n
+
+
+def write_housing(regions, raw_dir, n, rng, month='202601'):
+    # 국토교통부 아파트 실거래 형식 (cp949, 안내 문구 15줄 + 헤더), 시도별 파일
+    housing_dir = os.path.join(raw_dir, 'housing')
+    os.makedirs(housing_dir, exist_ok=True)
+    legal = regions[['시도', '시군구', '법정동']].drop_duplicates().reset_index(drop=True)
+    # 지역별 가격 수준이 다르도록 법정동마다 기준 평당가격 부여
+    base = rng.lognormal(np.log(2500), 0.5, len(legal))
+    pick = rng.integers(0, len(legal), n)
+    area = rng.uniform(35, 160, n).round(2)
+    price = (area / 3.3 * base[pick] * rng.lognormal(0, 0.25, n)).astype(np.int64)
+    df = pd.DataFrame({
+        'NO': np.arange(1, n + 1),
+        '시군구': (legal['시도'] + ' ' + legal['시군구'] + ' ' + legal['법정동']).to_numpy()[pick],
+        '번지': rng.integers(1, 999, n),
+        '단지명': '합성아파트',
+        '전용면적(㎡)': area,
+        '계약년월': int(month),
+        '계약일': rng.integers(1, 29, n),
+        '거래금액(만원)': [f'{p:,}' for p in price],
+        '_시도': legal['시도'].to_numpy()[pick],
+    })
+    paths = []
+    for s, (sido, part) in enumerate(df.groupby('_시도', sort=False)):
+        path = os.path.join(housing_dir, f'{month}_{s:02d}.csv')
+        with open(path, 'w', encoding='cp949', newline='') as f:
+            for i in range(15):
+                f.write(f'□ 합성 실거래 안내 문구 {i + 1}\n')
+            part[HOUSING_HEADER].to_csv(f, index=False)
+        paths.append(path)
+    return paths
+
+
+def generate_dataset(root, scale=1, seed=0, months=1):
+    # root/data_raw 에 원본 파일 일체 생성, 파일별 행 수 반환
+    raw_dir = os.path.join(root, 'data_raw')
+    os.makedirs(raw_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    regions = build_regions(scale, seed)
+
+    sizes = {'행정동': len(regions)}
+    sizes['연령별인구현황.csv'] = write_population(regions, os.path.join(raw_dir, '연령별인구현황.csv'), rng)
+    sizes['dong_centroids.csv'] = write_centroids(regions, os.path.join(raw_dir, 'dong_centroids.csv'))
+    sizes['치과병원.csv'] = write_dental(regions, os.path.join(raw_dir, '치과병원.csv'), HOSPITALS * scale, rng, '치과병원')
+    sizes['치과의원.csv'] = write_dental(regions, os.path.join(raw_dir, '치과의원.csv'), CLINICS * scale, rng, '치과의원')
+    for m in range(months):
+        # 2026년 1월부터 한 달씩 거슬러 올라가며 월별 파일 생성
+        year, month = divmod(2026 * 12 - m, 12)
+        write_housing(regions, raw_dir, TRANSACTIONS_PER_MONTH * scale, rng, f'{year}{month + 1:02d}')
+    sizes['실거래'] = TRANSACTIONS_PER_MONTH * scale * months
+    return sizes
@@ -0,0 +1,77 @@
+# 등록부 공급 지표: 의료기관종별명이 비어(NULL) 있는 치과도 전체 생성·변동분 적용 모두에서 집계되는지 확인
+# 실행 방법: 저장소 최상위에서 `python -m pytest tests`
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import clinic_registry
+from clinic_registry import CLINIC_COLUMNS, KEY_COL
+from region_dim import CODE_COL, GU_CODE_COL
+
+GU = 1111000000
+DONG_A = 1111051500
+DONG_B = 1111053000
+
+
+def clinic(key, dong, kind, staff=1, modified='2026-01-01 00:00:00'):
+    row = {col: None for col in CLINIC_COLUMNS}
+    row.update({
+        KEY_COL: key, CODE_COL: dong, GU_CODE_COL: GU, '의료기관종별명': kind, '의료인수': staff,
+        '병상수': 0, '개방자치단체코드': 0, '영업중': 1, '중복제외': 0, '최종수정시점': modified,
+    })
+    return row
+
+
+def frame(rows):
+    return pd.DataFrame(rows, columns=CLINIC_COLUMNS)
+
+
+def supply(conn):
+    return clinic_registry.load_supply(conn).reset_index(drop=True)
+
+
+def test_full_build_with_null_kind(tmp_path):
+    # 동 B 는 모든 치과의 종별명이 비어 있음 → 종별 합계가 NULL 이 되지 않아야 함
+    conn = clinic_registry.connect(str(tmp_path / 'registry.sqlite'))
+    clinic_registry.replace_all(conn, frame([
+        clinic('A1', DONG_A, '치과의원', staff=2),
+        clinic('B1', DONG_B, None, staff=3),
+        clinic('B2', DONG_B, None),
+    ]))
+    df = supply(conn).set_index(['지역단위', '지역코드'])
+    assert df.loc[('동', DONG_B), ['치과수', '치과병원수', '치과의원수', '기타종별수', '의료인수']].tolist() == [2, 0, 0, 2, 4]
+    assert df.loc[('시군구', GU), ['치과수', '치과의원수', '기타종별수']].tolist() == [3, 1, 2]
+
+
+def test_changes_with_null_kind(tmp_path):
+    # 변동분으로 종별명이 빈 치과를 추가·변경·삭제해도 실패하지 않고 전체 생성과 같은 결과
+    # (전체 생성은 동마다 종별명이 있는 치과를 두어 트리거 경로만 확인)
+    conn = clinic_registry.connect(str(tmp_path / 'registry.sqlite'))
+    clinic_registry.replace_all(conn, frame([
+        clinic('A1', DONG_A, '치과의원'),
+        clinic('A2', DONG_A, '치과병원', staff=5),
+        clinic('B1', DONG_B, None),
+        clinic('B2', DONG_B, '치과의원'),
+    ]))
+    later = '2026-02-01 00:00:00'
+    changes = frame([
+        clinic('N1', DONG_B, None, staff=2, modified=later),   # 신규 (종별명 없음)
+        clinic('A2', DONG_A, None, staff=5, modified=later),   # 종별명 → 없음
+        clinic('B1', DONG_B, None, modified=later),            # 삭제 (종별명 없음)
+    ])
+    deleted = np.array([False, False, True])
+    clinic_registry.apply_changes(conn, changes, deleted)
+
+    rebuilt = clinic_registry.connect(str(tmp_path / 'rebuilt.sqlite'))
+    clinic_registry.replace_all(rebuilt, frame([
+        clinic('A1', DONG_A, '치과의원'),
+        clinic('A2', DONG_A, None, staff=5, modified=later),
+        clinic('B2', DONG_B, '치과의원'),
+        clinic('N1', DONG_B, None, staff=2, modified=later),
+    ]))
+    pd.testing.assert_frame_equal(supply(conn), supply(rebuilt))
+    df = supply(conn).set_index(['지역단위', '지역코드'])
+    assert df.loc[('동', DONG_A), ['치과수', '치과병원수', '치과의원수', '기타종별수']].tolist() == [2, 0, 1, 1]
@@ -0,0 +1,44 @@
+# 가중치 스윕: 지역 이름이 같아도 지표 값이 바뀐 데이터에는 저장된 순위표를 쓰지 않는지 확인
+# 실행 방법: 저장소 최상위에서 `python -m pytest tests`
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scoring_engine import FEATURE_COLS, SUPPLY_COL, ScoringEngine
+from weight_sweep import WeightSweep, build_weight_sweep
+
+
+def ranking(n=30, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        '시도': ['서울특별시'] * (n // 2) + ['부산광역시'] * (n - n // 2),
+        '시군구': [f'구{i % 5}' for i in range(n)],
+        '읍면동': [f'동{i}' for i in range(n)],
+        '노인인구수': rng.integers(100, 5000, n).astype(np.float64),
+        SUPPLY_COL: rng.uniform(0.1, 10.0, n),
+        '경제력_지수': rng.uniform(1000.0, 5000.0, n),
+    })
+
+
+def test_matches_rejects_changed_features(tmp_path):
+    df = ranking()
+    sweep, _ = build_weight_sweep(ScoringEngine(df, group_col='시도'))
+    path = sweep.save(str(tmp_path / 'weight_sweep.npz'))
+    loaded = WeightSweep.load(path)
+    assert loaded.matches(ScoringEngine(df, group_col='시도').df)
+
+    # 지역 이름·행 순서는 그대로이고 지표 한 열만 바뀐 데이터
+    changed = df.assign(**{FEATURE_COLS[0]: df[FEATURE_COLS[0]].to_numpy()[::-1]})
+    assert not loaded.matches(ScoringEngine(changed, group_col='시도').df)
+
+
+def test_matches_rejects_sweep_without_digest(tmp_path):
+    # 지표 digest 를 저장하기 전에 만든 순위표는 현재 데이터와 맞는지 알 수 없으므로 쓰지 않음
+    df = ranking()
+    sweep, _ = build_weight_sweep(ScoringEngine(df, group_col='시도'))
+    sweep.digest = None
+    loaded = WeightSweep.load(sweep.save(str(tmp_path / 'weight_sweep.npz')))
+    assert not loaded.matches(ScoringEngine(df, group_col='시도').df)
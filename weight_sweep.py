@@ -0,0 +1,183 @@
+# 가중치 스윕: 대시보드 슬라이더의 모든 가중치 조합을 시도별로 한 번에 점수화
+# - 인구 가중치 0.5~2.0, 경제력 가중치 0.0~2.0 (0.1 간격) → 16 × 21 = 336개 조합
+# - 조합별 TOP K 순위를 저장해두면 슬라이더를 움직일 때 재계산 없이 표 조회만 하면 됨
+# - 동마다 전체 조합 중 TOP 10에 든 비율·최고/최저 순위를 집계해 순위 안정성(강건성)을 확인
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+import profiling
+from data_store import load_table, save_table, table_exists
+from scoring_engine import FEATURE_COLS, ScoringEngine, in_scoring_scope, weight_matrix
+
+SWEEP_PATH = os.path.join('data_processed', 'weight_sweep.npz')
+POP_WEIGHTS = np.round(np.arange(0.5, 2.0 + 1e-9, 0.1), 1)
+ECON_WEIGHTS = np.round(np.arange(0.0, 2.0 + 1e-9, 0.1), 1)
+TOP_K = 10
+REGION_KEYS = ['시도', '시군구', '읍면동']
+
+
+def grid_position(grid, value):
+    # 슬라이더 값(부동소수 오차 포함)의 격자 위치 (격자에 없으면 None)
+    i = int(round((value - grid[0]) / 0.1))
+    if 0 <= i < len(grid) and abs(grid[i] - value) < 1e-6:
+        return i
+    return None
+
+
+def sweep_group(log_scores, k=TOP_K):
+    # log_scores: (행 수, 조합 수) → 조합별 상위 k 위치·점수와 행별 순위 행렬
+    n, m = log_scores.shape
+    order = np.argsort(-log_scores, axis=0, kind='stable')
+    ranks = np.empty((n, m), dtype=np.int32)
+    ranks[order, np.arange(m)] = np.arange(1, n + 1, dtype=np.int32)[:, None]
+
+    k = min(k, n)
+    top = order[:k].T
+    top_scores = np.exp(np.take_along_axis(log_scores, order[:k], axis=0)).T
+    return top, top_scores, ranks
+
+
+def feature_digest(df):
+    # 스코어링 지표 값(float64 바이트)의 sha256 → 지역 이름이 같아도 지표가 바뀌면 다른 값
+    values = np.ascontiguousarray(df[FEATURE_COLS].to_numpy(dtype=np.float64))
+    return hashlib.sha256(values.tobytes()).hexdigest()
+
+
+class WeightSweep:
+    def __init__(self, regions, groups, pop_weights, econ_weights, top_rows, top_scores, top_ratio, digest=None):
+        # regions: 엔진 행 순서의 시도/시군구/읍면동, digest: 스윕을 만든 지표 값의 feature_digest
+        # top_rows/top_scores: (그룹, 인구 가중치, 경제력 가중치, K) — 행 번호는 regions 기준, 빈 칸은 -1
+        # top_ratio: 행별 전체 조합 중 TOP 10 비율
+        self.regions = regions.reset_index(drop=True)
+        self.groups = list(groups)
+        self.pop_weights = np.asarray(pop_weights)
+        self.econ_weights = np.asarray(econ_weights)
+        self.top_rows = top_rows
+        self.top_scores = top_scores
+        self.top_ratio = top_ratio
+        self.digest = digest
+
+    @classmethod
+    def load(cls, path=SWEEP_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            regions = pd.DataFrame({'시도': data['sido'], '시군구': data['sigungu'], '읍면동': data['dong']})
+            # 지표 digest 가 없는 예전 파일은 현재 데이터와 맞는지 알 수 없으므로 matches() 에서 거부됨
+            digest = str(data['digest']) if 'digest' in data.files else None
+            return cls(regions, data['groups'].tolist(), data['pop_weights'], data['econ_weights'],
+                       data['top_rows'], data['top_scores'], data['top_ratio'], digest)
+
+    def save(self, path=SWEEP_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.savez_compressed(
+            path,
+            sido=self.regions['시도'].to_numpy(dtype=str),
+            sigungu=self.regions['시군구'].to_numpy(dtype=str),
+            dong=self.regions['읍면동'].to_numpy(dtype=str),
+            groups=np.array(self.groups, dtype=str),
+            pop_weights=self.pop_weights,
+            econ_weights=self.econ_weights,
+            top_rows=self.top_rows,
+            top_scores=self.top_scores,
+            top_ratio=self.top_ratio,
+            digest=np.array(self.digest or '', dtype=str),
+        )
+        return path
+
+    def matches(self, df):
+        # 스윕을 만든 데이터와 같은 행 순서·지표 값인지 확인 (다르면 조회 결과를 쓰면 안 됨)
+        if len(df) != len(self.regions) or not self.digest or feature_digest(df) != self.digest:
+            return False
+        return all(np.array_equal(df[col].astype(str).to_numpy(), self.regions[col].to_numpy())
+                   for col in REGION_KEYS)
+
+    def lookup(self, group, pop_weight, econ_weight):
+        # 미리 계산된 상위 K (행 번호, 점수) — 그룹이 없거나 격자 밖 가중치면 None
+        if group not in self.groups:
+            return None
+        i = grid_position(self.pop_weights, pop_weight)
+        j = grid_position(self.econ_weights, econ_weight)
+        if i is None or j is None:
+            return None
+        g = self.groups.index(group)
+        rows = self.top_rows[g, i, j]
+        valid = rows >= 0
+        return rows[valid], self.top_scores[g, i, j][valid]
+
+
+def top_k_rows(engine, group, k, pop_weight=1.0, econ_weight=1.0, sweep=None):
+    # 상위 k개의 엔진 행 위치(engine.df 기준)와 점수 (점수 내림차순)
+    # 슬라이더 격자 위 가중치이고 k가 순위표 크기 이하면 스윕 순위표 조회, 그 외에는 엔진으로 계산
+    found = None
+    if sweep is not None and k <= sweep.top_rows.shape[-1]:
+        found = sweep.lookup(group, pop_weight, econ_weight)
+    if found is not None:
+        rows, scores = found
+        return rows[:k], scores[:k]
+    top, log_scores = engine.top_k_positions(group, k, pop_weight, econ_weight)
+    return engine.group_rows(group)[top], np.exp(log_scores[top])
+
+
+def build_weight_sweep(engine, pop_weights=POP_WEIGHTS, econ_weights=ECON_WEIGHTS, k=TOP_K):
+    weights = weight_matrix(pop_weights, econ_weights)
+    shape = (len(engine.groups), len(pop_weights), len(econ_weights), k)
+    top_rows = np.full(shape, -1, dtype=np.int32)
+    top_scores = np.zeros(shape, dtype=np.float64)
+    top_ratio = np.zeros(len(engine.df), dtype=np.float64)
+    stability = []
+
+    for g, group in enumerate(engine.groups):
+        rows = engine.group_rows(group)
+        top, scores, ranks = sweep_group(engine.log_score_matrix(group, weights), k)
+        kk = top.shape[1]
+        top_rows[g, :, :, :kk] = rows[top].reshape(len(pop_weights), len(econ_weights), kk)
+        top_scores[g, :, :, :kk] = scores.reshape(len(pop_weights), len(econ_weights), kk)
+
+        in_top = (ranks <= TOP_K).sum(axis=1)
+        top_ratio[rows] = in_top / ranks.shape[1]
+        df_group = engine.df.iloc[rows][REGION_KEYS + FEATURE_COLS].copy()
+        df_group['TOP10_횟수'] = in_top
+        df_group['TOP10_비율'] = top_ratio[rows]
+        df_group['최고순위'] = ranks.min(axis=1)
+        df_group['최저순위'] = ranks.max(axis=1)
+        df_group['중앙순위'] = np.median(ranks, axis=1)
+        stability.append(df_group)
+
+    sweep = WeightSweep(engine.df[REGION_KEYS].astype(str), engine.groups, pop_weights, econ_weights,
+                        top_rows, top_scores, top_ratio, feature_digest(engine.df))
+    df_stability = pd.concat(stability, ignore_index=True) if stability else pd.DataFrame()
+    return sweep, df_stability
+
+
+def run_weight_sweep():
+    if not table_exists('final_ranking_v3_economic'):
+        print("경제력 반영 결과(v3)가 없습니다. 이전 단계를 먼저 수행해주세요.")
+        return None
+
+    # 1. 대시보드와 같은 데이터·필터로 스코어링 엔진 생성
+    df = load_table('final_ranking_v3_economic', columns=REGION_KEYS + FEATURE_COLS)
+    df = df[in_scoring_scope(df)]
+    engine = ScoringEngine(df, group_col='시도')
+    profiling.rows('스코어링 대상', engine.df)
+
+    # 2. 모든 가중치 조합을 시도별 행렬 곱 한 번으로 점수화
+    with profiling.step('가중치 스윕'):
+        sweep, df_stability = build_weight_sweep(engine)
+    n_combos = len(sweep.pop_weights) * len(sweep.econ_weights)
+    print(f"가중치 조합 {n_combos}개 × 시도 {len(sweep.groups)}개 스윕 완료")
+
+    # 3. 저장 및 순위 안정성 출력
+    df_stability = df_stability.sort_values(['시도', 'TOP10_횟수', '중앙순위'], ascending=[True, False, True])
+    sweep.save()
+    output_path = save_table(df_stability, 'weight_sweep_stability')
+
+    for group, df_group in df_stability.groupby('시도', observed=True, sort=False):
+        print(f"\n--- [{group} 가중치 변화에도 TOP 10을 유지하는 동] ---")
+        print(df_group[REGION_KEYS + ['TOP10_비율', '최고순위', '최저순위']].head(10))
+    print(f"\n순위표 저장: {SWEEP_PATH}, 안정성 결과: {output_path}")
+    return sweep
+
+if __name__ == "__main__":
+    run_weight_sweep()